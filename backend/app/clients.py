@@ -0,0 +1,292 @@
+"""
+Process-wide registry of external API clients (OpenAI, Google Maps, Twilio,
+SendGrid, Yelp over HTTP). Clients are created once with keep-alive pools
+instead of per request, so TLS sessions and connections are reused.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional
+
+import googlemaps
+import httpx
+import requests
+from openai import AsyncOpenAI
+from requests.adapters import HTTPAdapter
+from sendgrid import SendGridAPIClient
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client as TwilioClient
+
+from app.config import settings
+from app.constants import CONTACT_TIMEOUT_SECONDS
+from app.llm_metrics import record_http_attempt
+
+
+class ConnectionStats:
+    """Requests sent vs. new connections opened for one client."""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> dict:
+        requests_sent, connections = self.requests, self.new_connections
+        return {
+            "requests": requests_sent,
+            "new_connections": connections,
+            "reuse_rate": round(1 - connections / requests_sent, 4)
+            if requests_sent
+            else None,
+        }
+
+
+def _session_stats(session: requests.Session) -> dict:
+    """Connection reuse for a requests Session, read off its urllib3 pools"""
+    stats = ConnectionStats()
+    # The same adapter is usually mounted for both http:// and https://
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats.requests += pool.num_requests
+                stats.new_connections += pool.num_connections
+    return stats.snapshot()
+
+
+def _pooled_session(session: Optional[requests.Session] = None) -> requests.Session:
+    session = session or requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+        pool_maxsize=settings.HTTP_POOL_MAX_KEEPALIVE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ClientRegistry:
+    """
+    Lazily built, shared external clients. The app lifespan calls start() to
+    build and warm them up front and close() on shutdown.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._openai: Optional[AsyncOpenAI] = None
+        self._openai_http: Optional[httpx.AsyncClient] = None
+        self._google_maps: Optional[googlemaps.Client] = None
+        self._twilio: Optional[TwilioClient] = None
+        self._sendgrid: Optional[SendGridAPIClient] = None
+        self._sendgrid_http: Optional[requests.Session] = None
+        self._http: Optional[requests.Session] = None
+        self.openai_stats = ConnectionStats()
+        self.warmed = False
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    @property
+    def openai(self) -> Optional[AsyncOpenAI]:
+        if self._openai is None and settings.OPENAI_API_KEY:
+            with self._lock:
+                if self._openai is None:
+                    self._openai_http = self._build_openai_http()
+                    self._openai = AsyncOpenAI(
+                        api_key=settings.OPENAI_API_KEY, http_client=self._openai_http
+                    )
+        return self._openai
+
+    def _build_openai_http(self) -> httpx.AsyncClient:
+        stats = self.openai_stats
+
+        async def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.complete":
+                stats.record_connection()
+
+        async def on_request(request: httpx.Request):
+            stats.record_request()
+            # The SDK retries by re-sending, so this also counts retries
+            record_http_attempt()
+            request.extensions["trace"] = trace
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            event_hooks={"request": [on_request]},
+        )
+
+    @property
+    def google_maps(self) -> Optional[googlemaps.Client]:
+        if self._google_maps is None and settings.GOOGLE_PLACES_API_KEY:
+            with self._lock:
+                if self._google_maps is None:
+                    self._google_maps = googlemaps.Client(
+                        key=settings.GOOGLE_PLACES_API_KEY,
+                        requests_session=_pooled_session(),
+                    )
+        return self._google_maps
+
+    @property
+    def twilio(self) -> Optional[TwilioClient]:
+        if (
+            self._twilio is None
+            and settings.TWILIO_ACCOUNT_SID
+            and settings.TWILIO_AUTH_TOKEN
+        ):
+            with self._lock:
+                if self._twilio is None:
+                    try:
+                        http_client = TwilioHttpClient(pool_connections=True)
+                        _pooled_session(http_client.session)
+                        self._twilio = TwilioClient(
+                            settings.TWILIO_ACCOUNT_SID,
+                            settings.TWILIO_AUTH_TOKEN,
+                            http_client=http_client,
+                        )
+                    except Exception as e:
+                        print(f"⚠️  Twilio initialization failed: {e}")
+        return self._twilio
+
+    @property
+    def sendgrid(self) -> Optional[SendGridAPIClient]:
+        if self._sendgrid is None and settings.SENDGRID_API_KEY:
+            with self._lock:
+                if self._sendgrid is None:
+                    try:
+                        self._sendgrid = SendGridAPIClient(settings.SENDGRID_API_KEY)
+                        self._sendgrid_http = _pooled_session()
+                    except Exception as e:
+                        print(f"⚠️  SendGrid initialization failed: {e}")
+        return self._sendgrid
+
+    def send_email(self, mail) -> requests.Response:
+        """
+        Send through SendGrid's v3 mail endpoint. The SDK's urllib transport
+        opens a connection per call, so the request goes over a pooled session
+        with the SDK client's host and auth headers instead.
+        """
+        sendgrid = self.sendgrid
+        response = self._sendgrid_http.post(
+            f"{sendgrid.host}/v3/mail/send",
+            json=mail.get(),
+            headers=sendgrid.client.request_headers,
+            timeout=CONTACT_TIMEOUT_SECONDS,
+        )
+        # The SDK raises on error statuses too
+        response.raise_for_status()
+        return response
+
+    @property
+    def http(self) -> requests.Session:
+        """Shared keep-alive session for plain REST calls (e.g. Yelp)"""
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = _pooled_session()
+        return self._http
+
+    async def start(self):
+        # Touch each property so the clients exist before the first request
+        clients = {
+            "openai": self.openai,
+            "google_maps": self.google_maps,
+            "twilio": self.twilio,
+            "sendgrid": self.sendgrid,
+        }
+        configured = [name for name, client in clients.items() if client is not None]
+        print(f"🔌 External clients ready: {', '.join(configured) or 'none'}")
+
+        if settings.CLIENT_WARMUP_ON_STARTUP:
+            # Don't hold up startup on slow or unreachable providers
+            self._warmup_task = asyncio.create_task(self.warm())
+
+    async def warm(self):
+        """Open a connection (TCP + TLS) to each configured provider"""
+        warmups = []
+        if self.openai is not None:
+            warmups.append(self._openai_http.head("https://api.openai.com/v1/models"))
+        if self.google_maps is not None:
+            warmups.append(
+                asyncio.to_thread(
+                    self.google_maps.session.head, "https://maps.googleapis.com/"
+                )
+            )
+        if self.twilio is not None:
+            warmups.append(
+                asyncio.to_thread(
+                    self.twilio.http_client.session.head, "https://api.twilio.com/"
+                )
+            )
+        if self.sendgrid is not None:
+            warmups.append(
+                asyncio.to_thread(self._sendgrid_http.head, self.sendgrid.host)
+            )
+        if settings.YELP_API_KEY:
+            warmups.append(asyncio.to_thread(self.http.head, "https://api.yelp.com/"))
+
+        results = await asyncio.gather(*warmups, return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        for failure in failures:
+            print(f"⚠️  Client warm-up failed: {failure}")
+        self.warmed = not failures
+        if warmups:
+            print(f"🔥 Warmed {len(warmups) - len(failures)}/{len(warmups)} clients")
+
+    async def close(self):
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self._openai_http is not None:
+            await self._openai_http.aclose()
+        for session in self._sessions().values():
+            session.close()
+        # The async client is bound to this event loop; rebuild on next use
+        self._openai = None
+        self._openai_http = None
+        self._google_maps = None
+        self._twilio = None
+        self._sendgrid = None
+        self._sendgrid_http = None
+        self._http = None
+
+    def _sessions(self) -> Dict[str, requests.Session]:
+        sessions = {}
+        if self._google_maps is not None:
+            sessions["google_maps"] = self._google_maps.session
+        if self._twilio is not None:
+            sessions["twilio"] = self._twilio.http_client.session
+        if self._sendgrid_http is not None:
+            sessions["sendgrid"] = self._sendgrid_http
+        if self._http is not None:
+            sessions["http"] = self._http
+        return sessions
+
+    def snapshot(self) -> dict:
+        stats = {
+            "openai": self.openai_stats.snapshot() if self._openai else None,
+        }
+        for name, session in self._sessions().items():
+            stats[name] = _session_stats(session)
+        return {"warmed": self.warmed, "clients": stats}
+
+
+clients = ClientRegistry()
+
+
+def get_clients() -> ClientRegistry:
+    """Client registry dependency for FastAPI"""
+    return clients
@@ -10,11 +10,43 @@ AI_TEMPERATURE_GENERATION = 0.7
 AI_MAX_TOKENS_SHORT = 100
 AI_MAX_TOKENS_MEDIUM = 500
 AI_MAX_TOKENS_LONG = 1000
+# USD per million tokens, for cost estimates in LLM call metrics
+AI_MODEL_PRICING_PER_MILLION_TOKENS = {
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+}
+AI_BATCH_PRICE_MULTIPLIER = 0.5
+# Urgency values that keep a work order on the realtime LLM path
+REALTIME_URGENCIES = ("high", "emergency")
 
 # Vendor Discovery Configuration
 VENDOR_SEARCH_RADIUS_METERS = 48280
 VENDOR_SEARCH_LIMIT = 30
 VENDOR_SCORE_REVIEW_WEIGHT = 50
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
+METERS_PER_MILE = 1609.344
+VENDOR_DEFAULT_SERVICE_RADIUS_MILES = 30.0
+# Ranking: composite score (0-10) minus this per mile from the job, so a 9.0
+# vendor 20 miles out ranks level with an 8.0 vendor 10 miles out
+VENDOR_DISTANCE_PENALTY_PER_MILE = 0.1
+# Tries of a bulk vendor upsert that hits a unique violation from a concurrent
+# discovery before the batch fails
+VENDOR_UPSERT_ATTEMPTS = 3
+# Place details fields requested from Google: only what vendor rows persist
+PLACE_DETAILS_FIELDS = [
+    "place_id",
+    "name",
+    "formatted_phone_number",
+    "international_phone_number",
+    "website",
+    "formatted_address",
+    "rating",
+    "user_ratings_total",
+    "price_level",
+    "geometry/location",
+]
+# Yelp business fields kept in Vendor.source_data
+YELP_SOURCE_FIELDS = ("id", "rating", "review_count", "price", "url")
 
 # Quote Scoring Weights
 QUOTE_PRICE_WEIGHT = 0.4
@@ -26,6 +58,18 @@ SMS_MAX_LENGTH = 160
 EMAIL_FROM_ADDRESS = "noreply@tavi.com"
 EMAIL_SUBJECT_PREFIX = "Service Opportunity"
 
+# Outreach templates: one LLM call per work order, vendor name filled in locally
+VENDOR_NAME_PLACEHOLDER = "{vendor_name}"
+OUTREACH_TEMPLATE_CACHE_SIZE = 256
+
+# Streaming intake: fields a work order needs before vendor discovery can start
+DISCOVERY_READY_FIELDS = (
+    "trade_type",
+    "location_address",
+    "location_city",
+    "location_state",
+)
+
 # Vendor Contact Strategy
 CONTACT_RETRY_DELAY_SECONDS = 5
 CONTACT_TIMEOUT_SECONDS = 30
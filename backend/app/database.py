@@ -1,12 +1,154 @@
-from sqlalchemy import create_engine
+import time
+from pathlib import Path
+from typing import Optional
+from fastapi import Request
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
+from app.metrics import Histogram
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, echo=False)
+
+class PoolMetrics:
+    """Checkout wait and connection hold times for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self.checkout_wait = Histogram()
+        self.hold_time = Histogram()
+        self.checkout_errors = 0
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        return {
+            "pool_size": pool.size() if pool else None,
+            "checked_out": pool.checkedout() if pool else None,
+            "checked_in": pool.checkedin() if pool else None,
+            "overflow": pool.overflow() if pool else None,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checkout_errors": self.checkout_errors,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connection_hold_seconds": self.hold_time.snapshot(),
+        }
+
+
+def _instrumented_pool_class(pool_class, metrics: PoolMetrics):
+    # Subclassing (rather than a one-off wrapper) survives pool.recreate(),
+    # which SQLAlchemy uses on dispose and invalidation.
+    class InstrumentedPool(pool_class):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            except Exception:
+                metrics.checkout_errors += 1
+                raise
+            finally:
+                metrics.checkout_wait.observe(time.perf_counter() - start)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def _track_hold_time(engine, metrics: PoolMetrics):
+    metrics.engine = engine
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.hold_time.observe(time.perf_counter() - checked_out_at)
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+read_pool_metrics = PoolMetrics("async_read")
+
+statement_timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=_instrumented_pool_class(QueuePool, sync_pool_metrics),
+    connect_args={"options": f"-c statement_timeout={statement_timeout}"},
+    echo=False,
+    **_pool_options(),
+)
+_track_hold_time(engine, sync_pool_metrics)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    poolclass=_instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+    connect_args={"server_settings": {"statement_timeout": statement_timeout}},
+    echo=False,
+    **_pool_options(),
+)
+_track_hold_time(async_engine.sync_engine, async_pool_metrics)
+
+read_async_engine = None
+if settings.DATABASE_READ_URL:
+    read_async_engine = create_async_engine(
+        make_url(settings.DATABASE_READ_URL).set(drivername="postgresql+asyncpg"),
+        poolclass=_instrumented_pool_class(AsyncAdaptedQueuePool, read_pool_metrics),
+        # Read-only at the server too, so a stray write fails loudly
+        connect_args={
+            "server_settings": {
+                "statement_timeout": statement_timeout,
+                "default_transaction_read_only": "on",
+            }
+        },
+        echo=False,
+        **_pool_options(),
+    )
+    _track_hold_time(read_async_engine.sync_engine, read_pool_metrics)
+
+# expire_on_commit=False keeps loaded attributes readable after commit, since
+# an implicit refresh would need IO outside of an await.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+AsyncReadSessionLocal = (
+    async_sessionmaker(
+        bind=read_async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if read_async_engine is not None
+    else None
+)
+
+# Read-your-writes escape hatch: clients that just mutated something send this
+# header so their follow-up GETs read from the primary instead of the replica.
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
 Base = declarative_base()
 
 
@@ -19,6 +161,126 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Async database dependency for FastAPI"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _wants_primary(request: Optional[Request]) -> bool:
+    if request is None:
+        return False
+    value = request.headers.get(READ_PRIMARY_HEADER, "")
+    return value.lower() in ("1", "true", "yes")
+
+
+async def get_async_read_db(request: Request):
+    """
+    Async database dependency for read-only endpoints.
+    Uses DATABASE_READ_URL when configured, unless the request sends X-Read-Primary.
+    """
+    if AsyncReadSessionLocal is None or _wants_primary(request):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = AsyncReadSessionLocal
+
+    async with session_factory() as db:
+        yield db
+
+
+async def dispose_engines():
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
+
+
+async def run_in_session(func, *args, **kwargs):
+    """
+    Run ``func(db, *args, **kwargs)`` with a session of its own.
+    Background tasks start after the request session is closed, so they must not reuse it.
+    """
+    async with AsyncSessionLocal() as db:
+        return await func(db, *args, **kwargs)
+
+
+def get_pool_stats() -> dict:
+    """Pool occupancy plus checkout wait / hold time histograms per engine"""
+    stats = {
+        "sync": sync_pool_metrics.snapshot(),
+        "async": async_pool_metrics.snapshot(),
+    }
+    if read_async_engine is not None:
+        stats["async_read"] = read_pool_metrics.snapshot()
+    return stats
+
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+BASELINE_REVISION = "0001"
+# Serializes migration runs across deploy jobs and replicas
+MIGRATION_LOCK_ID = 7_240_301
+
+
+def _alembic_config(connection=None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    # Leave uvicorn's logging setup alone
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def migrate_db():
+    """
+    Bring the schema up to date by running the Alembic migration chain.
+    A deploy step (scripts/migrate.py), not app startup: index builds and data
+    migrations can take minutes. A Postgres advisory lock lets only one runner
+    at a time apply migrations; the others wait, then find the schema at head.
+    """
+    with engine.connect() as connection:
+        connection.execute(
+            text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID}
+        )
+        # The lock is session-level, so commit the implicit transaction and
+        # let each migration manage its own
+        connection.commit()
+        try:
+            inspector = inspect(connection)
+            has_version_table = inspector.has_table("alembic_version")
+            has_legacy_schema = inspector.has_table("work_orders")
+            connection.commit()
+
+            config = _alembic_config(connection)
+            if has_legacy_schema and not has_version_table:
+                # Tables were created by create_all before migrations existed
+                print(f"🗄️ Stamping existing schema at revision {BASELINE_REVISION}")
+                command.stamp(config, BASELINE_REVISION)
+            command.upgrade(config, "head")
+            connection.commit()
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID}
+            )
+            connection.commit()
+
+
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """
+    Startup check that the schema is at the migration head. Migrations run
+    as a separate deploy step (``python -m scripts.migrate``).
+    """
+    script = ScriptDirectory.from_config(_alembic_config())
+    head = script.get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+
+    if current == head:
+        return
+    known = {revision.revision for revision in script.walk_revisions()}
+    if current is not None and current not in known:
+        # A newer deploy already migrated past this code (e.g. during a rollback)
+        print(f"⚠️  Schema revision {current} is ahead of this build's head {head}")
+        return
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'}, expected {head}. "
+        "Run `python -m scripts.migrate` before starting the app."
+    )
@@ -0,0 +1,52 @@
+"""
+Vectorized great-circle distances and distance-aware vendor ranking. Everything
+works on NumPy arrays so a whole candidate set is filtered and scored in one
+pass instead of a Python loop per vendor.
+"""
+
+import numpy as np
+
+from app.constants import (
+    EARTH_RADIUS_MILES,
+    VENDOR_DEFAULT_SERVICE_RADIUS_MILES,
+    VENDOR_DISTANCE_PENALTY_PER_MILE,
+)
+
+
+def haversine_miles(lat: float, lng: float, lats, lngs) -> np.ndarray:
+    """Miles from (lat, lng) to each point of the ``lats``/``lngs`` arrays"""
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    # Rounding can push a hair past 1 for antipodal points
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def within_reach(
+    distances: np.ndarray, search_radius_miles: float, service_radii: np.ndarray
+) -> np.ndarray:
+    """
+    Mask of vendors inside the search radius whose own service radius also
+    covers the job. NaN service radii get the Vendor column default.
+    """
+    service_radii = np.where(
+        np.isnan(service_radii), VENDOR_DEFAULT_SERVICE_RADIUS_MILES, service_radii
+    )
+    return (distances <= search_radius_miles) & (distances <= service_radii)
+
+
+def ranking_scores(composite_scores: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """Composite score (0-10) less a per mile travel penalty"""
+    return composite_scores - VENDOR_DISTANCE_PENALTY_PER_MILE * distances
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, highest first"""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
@@ -0,0 +1,270 @@
+"""
+Deferred batch mode for non-urgent LLM work.
+
+Jobs are queued, submitted in bulk to a batch-style endpoint (OpenAI's Batch
+API, or a local stand-in for development and tests) and each caller's await
+resumes when its result arrives. Batched calls skip the realtime scheduler, so
+they don't compete with urgent work for concurrency or rate limit headroom.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.clients import get_clients
+from app.config import settings
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+# Terminal OpenAI batch states; "expired" batches may still carry partial output
+BATCH_DONE_STATES = ("completed", "expired")
+BATCH_FAILED_STATES = ("failed", "cancelled")
+
+
+class BatchJobError(Exception):
+    """A batched request that failed or never got a result."""
+
+
+class LocalBatchBackend:
+    """
+    Stand-in for a batch endpoint: runs each request against the regular chat
+    completions API after a delay and reports results through poll().
+    """
+
+    def __init__(self, client_getter: Callable, delay_seconds: float):
+        self.client_getter = client_getter
+        self.delay_seconds = delay_seconds
+        self._batches: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, jobs: List[Tuple[str, dict]]) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        self._batches[batch_id] = asyncio.create_task(self._run(jobs))
+        return batch_id
+
+    async def _run(self, jobs: List[Tuple[str, dict]]) -> Dict[str, dict]:
+        await asyncio.sleep(self.delay_seconds)
+        client = self.client_getter()
+
+        async def run_one(custom_id: str, request: dict):
+            try:
+                response = await client.chat.completions.create(**request)
+                return custom_id, {
+                    "content": response.choices[0].message.content,
+                    "usage": getattr(response, "usage", None),
+                }
+            except Exception as e:
+                return custom_id, {"error": str(e)}
+
+        results = await asyncio.gather(*(run_one(cid, req) for cid, req in jobs))
+        return dict(results)
+
+    async def poll(self, batch_id: str) -> Optional[Dict[str, dict]]:
+        task = self._batches[batch_id]
+        if not task.done():
+            return None
+        del self._batches[batch_id]
+        return task.result()
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API: JSONL upload, batch creation, then output file download."""
+
+    def __init__(self, client_getter: Callable, completion_window: str):
+        self.client_getter = client_getter
+        self.completion_window = completion_window
+
+    async def submit(self, jobs: List[Tuple[str, dict]]) -> str:
+        client = self.client_getter()
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": request,
+                }
+            )
+            for custom_id, request in jobs
+        ]
+        batch_file = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = await client.post(
+            "/batches",
+            body={
+                "input_file_id": batch_file.id,
+                "endpoint": BATCH_ENDPOINT,
+                "completion_window": self.completion_window,
+            },
+            cast_to=object,
+        )
+        return batch["id"]
+
+    async def poll(self, batch_id: str) -> Optional[Dict[str, dict]]:
+        client = self.client_getter()
+        batch = await client.get(f"/batches/{batch_id}", cast_to=object)
+        status = batch.get("status")
+        if status in BATCH_FAILED_STATES:
+            raise BatchJobError(f"batch {batch_id} {status}: {batch.get('errors')}")
+        if status not in BATCH_DONE_STATES:
+            return None
+
+        results = {}
+        for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    item = json.loads(line)
+                    results[item["custom_id"]] = self._parse_result(item)
+        return results
+
+    @staticmethod
+    def _parse_result(item: dict) -> dict:
+        response = item.get("response") or {}
+        body = response.get("body") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            return {"error": str(item.get("error") or body.get("error") or body)}
+        usage = body.get("usage") or {}
+        return {
+            "content": body["choices"][0]["message"]["content"],
+            "usage": _Usage(usage),
+        }
+
+
+class _Usage:
+    """Attribute access to a usage dict, like the SDK's CompletionUsage"""
+
+    def __init__(self, usage: dict):
+        self.prompt_tokens = usage.get("prompt_tokens")
+        self.completion_tokens = usage.get("completion_tokens")
+        self.total_tokens = usage.get("total_tokens")
+
+
+class LLMBatchQueue:
+    """
+    Collects deferred requests and submits them as one batch when the batch
+    is full or the oldest job has waited ``max_wait_seconds``.
+    """
+
+    def __init__(
+        self,
+        backend,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        poll_interval_seconds: float,
+    ):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[str, dict, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Dict[str, int] = {}
+        self._tasks = set()
+        self.submitted_batches = 0
+        self.completed_jobs = 0
+        self.failed_jobs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def submit(self, request: dict) -> Tuple[str, Any]:
+        """Queue one chat completion request; returns (content, usage)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures and timers are bound to the loop that created them
+            self._loop = loop
+            self._pending = []
+            self._flush_timer = None
+
+        future = loop.create_future()
+        self._pending.append((f"job_{uuid.uuid4().hex}", request, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        jobs, self._pending = self._pending, []
+        if jobs:
+            task = asyncio.get_running_loop().create_task(self._run_batch(jobs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, jobs: List[Tuple[str, dict, asyncio.Future]]):
+        futures = {custom_id: future for custom_id, _, future in jobs}
+        started = time.perf_counter()
+        try:
+            batch_id = await self.backend.submit(
+                [(custom_id, request) for custom_id, request, _ in jobs]
+            )
+            self.submitted_batches += 1
+            self._in_flight[batch_id] = len(jobs)
+            print(f"📦 Submitted LLM batch {batch_id} ({len(jobs)} jobs)")
+
+            try:
+                results = None
+                while results is None:
+                    await asyncio.sleep(self.poll_interval_seconds)
+                    results = await self.backend.poll(batch_id)
+            finally:
+                self._in_flight.pop(batch_id, None)
+        except Exception as e:
+            print(f"⚠️  LLM batch failed: {e}")
+            results = {}
+
+        for custom_id, future in futures.items():
+            if future.done():
+                continue
+            result = results.get(custom_id) or {"error": "no result in batch output"}
+            if "error" in result:
+                self.failed_jobs += 1
+                future.set_exception(BatchJobError(result["error"]))
+            else:
+                self.completed_jobs += 1
+                future.set_result((result["content"], result.get("usage")))
+        print(
+            f"📦 LLM batch finished: {len(jobs)} jobs in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": settings.LLM_BATCH_BACKEND,
+            "queued": len(self._pending),
+            "in_flight_batches": len(self._in_flight),
+            "in_flight_jobs": sum(self._in_flight.values()),
+            "submitted_batches": self.submitted_batches,
+            "completed_jobs": self.completed_jobs,
+            "failed_jobs": self.failed_jobs,
+        }
+
+
+def _openai_client():
+    return get_clients().openai
+
+
+def _build_backend():
+    backend = settings.LLM_BATCH_BACKEND
+    if backend == "openai":
+        return OpenAIBatchBackend(_openai_client, settings.LLM_BATCH_COMPLETION_WINDOW)
+    if backend == "local":
+        return LocalBatchBackend(_openai_client, settings.LLM_BATCH_LOCAL_DELAY_SECONDS)
+    return None
+
+
+llm_batch = LLMBatchQueue(
+    _build_backend(),
+    max_batch_size=settings.LLM_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.LLM_BATCH_MAX_WAIT_SECONDS,
+    poll_interval_seconds=settings.LLM_BATCH_POLL_INTERVAL_SECONDS,
+)
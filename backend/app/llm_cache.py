@@ -0,0 +1,202 @@
+"""
+Content-addressed cache for LLM completions.
+
+Entries are keyed on a hash of the request (model, messages, temperature,
+response_format, ...) and hold the completion text, so identical prompts
+skip the round trip to the provider.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+def make_cache_key(**request) -> str:
+    """Stable hash of the completion request parameters"""
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk LRU so cached completions survive restarts."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used_at "
+            "ON llm_cache (last_used_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl_seconds, now),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()[0]
+
+
+class LLMCache:
+    """Cache front end with per-call-site opt-in and hit/miss counters."""
+
+    def __init__(self, backend, ttl_seconds: int, call_sites):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.call_sites = set(call_sites)
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def enabled_for(self, call_site: str) -> bool:
+        return self.backend is not None and call_site in self.call_sites
+
+    def get(self, call_site: str, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        with self._lock:
+            stats = self._site_stats(call_site)
+            if value is None:
+                stats["misses"] += 1
+            else:
+                stats["hits"] += 1
+                # A hit saves roughly what the last miss for this site cost
+                stats["saved_seconds"] += stats["last_miss_seconds"]
+        return value
+
+    def set(self, call_site: str, key: str, value: str, elapsed_seconds: float):
+        self.backend.set(key, value, self.ttl_seconds)
+        with self._lock:
+            self._site_stats(call_site)["last_miss_seconds"] = elapsed_seconds
+
+    def _site_stats(self, call_site: str) -> Dict[str, float]:
+        return self._stats.setdefault(
+            call_site,
+            {"hits": 0, "misses": 0, "saved_seconds": 0.0, "last_miss_seconds": 0.0},
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            call_sites = {
+                site: {
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "estimated_seconds_saved": round(stats["saved_seconds"], 3),
+                }
+                for site, stats in self._stats.items()
+            }
+        hits = sum(s["hits"] for s in call_sites.values())
+        misses = sum(s["misses"] for s in call_sites.values())
+        return {
+            "backend": settings.LLM_CACHE_BACKEND,
+            "enabled_call_sites": sorted(self.call_sites),
+            "entries": self.backend.size() if self.backend is not None else 0,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "call_sites": call_sites,
+        }
+
+
+def _build_backend():
+    backend = settings.LLM_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryCacheBackend(settings.LLM_CACHE_MAX_ENTRIES)
+    if backend == "sqlite":
+        try:
+            return SQLiteCacheBackend(
+                settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ENTRIES
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache SQLite backend unavailable ({e}), using memory")
+            return MemoryCacheBackend(settings.LLM_CACHE_MAX_ENTRIES)
+    return None
+
+
+llm_cache = LLMCache(
+    _build_backend(),
+    settings.LLM_CACHE_TTL_SECONDS,
+    settings.LLM_CACHE_CALL_SITES,
+)
@@ -0,0 +1,287 @@
+"""
+Per call site instrumentation of LLM calls: latency, tokens, retries, cache
+hits and fallbacks, aggregated for /api/metrics and summarised per operation
+for CommunicationLog.ai_metadata.
+"""
+
+import functools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from app.constants import AI_BATCH_PRICE_MULTIPLIER, AI_MODEL_PRICING_PER_MILLION_TOKENS
+from app.metrics import Histogram
+
+TOKEN_BUCKETS = [50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000]
+# Recent successful realtime latencies kept per call site for hedge delays
+LATENCY_WINDOW_SIZE = 200
+
+_current_call: ContextVar[Optional["LLMCallRecord"]] = ContextVar(
+    "llm_current_call", default=None
+)
+_current_trace: ContextVar[Optional["LLMTrace"]] = ContextVar(
+    "llm_current_trace", default=None
+)
+
+
+def estimate_cost(
+    model: Optional[str],
+    prompt_tokens: int,
+    completion_tokens: int,
+    batched: bool = False,
+) -> Optional[float]:
+    pricing = AI_MODEL_PRICING_PER_MILLION_TOKENS.get(model or "")
+    if not pricing:
+        return None
+    cost = (
+        prompt_tokens * pricing["prompt"] + completion_tokens * pricing["completion"]
+    ) / 1_000_000
+    return cost * AI_BATCH_PRICE_MULTIPLIER if batched else cost
+
+
+class LLMCallRecord:
+    """One provider call (or cache hit) for one call site."""
+
+    def __init__(self, call_site: str, model: Optional[str]):
+        self.call_site = call_site
+        self.model = model
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_seconds = 0.0
+        self.attempts = 0
+        self.cached = False
+        self.batched = False
+        self.hedged = False
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+        self._finished = False
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+    @property
+    def fallback(self) -> bool:
+        # Every AIAgentService caller answers from a fallback when its call fails
+        return self.error is not None
+
+    def started(self):
+        """Restart the clock once the scheduler has granted a slot"""
+        self._start = time.perf_counter()
+
+    def finished(self, usage=None):
+        self.latency_seconds = time.perf_counter() - self._start
+        self._finished = True
+        self.prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        self.completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        if self.hedged:
+            # The abandoned duplicate request was billed the same prompt; its
+            # partial completion is unknown
+            self.prompt_tokens *= 2
+
+    @property
+    def estimated_cost(self) -> Optional[float]:
+        return estimate_cost(
+            self.model, self.prompt_tokens, self.completion_tokens, self.batched
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "call_site": self.call_site,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_ms": round(self.latency_seconds * 1000, 1),
+            "retries": self.retries,
+            "cached": self.cached,
+            "batched": self.batched,
+            "hedged": self.hedged,
+            "fallback": self.fallback,
+            "error": self.error,
+        }
+
+
+class LLMTrace:
+    """LLM calls made while handling one operation (e.g. one vendor reply)."""
+
+    def __init__(self):
+        self.calls: List[LLMCallRecord] = []
+        self._logged = 0
+
+    def drain_summary(self) -> Optional[dict]:
+        """Summary of the calls since the last drain, or None if there were none"""
+        calls = self.calls[self._logged :]
+        self._logged = len(self.calls)
+        if not calls:
+            return None
+
+        prompt_tokens = sum(c.prompt_tokens for c in calls)
+        completion_tokens = sum(c.completion_tokens for c in calls)
+        costs = [c.estimated_cost for c in calls]
+        return {
+            "llm_calls": [c.as_dict() for c in calls],
+            "total_latency_ms": round(sum(c.latency_seconds for c in calls) * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_cost_usd": round(sum(c for c in costs if c), 6),
+            "fallback_used": any(c.fallback for c in calls),
+        }
+
+
+@contextmanager
+def llm_trace():
+    """Collect the LLM calls made inside the block (including spawned tasks)"""
+    trace = LLMTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def with_llm_trace(func):
+    """Run an async function inside its own llm_trace()"""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with llm_trace():
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def current_trace() -> Optional[LLMTrace]:
+    return _current_trace.get()
+
+
+def record_http_attempt():
+    """Count an HTTP request against the LLM call in progress (retries included)"""
+    record = _current_call.get()
+    if record is not None:
+        record.attempts += 1
+
+
+class CallSiteStats:
+    def __init__(self):
+        self.calls = 0
+        self.cached = 0
+        self.batched = 0
+        self.hedged = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated_cost_usd = 0.0
+        self.latency = Histogram()
+        self.recent_latencies = deque(maxlen=LATENCY_WINDOW_SIZE)
+        self.total_tokens = Histogram(TOKEN_BUCKETS)
+
+    def snapshot(self) -> dict:
+        latency = self.latency.snapshot()
+        return {
+            "calls": self.calls,
+            "cached": self.cached,
+            "batched": self.batched,
+            "hedged": self.hedged,
+            "fallbacks": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "estimated_cost_usd": round(self.estimated_cost_usd, 6),
+            "total_latency_seconds": latency["sum"],
+            "latency_seconds": latency,
+            "total_tokens": self.total_tokens.snapshot(),
+        }
+
+
+class LLMMetrics:
+    """Aggregates LLMCallRecords per call site."""
+
+    def __init__(self):
+        self._sites: Dict[str, CallSiteStats] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, call_site: str, model: Optional[str]):
+        """Instrument one LLM call; failures inside the block count as fallbacks"""
+        record = LLMCallRecord(call_site, model)
+        token = _current_call.set(record)
+        try:
+            yield record
+        except Exception as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            _current_call.reset(token)
+            if not record._finished:
+                record.finished()
+            self.record(record)
+
+    def record(self, record: LLMCallRecord):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.calls.append(record)
+
+        with self._lock:
+            stats = self._sites.setdefault(record.call_site, CallSiteStats())
+            stats.calls += 1
+            if record.error is not None:
+                stats.errors += 1
+            if record.cached:
+                # Cache hits would drown the provider latency distribution
+                stats.cached += 1
+                return
+            stats.retries += record.retries
+            stats.prompt_tokens += record.prompt_tokens
+            stats.completion_tokens += record.completion_tokens
+            stats.estimated_cost_usd += record.estimated_cost or 0.0
+            if record.batched:
+                stats.batched += 1
+            if record.hedged:
+                stats.hedged += 1
+            if not record.batched and record.error is None:
+                # Failed and timed-out calls end at the budget, not when the
+                # provider answers, so they stay out of the hedge window
+                stats.recent_latencies.append(record.latency_seconds)
+        if not record.batched:
+            # Batch turnaround is minutes to hours; keep it out of the
+            # realtime latency distribution
+            stats.latency.observe(record.latency_seconds)
+        stats.total_tokens.observe(record.prompt_tokens + record.completion_tokens)
+
+    def latency_quantile(
+        self, call_site: str, q: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """
+        Quantile of a call site's recent successful realtime latencies, once it
+        has enough samples. Computed from the samples themselves: histogram
+        bucket bounds are too coarse (a 5.2s p95 reads as 10s).
+        """
+        with self._lock:
+            stats = self._sites.get(call_site)
+            samples = sorted(stats.recent_latencies) if stats is not None else []
+        if not samples or len(samples) < min_samples:
+            return None
+        # Nearest rank
+        return samples[max(0, math.ceil(q * len(samples)) - 1)]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            sites = dict(self._sites)
+        call_sites = {site: stats.snapshot() for site, stats in sites.items()}
+        return {
+            # Call sites ordered by the share of LLM time they account for
+            "by_total_latency": sorted(
+                call_sites,
+                key=lambda site: call_sites[site]["total_latency_seconds"],
+                reverse=True,
+            ),
+            "call_sites": call_sites,
+        }
+
+
+llm_metrics = LLMMetrics()
@@ -0,0 +1,278 @@
+"""
+Latency budgets, hedged requests and a circuit breaker for LLM provider
+calls, so a slow or failing provider degrades to the deterministic fallbacks
+quickly instead of holding up webhooks and automation steps.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+import openai
+
+from app.config import settings
+from app.llm_metrics import llm_metrics
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Errors that say the provider is slow or unhealthy. Client errors (bad
+# request, auth) and unparseable replies don't trip the breaker.
+PROVIDER_FAILURES = (
+    asyncio.TimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider the breaker considers degraded."""
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive provider failures. After
+    ``reset_seconds`` one probe call is let through: success closes the
+    breaker, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.short_circuited = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == BREAKER_OPEN:
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    self.short_circuited += 1
+                    return False
+                self.state = BREAKER_HALF_OPEN
+            if self.state == BREAKER_HALF_OPEN:
+                if self._probe_in_flight:
+                    self.short_circuited += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != BREAKER_CLOSED:
+                print(f"✅ {self.name} circuit closed")
+            self.state = BREAKER_CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, error: BaseException):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            self._probe_in_flight = False
+            if (
+                self.state == BREAKER_HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state != BREAKER_OPEN:
+                    print(f"🔌 {self.name} circuit open: {self.last_error}")
+                self.state = BREAKER_OPEN
+                self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """A probe that ended without a verdict (e.g. cancelled)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in = None
+            if self.state == BREAKER_OPEN:
+                retry_in = max(
+                    0.0, self.reset_seconds - (time.monotonic() - self.opened_at)
+                )
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "short_circuited": self.short_circuited,
+                "last_error": self.last_error,
+                "retry_in_seconds": round(retry_in, 1)
+                if retry_in is not None
+                else None,
+            }
+
+
+class HedgeStats:
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, hedge_won: bool):
+        with self._lock:
+            counts = self._counts.setdefault(call_site, {"fired": 0, "won": 0})
+            counts["fired"] += 1
+            counts["won"] += int(hedge_won)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {site: dict(counts) for site, counts in self._counts.items()}
+
+
+openai_breaker = CircuitBreaker(
+    "OpenAI",
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+)
+hedge_stats = HedgeStats()
+
+
+def latency_budget(call_site: str) -> float:
+    return settings.LLM_LATENCY_BUDGETS.get(
+        call_site, settings.LLM_DEFAULT_LATENCY_BUDGET_SECONDS
+    )
+
+
+def hedge_delay(call_site: str) -> Optional[float]:
+    """Seconds to wait before hedging (observed p95), or None if not hedged"""
+    if call_site not in settings.LLM_HEDGE_CALL_SITES:
+        return None
+    p95 = llm_metrics.latency_quantile(
+        call_site, 0.95, min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+    )
+    delay = p95 if p95 is not None else settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+    # A hedge fired near the end of the budget can't finish inside it
+    return min(delay, latency_budget(call_site) * settings.LLM_HEDGE_MAX_BUDGET_SHARE)
+
+
+@asynccontextmanager
+async def _no_slot():
+    yield None
+
+
+async def _hedged(
+    call_site: str,
+    attempt: Callable[[Any], Awaitable],
+    ticket: Any,
+    slot: Callable[[], AsyncContextManager],
+    delay: float,
+    on_hedge: Optional[Callable[[], None]] = None,
+):
+    async def hedge():
+        # The hedge queues for a slot of its own, so a saturated scheduler
+        # doesn't get an extra request; it just loses the race
+        async with slot() as hedge_ticket:
+            return await attempt(hedge_ticket)
+
+    first = asyncio.ensure_future(attempt(ticket))
+    pending = {first}
+    second = None
+    # Covers the wait for the first attempt too: if the budget cancels us at
+    # any point, no attempt is left running unowned
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result()
+
+        second = asyncio.ensure_future(hedge())
+        pending.add(second)
+        if on_hedge is not None:
+            on_hedge()
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    hedge_stats.record(call_site, hedge_won=task is second)
+                    return task.result()
+                error = task.exception()
+        hedge_stats.record(call_site, hedge_won=False)
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class SchedulerQueueTimeout(Exception):
+    """No scheduler slot within the queue timeout; the provider was never called."""
+
+
+async def guarded_call(
+    call_site: str,
+    attempt: Callable[[Any], Awaitable],
+    slot: Optional[Callable[[], AsyncContextManager]] = None,
+    on_dispatch: Optional[Callable[[], None]] = None,
+    on_hedge: Optional[Callable[[], None]] = None,
+    breaker: CircuitBreaker = openai_breaker,
+):
+    """
+    Run ``attempt(ticket)`` within the call site's latency budget, hedging it
+    once after the observed p95 if the call site opts in. ``slot`` is entered
+    first (e.g. an LLM scheduler slot yielding the ticket); the budget and the
+    hedge timer start only once it is granted, so local queueing is never
+    mistaken for a slow provider. Waiting for the slot is bounded separately
+    by LLM_QUEUE_TIMEOUT_SECONDS (SchedulerQueueTimeout, which doesn't count
+    against the breaker). Raises CircuitOpenError without calling the provider
+    while the breaker is open.
+    """
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"{breaker.name} circuit open, skipping {call_site}")
+
+    slot = slot or _no_slot
+    dispatched = False
+    try:
+        async with asyncio.timeout(settings.LLM_QUEUE_TIMEOUT_SECONDS) as queue_wait:
+            async with slot() as ticket:
+                queue_wait.reschedule(None)
+                dispatched = True
+                if on_dispatch is not None:
+                    on_dispatch()
+                delay = hedge_delay(call_site)
+                if delay is None:
+                    call = attempt(ticket)
+                else:
+                    call = _hedged(call_site, attempt, ticket, slot, delay, on_hedge)
+                # Timeouts from here on are after dispatch, so they count
+                # against the provider
+                response = await asyncio.wait_for(call, latency_budget(call_site))
+    except PROVIDER_FAILURES as e:
+        if not dispatched:
+            breaker.release_probe()
+            raise SchedulerQueueTimeout(
+                f"{call_site} waited over {settings.LLM_QUEUE_TIMEOUT_SECONDS}s "
+                "for an LLM slot"
+            ) from e
+        breaker.record_failure(e)
+        raise
+    except Exception:
+        # The provider answered (e.g. a 400), so it isn't degraded
+        breaker.record_success()
+        raise
+    except BaseException:
+        breaker.release_probe()
+        raise
+
+    breaker.record_success()
+    return response
+
+
+def snapshot() -> dict:
+    return {
+        "circuit_breaker": openai_breaker.snapshot(),
+        "hedges": hedge_stats.snapshot(),
+        "latency_budgets": {
+            "default": settings.LLM_DEFAULT_LATENCY_BUDGET_SECONDS,
+            **settings.LLM_LATENCY_BUDGETS,
+        },
+    }
@@ -0,0 +1,194 @@
+"""
+Process-wide scheduler for LLM calls: bounded concurrency, RPM/TPM token
+buckets and priority lanes, so background fan-outs can't starve interactive
+requests or push the provider into rate limiting.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.metrics import Histogram
+
+LANE_INTERACTIVE = "interactive"
+LANE_BACKGROUND = "background"
+
+# Lower runs first
+LANE_PRIORITIES = {LANE_INTERACTIVE: 0, LANE_BACKGROUND: 1}
+
+CHARS_PER_TOKEN = 4
+DEFAULT_COMPLETION_TOKENS = 500
+
+
+class TokenBucket:
+    """Refills continuously up to ``capacity`` tokens per minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)"""
+        self._refill()
+        # A request larger than the bucket only has to wait for a full bucket
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def adjust(self, amount: float):
+        """Correct an earlier estimate; may leave the bucket in debt"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class Ticket:
+    def __init__(self, lane: str, estimated_tokens: int):
+        self.lane = lane
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def record_usage(self, total_tokens: Optional[int]):
+        self.actual_tokens = total_tokens
+
+
+class LLMScheduler:
+    """
+    Grants LLM call slots in priority order. Background calls may not use the
+    slots reserved for the interactive lane.
+    """
+
+    def __init__(
+        self, max_concurrency: int, interactive_reserved: int, rpm: int, tpm: int
+    ):
+        self.max_concurrency = max_concurrency
+        self.background_limit = max(1, max_concurrency - interactive_reserved)
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.in_flight: Dict[str, int] = {lane: 0 for lane in LANE_PRIORITIES}
+        self._waiters: List = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.wait_time: Dict[str, Histogram] = {
+            lane: Histogram() for lane in LANE_PRIORITIES
+        }
+        self.completed: Dict[str, int] = {lane: 0 for lane in LANE_PRIORITIES}
+
+    @staticmethod
+    def estimate_tokens(messages: List[dict], max_tokens: Optional[int]) -> int:
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+        return prompt_chars // CHARS_PER_TOKEN + (
+            max_tokens or DEFAULT_COMPLETION_TOKENS
+        )
+
+    @asynccontextmanager
+    async def slot(self, lane: str = LANE_BACKGROUND, estimated_tokens: int = 0):
+        """Hold one LLM call slot for the duration of the block"""
+        ticket = Ticket(lane, estimated_tokens)
+        start = time.perf_counter()
+        await self._acquire(ticket)
+        self.wait_time[lane].observe(time.perf_counter() - start)
+        try:
+            yield ticket
+        finally:
+            self.in_flight[lane] -= 1
+            self.completed[lane] += 1
+            if ticket.actual_tokens is not None:
+                self.tokens.adjust(ticket.actual_tokens - ticket.estimated_tokens)
+            self._dispatch()
+
+    async def _acquire(self, ticket: Ticket):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (LANE_PRIORITIES[ticket.lane], next(self._seq), ticket, future),
+        )
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self.in_flight[ticket.lane] -= 1
+                self._dispatch()
+            raise
+
+    def _has_capacity(self, lane: str) -> bool:
+        total = sum(self.in_flight.values())
+        if lane == LANE_INTERACTIVE:
+            return total < self.max_concurrency
+        return total < self.max_concurrency and (
+            self.in_flight[LANE_BACKGROUND] < self.background_limit
+        )
+
+    def _dispatch(self):
+        while self._waiters:
+            _, _, ticket, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._has_capacity(ticket.lane):
+                # The head is the highest-priority waiter, so nothing queued
+                # behind it may take a slot first.
+                return
+
+            wait = max(
+                self.requests.wait_time(1),
+                self.tokens.wait_time(ticket.estimated_tokens),
+            )
+            if wait > 0:
+                self._schedule_retry(wait)
+                return
+
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(ticket.estimated_tokens)
+            self.in_flight[ticket.lane] += 1
+            future.set_result(None)
+
+    def _schedule_retry(self, delay: float):
+        if self._timer is not None and not self._timer.cancelled():
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._dispatch)
+
+    def snapshot(self) -> dict:
+        queued = {lane: 0 for lane in LANE_PRIORITIES}
+        for _, _, ticket, future in self._waiters:
+            if not future.done():
+                queued[ticket.lane] += 1
+        return {
+            "max_concurrency": self.max_concurrency,
+            "background_limit": self.background_limit,
+            "in_flight": dict(self.in_flight),
+            "queued": queued,
+            "completed": dict(self.completed),
+            "requests_bucket": round(self.requests.tokens, 1),
+            "tokens_bucket": round(self.tokens.tokens, 1),
+            "wait_seconds": {
+                lane: histogram.snapshot() for lane, histogram in self.wait_time.items()
+            },
+        }
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    interactive_reserved=settings.LLM_INTERACTIVE_RESERVED_SLOTS,
+    rpm=settings.LLM_RPM_LIMIT,
+    tpm=settings.LLM_TPM_LIMIT,
+)
@@ -2,8 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from app.clients import clients
 from app.config import settings
-from app.database import init_db
+from app.database import init_db, dispose_engines, run_in_session
+from app.llm_resilience import BREAKER_OPEN, openai_breaker
+from app.vendor_index import vendor_index
 from app.routes import (
     work_orders,
     vendors,
@@ -14,6 +17,7 @@ from app.routes import (
     demo,
     confirmations,
     automation,
+    metrics,
 )
 
 
@@ -21,9 +25,18 @@ from app.routes import (
 async def lifespan(app: FastAPI):
     print("🚀 Initializing Tavi Backend...")
     init_db()
-    print("✅ Database initialized")
+    print("✅ Database schema at head")
+    if settings.VENDOR_INDEX_ENABLED:
+        try:
+            await run_in_session(vendor_index.refresh)
+        except Exception as e:
+            # Discovery refreshes it on first use; external search still works
+            print(f"⚠️  Vendor index load failed: {e}")
+    await clients.start()
     yield
     print("👋 Shutting down Tavi Backend...")
+    await clients.close()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -54,6 +67,7 @@ app.include_router(
     confirmations.router, prefix="/api/confirmations", tags=["Confirmations"]
 )
 app.include_router(automation.router, prefix="/api/automation", tags=["Automation"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
 
 
 @app.get("/")
@@ -63,4 +77,8 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    llm_circuit = openai_breaker.snapshot()
+    # Still a 200: the API serves requests on deterministic fallbacks while
+    # the LLM provider is degraded
+    status = "degraded" if llm_circuit["state"] == BREAKER_OPEN else "healthy"
+    return {"status": status, "llm_circuit": llm_circuit}
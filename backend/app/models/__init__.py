@@ -2,5 +2,6 @@ from app.models.work_order import WorkOrder
 from app.models.vendor import Vendor
 from app.models.quote import Quote
 from app.models.communication_log import CommunicationLog
+from app.models.geocode_cache import GeocodeCache
 
-__all__ = ["WorkOrder", "Vendor", "Quote", "CommunicationLog"]
+__all__ = ["WorkOrder", "Vendor", "Quote", "CommunicationLog", "GeocodeCache"]
@@ -8,9 +8,10 @@ from sqlalchemy import (
     Boolean,
     JSON,
     Float,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 import enum
@@ -47,17 +48,41 @@ class CommunicationLog(Base):
 
     call_duration_seconds = Column(Float)
     call_recording_url = Column(String(500))
-    call_transcript = Column(Text)
+    # Heavy AI/call trace columns, deferred: use undefer_group("ai_trace")
+    call_transcript = deferred(Column(Text), group="ai_trace", raiseload=True)
 
     ai_model_used = Column(String(100))
-    ai_prompt = Column(Text)
-    ai_response = Column(Text)
-    ai_metadata = Column(JSON)
+    ai_prompt = deferred(Column(Text), group="ai_trace", raiseload=True)
+    ai_response = deferred(Column(Text), group="ai_trace", raiseload=True)
+    # none_as_null: a missing summary is SQL NULL, not the JSON literal 'null'
+    ai_metadata = deferred(
+        Column(JSON(none_as_null=True)), group="ai_trace", raiseload=True
+    )
 
     external_id = Column(String(200))
     timestamp = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Kept in sync with the index migrations in migrations/versions
+    __table_args__ = (
+        Index(
+            "ix_communication_logs_work_order_id_vendor_id_channel",
+            work_order_id,
+            vendor_id,
+            channel,
+            timestamp,
+        ),
+        Index(
+            "ix_communication_logs_work_order_id_timestamp", work_order_id, timestamp
+        ),
+        Index(
+            "ix_communication_logs_vendor_id_timestamp",
+            vendor_id,
+            timestamp,
+            postgresql_where=vendor_id.isnot(None),
+        ),
+    )
+
     work_order = relationship("WorkOrder", back_populates="communication_logs")
 
     def __repr__(self):
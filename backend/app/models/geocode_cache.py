@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Float, DateTime
+from datetime import datetime
+
+from app.database import Base
+
+
+class GeocodeCache(Base):
+    """Geocoding results keyed by normalized address (see utils.normalize_address)."""
+
+    __tablename__ = "geocode_cache"
+
+    address_key = Column(String(500), primary_key=True)
+    # NULL coordinates: Google had no result for the address
+    latitude = Column(Float)
+    longitude = Column(Float)
+    formatted_address = Column(String(500))
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GeocodeCache {self.address_key}>"
@@ -6,6 +6,7 @@ from sqlalchemy import (
     Text,
     Enum as SQLEnum,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -54,6 +55,20 @@ class Quote(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Kept in sync with the index migrations in migrations/versions
+    __table_args__ = (
+        # Conflict target for set-based quote creation
+        Index(
+            "uq_quotes_work_order_id_vendor_id", work_order_id, vendor_id, unique=True
+        ),
+        Index("ix_quotes_vendor_id_status_created_at", vendor_id, status, created_at),
+        Index(
+            "ix_quotes_work_order_id_priced",
+            work_order_id,
+            postgresql_where=price.isnot(None),
+        ),
+    )
+
     work_order = relationship("WorkOrder", back_populates="quotes")
     vendor = relationship("Vendor", back_populates="quotes")
 
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, String, Float, JSON, DateTime, ARRAY, Integer
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Float, JSON, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.orm import deferred, relationship, validates
 from datetime import datetime
 import uuid
 
+from app.constants import VENDOR_DEFAULT_SERVICE_RADIUS_MILES
 from app.database import Base
+from app.utils import normalize_phone
 
 
 class Vendor(Base):
@@ -15,6 +17,8 @@ class Vendor(Base):
     business_name = Column(String(255), nullable=False)
     contact_name = Column(String(200))
     phone = Column(String(50))
+    # Digits-only phone, unique: the dedup key for vendors without a place id
+    phone_normalized = Column(String(50))
     email = Column(String(200))
     website = Column(String(500))
 
@@ -24,7 +28,7 @@ class Vendor(Base):
     zip_code = Column(String(20))
     latitude = Column(Float)
     longitude = Column(Float)
-    service_radius_miles = Column(Float, default=30.0)
+    service_radius_miles = Column(Float, default=VENDOR_DEFAULT_SERVICE_RADIUS_MILES)
     trade_specialties = Column(ARRAY(String), default=[])
 
     google_rating = Column(Float)
@@ -33,19 +37,44 @@ class Vendor(Base):
     yelp_review_count = Column(Integer, default=0)
     bbb_rating = Column(String(10))
     composite_score = Column(Float)
+    # "$"-"$$$$" from Google price_level or Yelp price, set at upsert
+    price_display = Column(String(10))
 
     google_place_id = Column(String(200))
     yelp_business_id = Column(String(200))
     bbb_business_id = Column(String(200))
 
-    source_data = Column(JSON)
+    # Full Google Place details + Yelp payload. Deferred: list and quote
+    # payloads never need it; use undefer_group("vendor_source") to load it.
+    source_data = deferred(Column(JSON), group="vendor_source", raiseload=True)
+    # When Google Place details were last fetched; discovery reuses the row
+    # while this is within PLACE_DETAILS_TTL_DAYS
+    details_fetched_at = Column(DateTime)
     last_contacted = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Kept in sync with the index migrations in migrations/versions
+    __table_args__ = (
+        Index("ix_vendors_phone", phone, postgresql_where=phone.isnot(None)),
+        Index("ix_vendors_email", email, postgresql_where=email.isnot(None)),
+        # Conflict targets for VendorService.bulk_upsert_vendors
+        Index("uq_vendors_google_place_id", google_place_id, unique=True),
+        Index("uq_vendors_phone_normalized", phone_normalized, unique=True),
+        Index(
+            "ix_vendors_trade_specialties", trade_specialties, postgresql_using="gin"
+        ),
+        Index("ix_vendors_created_at_id", created_at, id),
+    )
+
     quotes = relationship(
         "Quote", back_populates="vendor", cascade="all, delete-orphan"
     )
 
+    @validates("phone")
+    def _sync_phone_normalized(self, key, phone):
+        self.phone_normalized = normalize_phone(phone)
+        return phone
+
     def __repr__(self):
         return f"<Vendor {self.business_name}>"
@@ -1,6 +1,15 @@
-from sqlalchemy import Column, String, Text, DateTime, Float, Enum as SQLEnum, JSON
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    DateTime,
+    Float,
+    Enum as SQLEnum,
+    JSON,
+    Index,
+)
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 import enum
@@ -133,11 +142,15 @@ class WorkOrder(Base):
     vendor_dispatch_confirmed = Column(DateTime, nullable=True)
     selected_vendor_id = Column(UUID(as_uuid=True), nullable=True)
 
-    raw_input = Column(Text)
-    ai_processing_log = Column(JSON)
+    # Intake text and LLM parse output, deferred: use undefer_group("intake")
+    raw_input = deferred(Column(Text), group="intake", raiseload=True)
+    ai_processing_log = deferred(Column(JSON), group="intake", raiseload=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Kept in sync with the index migrations in migrations/versions
+    __table_args__ = (Index("ix_work_orders_created_at_id", created_at, id),)
+
     quotes = relationship(
         "Quote", back_populates="work_order", cascade="all, delete-orphan"
     )
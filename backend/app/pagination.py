@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination and cheap row-count estimates for list endpoints.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    payload = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, with binds rendered by the driver"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def fetch_keyset_page(
+    db: AsyncSession, query: Select, model, limit: int, cursor: Optional[str] = None
+) -> Tuple[List, Optional[str]]:
+    """
+    Newest-first page of ``query`` keyed on (created_at, id).
+    Returns the rows and the cursor for the next page (None on the last page).
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+
+    # One extra row tells us whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return rows, next_cursor
+
+
+async def estimate_count(db: AsyncSession, query: Select, model) -> int:
+    """
+    Planner estimate of the number of rows ``query`` returns.
+    Unfiltered queries read pg_class.reltuples; filtered ones use EXPLAIN.
+    """
+    if query.whereclause is None:
+        estimate = await db.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"
+            ),
+            {"t": model.__tablename__},
+        )
+    else:
+        plan = await db.scalar(_Explain(query))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+    # reltuples is -1 until the table is first vacuumed/analyzed
+    if estimate is None or estimate < 0:
+        return await db.scalar(select(func.count()).select_from(query.subquery()))
+    return estimate
@@ -15,6 +15,13 @@ from app.prompts.vendor_contact_prompts import (
     VENDOR_CONTACT_SMS_USER_PROMPT,
     VENDOR_CONTACT_PHONE_SYSTEM_PROMPT,
     VENDOR_CONTACT_PHONE_USER_PROMPT,
+    VENDOR_OUTREACH_TEMPLATE_SYSTEM_PROMPT,
+    VENDOR_OUTREACH_TEMPLATE_USER_PROMPT,
+)
+
+from app.prompts.vendor_discovery_prompts import (
+    VENDOR_SEARCH_QUERY_SYSTEM_PROMPT,
+    VENDOR_SEARCH_QUERY_USER_PROMPT,
 )
 
 from app.prompts.response_parsing_prompts import (
@@ -31,6 +38,10 @@ __all__ = [
     "VENDOR_CONTACT_SMS_USER_PROMPT",
     "VENDOR_CONTACT_PHONE_SYSTEM_PROMPT",
     "VENDOR_CONTACT_PHONE_USER_PROMPT",
+    "VENDOR_OUTREACH_TEMPLATE_SYSTEM_PROMPT",
+    "VENDOR_OUTREACH_TEMPLATE_USER_PROMPT",
+    "VENDOR_SEARCH_QUERY_SYSTEM_PROMPT",
+    "VENDOR_SEARCH_QUERY_USER_PROMPT",
     "VENDOR_RESPONSE_PARSING_SYSTEM_PROMPT",
     "VENDOR_RESPONSE_PARSING_USER_PROMPT",
 ]
@@ -48,21 +48,33 @@ CRITICAL RULES:
 
 Work Order: {description}
 Budget: {budget}
+{extraction_instructions}
+Output ONLY valid JSON.
+"""
+
+# Shared by the email and SMS reply prompts so the reply decision and the quote
+# extraction come back from a single call in the same shape.
+VENDOR_REPLY_EXTRACTION_INSTRUCTIONS = """
+Also extract the quote from the vendor's messages in the same response.
+IMPORTANT - Extract availability as DAYS (number) and duration as HOURS (number):
+- "tomorrow" = 1 day
+- "in 3 days" = 3 days
+- "next week" = 7 days
+- "2 weeks" = 14 days
+- "half a day" = 4 hours, "2 days of work" = 16 hours
 
 Respond with JSON:
 {{
   "needs_human": true/false,
   "reason": "why" (if needs_human),
-  "response": "Brief reply (max 100 words)" or "Conversation complete",
+  "response": "{response_hint}" or "Conversation complete",
   "extracted_info": {{
     "price": number or null,
-    "availability": "date" or null,
-    "duration": "timeframe" or null
+    "availability_days": number or null,
+    "duration_hours": number or null
   }},
   "conversation_complete": true/false
 }}
-
-Output ONLY valid JSON.
 """
 
 VENDOR_SMS_INITIAL_PROMPT = """
@@ -104,25 +116,7 @@ RULES:
 4. Only ask for missing: price, availability
 
 **CRITICAL**: If price and availability are present, DO NOT flag for human review even if vendor says "let me know" or "please confirm" - this is NORMAL and does NOT need human intervention!
-
-IMPORTANT - For availability, extract DAYS as a number:
-- "tomorrow" = 1
-- "in 3 days" = 3
-- "next week" = 7
-- "2 weeks" = 14
-
-Respond with JSON:
-{{
-  "needs_human": true/false,
-  "reason": "why" (if needs_human),
-  "response": "SMS (max 160 chars)",
-  "extracted_info": {{
-    "price": number or null,
-    "availability_days": number or null
-  }},
-  "conversation_complete": true/false
-}}
-
+{extraction_instructions}
 Output ONLY valid JSON.
 """
 
@@ -81,3 +81,35 @@ Work Order Details:
 - Preferred Date: {preferred_date}
 
 Create a natural conversation script asking about availability and pricing."""
+
+
+VENDOR_OUTREACH_TEMPLATE_SYSTEM_PROMPT = """You are a professional service coordinator at Tavi.
+Generate outreach templates for contacting vendors about a potential job opportunity,
+one for each channel: email, SMS and phone.
+The same templates are sent to several vendors, so write the literal placeholder
+{vendor_name} wherever the vendor's business name belongs and never invent a name.
+Respond in JSON with exactly these keys:
+- "email_subject": a clear email subject line
+- "email_body": a professional, concise email body with all relevant details
+- "sms": an SMS under 160 characters (not counting the placeholder), no subject line
+- "phone_script": a natural, friendly script a voice agent would read"""
+
+
+def VENDOR_OUTREACH_TEMPLATE_USER_PROMPT(
+    trade_type: str,
+    location_address: str,
+    description: str,
+    urgency: str,
+    preferred_date: str,
+) -> str:
+    """Generate user prompt for the per-work-order outreach templates."""
+    return f"""Generate email, SMS and phone outreach templates for this job:
+
+Work Order Details:
+- Type: {trade_type}
+- Location: {location_address}
+- Description: {description}
+- Urgency: {urgency}
+- Preferred Date: {preferred_date}
+
+Ask each vendor about availability, their quote, and when they could complete the work."""
@@ -0,0 +1,32 @@
+"""
+Prompts for vendor discovery search query generation.
+"""
+
+VENDOR_SEARCH_QUERY_SYSTEM_PROMPT = "You are an expert at generating search queries to find the best service providers. Return ONLY a JSON array of strings."
+
+
+def VENDOR_SEARCH_QUERY_USER_PROMPT(
+    trade_type: str,
+    title: str,
+    description: str,
+    urgency: str,
+    work_type: str,
+) -> str:
+    """Generate user prompt for vendor search queries."""
+    return f"""Generate 3 optimized Google search queries to find the best service providers for this work order:
+
+Work Order Details:
+- Trade Type: {trade_type}
+- Title: {title}
+- Description: {description}
+- Urgency: {urgency}
+- Work Type: {work_type}
+
+Generate queries that will find:
+1. Highly rated professionals specializing in this exact service
+2. Emergency/urgent providers if needed
+3. Licensed and insured businesses
+
+Return a JSON array of 3 search query strings.
+Example: ["emergency plumber licensed insured", "24/7 plumbing repair service", "licensed plumber burst pipe repair"]
+"""
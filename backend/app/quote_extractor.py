@@ -0,0 +1,208 @@
+"""
+Rule-based extraction of price, availability and duration from vendor replies.
+
+Most replies follow a handful of shapes ("Quote: $250. Available starting in 3
+days. Estimated 4 hour job"), which a few regexes handle in microseconds. The
+confidence score tells callers when it is safe to skip the LLM.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.constants import COUNTRY_CURRENCY_MAP, DEFAULT_CURRENCY
+
+
+def _currency_markers() -> Dict[str, str]:
+    """Symbol or ISO code -> currency code, from COUNTRY_CURRENCY_MAP"""
+    markers = {}
+    for info in COUNTRY_CURRENCY_MAP.values():
+        markers.setdefault(info["symbol"], info["code"])
+        markers.setdefault(info["code"], info["code"])
+    # Symbols shared by several currencies ($, ¥, ﷼) keep their first mapping;
+    # the country of the work order disambiguates if a caller needs it.
+    for word in ("dollars", "dollar", "bucks"):
+        markers.setdefault(word, DEFAULT_CURRENCY)
+    return markers
+
+
+CURRENCY_MARKERS = _currency_markers()
+
+# Longest first so "C$" wins over "$" and "HK$" over "$"
+_MARKER_PATTERN = "|".join(
+    re.escape(marker) for marker in sorted(CURRENCY_MARKERS, key=len, reverse=True)
+)
+_AMOUNT = r"\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?"
+
+# Alphabetic markers (R, RM, USD, ...) must not be the tail of a word
+PRICE_BEFORE_RE = re.compile(
+    rf"(?<![A-Za-z])(?P<marker>{_MARKER_PATTERN})\s?(?P<amount>{_AMOUNT})(?!\s*%)"
+)
+PRICE_AFTER_RE = re.compile(
+    rf"(?<![\d.,])(?P<amount>{_AMOUNT})\s?(?P<marker>{_MARKER_PATTERN})(?![A-Za-z])"
+)
+PRICE_KEYWORD_RE = re.compile(
+    rf"\b(?:quote|price|total|cost|charge|rate)\b[^\d\n]{{0,15}}(?P<amount>{_AMOUNT})",
+    re.IGNORECASE,
+)
+
+WORD_NUMBERS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+_COUNT = r"\d+(?:\.\d+)?|" + "|".join(WORD_NUMBERS)
+
+AVAILABILITY_PATTERNS: List[Tuple[re.Pattern, Optional[int]]] = [
+    (
+        re.compile(rf"\b(?:in|within)\s+(?P<n>{_COUNT})\s+days?\b", re.IGNORECASE),
+        1,
+    ),
+    (
+        re.compile(rf"\b(?P<n>{_COUNT})\s+days?\s+from\s+(?:now|today)", re.IGNORECASE),
+        1,
+    ),
+    (
+        re.compile(rf"\b(?:in|within)\s+(?P<n>{_COUNT})\s+weeks?\b", re.IGNORECASE),
+        7,
+    ),
+    (re.compile(r"\btomorrow\b", re.IGNORECASE), None),
+    (re.compile(r"\bnext\s+week\b", re.IGNORECASE), None),
+    (re.compile(r"\b(?:today|right away|immediately|asap)\b", re.IGNORECASE), None),
+]
+FIXED_AVAILABILITY_DAYS = {"tomorrow": 1, "next week": 7}
+
+DURATION_RE = re.compile(
+    rf"\b(?P<n>{_COUNT})\s*(?:-\s*)?(?:hours?|hrs?|h)\b", re.IGNORECASE
+)
+
+# Replies a rule can't safely close out on its own
+HEDGE_RE = re.compile(
+    r"\?|\b(?:not|can't|cannot|won't|unable|unavailable|decline|booked|depends|"
+    r"plus|extra|additional|hourly|/hr|estimate only|"
+    # Conditions, deposits and partial or approximate prices
+    r"check(?:ing)?|first|deposit|excl\w*|materials|parts|approx\w*|range|"
+    r"from(?!\s+(?:now|today))|"
+    # Per-unit prices (per hour, per visit, $300 each) aren't the job total
+    r"per\s+\w+|each|apiece|a\s+piece)\b",
+    re.IGNORECASE,
+)
+
+# An unambiguous price plus availability is enough to skip the LLM
+FAST_PATH_MIN_CONFIDENCE = 0.8
+
+
+def _to_number(raw: str) -> Optional[float]:
+    raw = raw.lower()
+    if raw in WORD_NUMBERS:
+        return float(WORD_NUMBERS[raw])
+    try:
+        return float(raw.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _find_prices(text: str) -> Tuple[List[float], Optional[str], bool]:
+    """Distinct amounts, the currency code, and whether a symbol/code was seen"""
+    prices, currency = [], None
+    for pattern in (PRICE_BEFORE_RE, PRICE_AFTER_RE):
+        for match in pattern.finditer(text):
+            amount = _to_number(match.group("amount"))
+            if amount is not None and amount not in prices:
+                prices.append(amount)
+                currency = currency or CURRENCY_MARKERS[match.group("marker")]
+    if prices:
+        return prices, currency, True
+
+    for match in PRICE_KEYWORD_RE.finditer(text):
+        amount = _to_number(match.group("amount"))
+        if amount is not None and amount not in prices:
+            prices.append(amount)
+    return prices, None, False
+
+
+def _find_availability_days(text: str) -> Optional[float]:
+    for pattern, multiplier in AVAILABILITY_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        if multiplier is not None:
+            n = _to_number(match.group("n"))
+            return n * multiplier if n is not None else None
+        phrase = re.sub(r"\s+", " ", match.group(0).lower())
+        return float(FIXED_AVAILABILITY_DAYS.get(phrase, 0))
+    return None
+
+
+def _find_duration_hours(text: str) -> Optional[float]:
+    match = DURATION_RE.search(text)
+    return _to_number(match.group("n")) if match else None
+
+
+def extract_quote(text: str) -> Dict[str, Any]:
+    """
+    Price, currency, availability_days and duration_hours found in ``text``,
+    with a 0-1 confidence that they capture the vendor's quote.
+    """
+    text = text or ""
+    prices, currency, has_marker = _find_prices(text)
+    availability_days = _find_availability_days(text)
+    duration_hours = _find_duration_hours(text)
+
+    confidence = 0.0
+    if len(prices) == 1:
+        confidence = 0.6 if has_marker else 0.4
+        if availability_days is not None:
+            confidence += 0.25
+        if duration_hours is not None:
+            confidence += 0.1
+        if HEDGE_RE.search(text):
+            confidence -= 0.4
+    elif prices:
+        # Ranges or itemised prices need a model to pick the quote
+        confidence = 0.2
+
+    return {
+        "price": prices[0] if len(prices) == 1 else None,
+        "currency": currency or (DEFAULT_CURRENCY if prices else None),
+        "availability_days": availability_days,
+        "duration_hours": duration_hours,
+        "confidence": round(max(0.0, min(confidence, 1.0)), 2),
+    }
+
+
+class FastPathStats:
+    """Per call site count of replies handled without the LLM."""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, hit: bool):
+        with self._lock:
+            counts = self._counts.setdefault(call_site, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {site: dict(counts) for site, counts in self._counts.items()}
+
+
+fast_path_stats = FastPathStats()
+
+
+def fast_path_extract(call_site: str, text: str) -> Optional[Dict[str, Any]]:
+    """The extraction when it is confident enough to skip the LLM, else None"""
+    extracted = extract_quote(text)
+    hit = extracted["confidence"] >= FAST_PATH_MIN_CONFIDENCE
+    fast_path_stats.record(call_site, hit)
+    return extracted if hit else None
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_async_read_db
 from app.schemas.communication import CommunicationLogResponse
 from app.services.communication_service import CommunicationService
 
@@ -13,18 +13,20 @@ router = APIRouter()
 @router.get(
     "/work-order/{work_order_id}", response_model=List[CommunicationLogResponse]
 )
-def get_communications_for_work_order(
-    work_order_id: UUID, db: Session = Depends(get_db)
+async def get_communications_for_work_order(
+    work_order_id: UUID, db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all communications for a specific work order (unified stream)"""
     service = CommunicationService(db)
-    communications = service.get_communications_for_work_order(work_order_id)
+    communications = await service.get_communications_for_work_order(work_order_id)
     return communications
 
 
 @router.get("/vendor/{vendor_id}", response_model=List[CommunicationLogResponse])
-def get_communications_for_vendor(vendor_id: UUID, db: Session = Depends(get_db)):
+async def get_communications_for_vendor(
+    vendor_id: UUID, db: AsyncSession = Depends(get_async_read_db)
+):
     """Get all communications with a specific vendor"""
     service = CommunicationService(db)
-    communications = service.get_communications_for_vendor(vendor_id)
+    communications = await service.get_communications_for_vendor(vendor_id)
     return communications
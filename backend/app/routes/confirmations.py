@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_async_db, run_in_session
 from app.models.work_order import WorkOrder, WorkOrderStatus
 from app.models.quote import Quote
 from app.models.communication_log import CommunicationChannel
 from app.services.communication_service import CommunicationService
+from app.services.quote_service import QuoteService
 from app.constants import get_currency_info
 
 router = APIRouter()
@@ -24,7 +27,7 @@ class ConfirmVendorRequest(BaseModel):
 async def confirm_vendor_selection(
     request: ConfirmVendorRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Initiate vendor confirmation process:
@@ -32,7 +35,7 @@ async def confirm_vendor_selection(
     2. Send dispatch confirmation to vendor
     Both need approval before final dispatch
     """
-    quote = db.query(Quote).filter(Quote.id == UUID(request.quote_id)).first()
+    quote = await QuoteService(db).get_quote(UUID(request.quote_id))
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
 
@@ -45,14 +48,14 @@ async def confirm_vendor_selection(
     work_order.status = WorkOrderStatus.VENDOR_SELECTED
     quote.status = "accepted"
 
-    db.commit()
+    await db.commit()
 
     background_tasks.add_task(
-        send_facility_manager_confirmation, db, work_order.id, vendor.id
+        run_in_session, send_facility_manager_confirmation, work_order.id, vendor.id
     )
 
     background_tasks.add_task(
-        send_vendor_dispatch_confirmation, db, work_order.id, vendor.id
+        run_in_session, send_vendor_dispatch_confirmation, work_order.id, vendor.id
     )
 
     return {
@@ -62,29 +65,29 @@ async def confirm_vendor_selection(
     }
 
 
+async def _get_quote_for_vendor(
+    db: AsyncSession, work_order_id: UUID, vendor_id: UUID
+) -> Quote:
+    return await db.scalar(
+        select(Quote)
+        .options(joinedload(Quote.vendor))
+        .where(Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id)
+    )
+
+
 async def send_facility_manager_confirmation(
-    db: Session, work_order_id: UUID, vendor_id: UUID
+    db: AsyncSession, work_order_id: UUID, vendor_id: UUID
 ):
     """Send confirmation email to facility manager"""
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == work_order_id).first()
-    vendor = (
-        db.query(Quote)
-        .filter(Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id)
-        .first()
-        .vendor
-    )
+    work_order = await db.scalar(select(WorkOrder).where(WorkOrder.id == work_order_id))
+    quote = await _get_quote_for_vendor(db, work_order_id, vendor_id)
+    vendor = quote.vendor if quote else None
 
     if not work_order or not vendor:
         return
 
     comm_service = CommunicationService(db)
 
-    quote = (
-        db.query(Quote)
-        .filter(Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id)
-        .first()
-    )
-
     currency_info = get_currency_info(work_order.location_country or "United States")
     currency_symbol = currency_info["symbol"]
 
@@ -103,7 +106,7 @@ Best regards,
 Tavi Team"""
 
     # Log the outbound confirmation request
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=None,  # This is to facility manager, not vendor
         channel=CommunicationChannel.EMAIL,
@@ -119,7 +122,7 @@ Tavi Team"""
     )
 
     work_order.status = WorkOrderStatus.AWAITING_FACILITY_CONFIRMATION
-    db.commit()
+    await db.commit()
 
     print(
         f"📧 Sent facility manager confirmation to {work_order.facility_manager_email}"
@@ -127,16 +130,12 @@ Tavi Team"""
 
 
 async def send_vendor_dispatch_confirmation(
-    db: Session, work_order_id: UUID, vendor_id: UUID
+    db: AsyncSession, work_order_id: UUID, vendor_id: UUID
 ):
     """Send dispatch confirmation to vendor"""
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == work_order_id).first()
-    quote = (
-        db.query(Quote)
-        .filter(Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id)
-        .first()
-    )
-    vendor = quote.vendor
+    work_order = await db.scalar(select(WorkOrder).where(WorkOrder.id == work_order_id))
+    quote = await _get_quote_for_vendor(db, work_order_id, vendor_id)
+    vendor = quote.vendor if quote else None
 
     if not work_order or not vendor:
         return
@@ -156,7 +155,7 @@ Please reply "CONFIRMED" to confirm you can start on the agreed date, or contact
 Thank you,
 Tavi Team"""
 
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=vendor.id,
         channel=CommunicationChannel.EMAIL,
@@ -171,10 +170,10 @@ Tavi Team"""
 
 @router.post("/facility-confirm/{work_order_id}")
 async def facility_manager_confirms(
-    work_order_id: UUID, confirmation: dict, db: Session = Depends(get_db)
+    work_order_id: UUID, confirmation: dict, db: AsyncSession = Depends(get_async_db)
 ):
     """Handle facility manager confirmation (APPROVED/REJECT)"""
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == work_order_id).first()
+    work_order = await db.scalar(select(WorkOrder).where(WorkOrder.id == work_order_id))
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
@@ -186,7 +185,7 @@ async def facility_manager_confirms(
         if work_order.vendor_dispatch_confirmed:
             work_order.status = WorkOrderStatus.DISPATCHED
 
-        db.commit()
+        await db.commit()
 
         return {
             "status": "approved",
@@ -194,13 +193,11 @@ async def facility_manager_confirms(
         }
     else:
         # ✅ Reset vendor selection when facility manager rejects
-        selected_quote = (
-            db.query(Quote)
-            .filter(
+        selected_quote = await db.scalar(
+            select(Quote).where(
                 Quote.work_order_id == work_order_id,
                 Quote.vendor_id == work_order.selected_vendor_id,
             )
-            .first()
         )
         if selected_quote:
             selected_quote.status = "quoted"  # Reset to original status
@@ -208,7 +205,7 @@ async def facility_manager_confirms(
         work_order.selected_vendor_id = None
         work_order.facility_confirmed = None
         work_order.status = WorkOrderStatus.EVALUATING_QUOTES
-        db.commit()
+        await db.commit()
         return {
             "status": "rejected",
             "message": "Vendor selection rejected by facility manager",
@@ -217,10 +214,10 @@ async def facility_manager_confirms(
 
 @router.post("/vendor-dispatch-confirm/{work_order_id}")
 async def vendor_confirms_dispatch(
-    work_order_id: UUID, confirmation: dict, db: Session = Depends(get_db)
+    work_order_id: UUID, confirmation: dict, db: AsyncSession = Depends(get_async_db)
 ):
     """Handle vendor dispatch confirmation"""
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == work_order_id).first()
+    work_order = await db.scalar(select(WorkOrder).where(WorkOrder.id == work_order_id))
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
@@ -233,18 +230,16 @@ async def vendor_confirms_dispatch(
         if work_order.facility_confirmed:
             work_order.status = WorkOrderStatus.DISPATCHED
 
-        db.commit()
+        await db.commit()
 
         return {"status": "confirmed", "message": "Vendor confirmed dispatch"}
     else:
         # ✅ Reset vendor selection when vendor declines
-        selected_quote = (
-            db.query(Quote)
-            .filter(
+        selected_quote = await db.scalar(
+            select(Quote).where(
                 Quote.work_order_id == work_order_id,
                 Quote.vendor_id == work_order.selected_vendor_id,
             )
-            .first()
         )
         if selected_quote:
             selected_quote.status = "quoted"  # Reset to original status
@@ -253,6 +248,6 @@ async def vendor_confirms_dispatch(
         work_order.facility_confirmed = None
         work_order.vendor_dispatch_confirmed = None
         work_order.status = WorkOrderStatus.EVALUATING_QUOTES
-        db.commit()
+        await db.commit()
 
         return {"status": "declined", "message": "Vendor declined dispatch"}
@@ -3,12 +3,15 @@ Demo endpoints for testing bidirectional conversations without external webhooks
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.database import get_async_db
+from app.llm_metrics import with_llm_trace
 from app.models.quote import Quote
 from app.services.communication_service import CommunicationService
 from app.models.communication_log import CommunicationChannel
@@ -30,14 +33,15 @@ class SimulateVendorReplyRequest(BaseModel):
 
 
 @router.post("/simulate-vendor-reply")
+@with_llm_trace
 async def simulate_vendor_reply(
-    request: SimulateVendorReplyRequest, db: Session = Depends(get_db)
+    request: SimulateVendorReplyRequest, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Simulate a vendor replying to our message.
     Useful for testing without configuring Twilio/SendGrid webhooks.
     """
-    quote = db.query(Quote).filter(Quote.id == UUID(request.quote_id)).first()
+    quote = await QuoteService(db).get_quote(UUID(request.quote_id))
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
 
@@ -86,7 +90,7 @@ async def simulate_vendor_reply(
 
         summary = f"📞 Call Summary: {' | '.join(summary_parts) if summary_parts else 'Call completed - no quote provided'}"
 
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=quote.work_order.id,
             vendor_id=quote.vendor.id,
             channel=CommunicationChannel.PHONE,
@@ -110,14 +114,14 @@ async def simulate_vendor_reply(
                 availability_date = datetime.utcnow() + timedelta(days=days)
 
             if info.get("price"):
-                quote_service.update_quote_with_response(
+                await quote_service.update_quote_with_response(
                     quote.id,
                     price=info["price"],
                     availability_date=availability_date,
                     quote_text=request.reply_message,
                 )
 
-        db.commit()
+        await db.commit()
     else:
         raise HTTPException(
             status_code=400,
@@ -134,18 +138,25 @@ async def simulate_vendor_reply(
 
 @router.post("/simulate-multiple-quotes")
 async def simulate_multiple_vendor_quotes(
-    work_order_id: str, db: Session = Depends(get_db)
+    work_order_id: str, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Quickly simulate multiple vendors responding with quotes.
     Perfect for testing the comparison dashboard!
     """
 
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == UUID(work_order_id)).first()
+    work_order = await db.scalar(
+        select(WorkOrder).where(WorkOrder.id == UUID(work_order_id))
+    )
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
-    quotes = db.query(Quote).filter(Quote.work_order_id == work_order.id).all()
+    result = await db.execute(
+        select(Quote)
+        .options(joinedload(Quote.vendor))
+        .where(Quote.work_order_id == work_order.id)
+    )
+    quotes = result.scalars().all()
 
     currency_info = get_currency_info(work_order.location_country or "United States")
     currency_symbol = currency_info["symbol"]
@@ -183,12 +194,13 @@ class SimulateFacilityConfirmationRequest(BaseModel):
 
 @router.post("/simulate-facility-confirmation")
 async def simulate_facility_manager_confirmation(
-    request: SimulateFacilityConfirmationRequest, db: Session = Depends(get_db)
+    request: SimulateFacilityConfirmationRequest,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Simulate facility manager approving/rejecting vendor selection"""
 
-    work_order = (
-        db.query(WorkOrder).filter(WorkOrder.id == UUID(request.work_order_id)).first()
+    work_order = await db.scalar(
+        select(WorkOrder).where(WorkOrder.id == UUID(request.work_order_id))
     )
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
@@ -200,7 +212,7 @@ async def simulate_facility_manager_confirmation(
     )
 
     comm_service = CommunicationService(db)
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=None,
         channel=CommunicationChannel.EMAIL,
@@ -220,11 +232,11 @@ async def simulate_facility_manager_confirmation(
         if work_order.vendor_dispatch_confirmed:
             work_order.status = WorkOrderStatus.DISPATCHED
 
-        db.commit()
+        await db.commit()
         return {"status": "approved", "message": "Facility manager approved"}
     else:
         work_order.status = WorkOrderStatus.EVALUATING_QUOTES
-        db.commit()
+        await db.commit()
         return {"status": "rejected", "message": "Facility manager rejected"}
 
 
@@ -235,12 +247,12 @@ class SimulateVendorDispatchRequest(BaseModel):
 
 @router.post("/simulate-vendor-dispatch-confirmation")
 async def simulate_vendor_dispatch_confirmation(
-    request: SimulateVendorDispatchRequest, db: Session = Depends(get_db)
+    request: SimulateVendorDispatchRequest, db: AsyncSession = Depends(get_async_db)
 ):
     """Simulate vendor confirming/declining dispatch"""
 
-    work_order = (
-        db.query(WorkOrder).filter(WorkOrder.id == UUID(request.work_order_id)).first()
+    work_order = await db.scalar(
+        select(WorkOrder).where(WorkOrder.id == UUID(request.work_order_id))
     )
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
@@ -252,7 +264,7 @@ async def simulate_vendor_dispatch_confirmation(
     )
 
     comm_service = CommunicationService(db)
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=work_order.selected_vendor_id,
         channel=CommunicationChannel.SMS,
@@ -271,8 +283,8 @@ async def simulate_vendor_dispatch_confirmation(
         if work_order.facility_confirmed:
             work_order.status = WorkOrderStatus.DISPATCHED
 
-        db.commit()
+        await db.commit()
         return {"status": "confirmed", "message": "Vendor confirmed dispatch"}
     else:
-        db.commit()
+        await db.commit()
         return {"status": "declined", "message": "Vendor cannot confirm dispatch"}
@@ -0,0 +1,41 @@
+"""
+Runtime metrics for capacity planning
+"""
+
+from fastapi import APIRouter
+
+from app.clients import clients
+from app.database import get_pool_stats
+from app.llm_batch import llm_batch
+from app.llm_cache import llm_cache
+from app.llm_metrics import llm_metrics
+from app.llm_resilience import snapshot as llm_resilience_snapshot
+from app.llm_scheduler import llm_scheduler
+from app.quote_extractor import fast_path_stats
+from app.services.geocoding_service import geocode_stats
+from app.vendor_index import vendor_index
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics():
+    """Database pool, LLM cache/scheduler/batch/call and external client connection stats"""
+    return {
+        "database": get_pool_stats(),
+        "llm_cache": llm_cache.snapshot(),
+        "llm_scheduler": llm_scheduler.snapshot(),
+        "llm_calls": llm_metrics.snapshot(),
+        "llm_batch": llm_batch.snapshot(),
+        "llm_resilience": llm_resilience_snapshot(),
+        "quote_fast_path": fast_path_stats.snapshot(),
+        "geocode_cache": geocode_stats.snapshot(),
+        "vendor_index": vendor_index.snapshot(),
+        "external_clients": clients.snapshot(),
+    }
+
+
+@router.get("/llm")
+async def get_llm_metrics():
+    """Latency and token histograms per LLM call site, slowest in total first"""
+    return llm_metrics.snapshot()
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List
 from uuid import UUID
 from pydantic import BaseModel
-from datetime import datetime
 import asyncio
 
-from app.database import get_db
+from app.clients import ClientRegistry, get_clients
+from app.database import get_async_db, get_async_read_db, AsyncSessionLocal
+from app.llm_metrics import with_llm_trace
 from app.schemas.quote import QuoteResponse, QuoteList
 from app.services.quote_service import QuoteService
 from app.services.ai_agent_service import AIAgentService
@@ -22,16 +25,18 @@ class VendorResponseCreate(BaseModel):
 
 
 @router.get("/work-order/{work_order_id}", response_model=QuoteList)
-def list_quotes_for_work_order(work_order_id: UUID, db: Session = Depends(get_db)):
+async def list_quotes_for_work_order(
+    work_order_id: UUID, db: AsyncSession = Depends(get_async_read_db)
+):
     service = QuoteService(db)
-    quotes = service.get_quotes_for_work_order(work_order_id)
+    quotes = await service.get_quotes_for_work_order(work_order_id)
     return QuoteList(quotes=quotes, total=len(quotes))
 
 
 @router.get("/{quote_id}", response_model=QuoteResponse)
-def get_quote(quote_id: UUID, db: Session = Depends(get_db)):
+async def get_quote(quote_id: UUID, db: AsyncSession = Depends(get_async_read_db)):
     service = QuoteService(db)
-    quote = service.get_quote(quote_id)
+    quote = await service.get_quote(quote_id)
 
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
@@ -40,13 +45,17 @@ def get_quote(quote_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/{quote_id}/respond")
+@with_llm_trace
 async def simulate_vendor_response(
-    quote_id: UUID, response_data: VendorResponseCreate, db: Session = Depends(get_db)
+    quote_id: UUID,
+    response_data: VendorResponseCreate,
+    db: AsyncSession = Depends(get_async_db),
+    clients: ClientRegistry = Depends(get_clients),
 ):
     service = QuoteService(db)
-    ai_service = AIAgentService()
+    ai_service = AIAgentService(clients.openai)
 
-    quote = service.get_quote(quote_id)
+    quote = await service.get_quote(quote_id)
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
 
@@ -54,19 +63,10 @@ async def simulate_vendor_response(
         response_data.response_text
     )
 
-    availability_date = None
-    if parsed_response.get("availability_date"):
-        try:
-            availability_date = datetime.fromisoformat(
-                parsed_response["availability_date"]
-            )
-        except (ValueError, TypeError):
-            availability_date = None
-
-    updated_quote = service.update_quote_with_response(
+    updated_quote = await service.update_quote_with_response(
         quote_id=quote_id,
         price=parsed_response.get("price"),
-        availability_date=availability_date,
+        availability_date=parsed_response.get("availability_date"),
         quote_text=response_data.response_text,
     )
 
@@ -91,27 +91,31 @@ async def simulate_vendor_response(
 
 
 @router.post("/{quote_id}/request")
-async def request_quote(quote_id: UUID, db: Session = Depends(get_db)):
+async def request_quote(
+    quote_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    clients: ClientRegistry = Depends(get_clients),
+):
     """
     Request a quote from a vendor.
     Changes quote status from 'pending' to 'requested', updates work order status,
     and sends multi-modal communications (email + SMS) to demo test addresses.
     """
 
-    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+    quote = await QuoteService(db).get_quote(quote_id)
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
 
     quote.status = QuoteStatus.REQUESTED
 
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == quote.work_order_id).first()
+    work_order = quote.work_order
     if work_order and work_order.status == WorkOrderStatus.AWAITING_APPROVAL:
         work_order.status = WorkOrderStatus.CONTACTING_VENDORS
 
-    db.commit()
-    db.refresh(quote)
+    await db.commit()
+    await db.refresh(quote)
 
-    contact_service = VendorContactService(db)
+    contact_service = VendorContactService(db, clients)
     await contact_service.contact_vendor_for_quote(str(quote_id))
 
     return {
@@ -125,11 +129,16 @@ async def request_quote(quote_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/request-multiple")
-async def request_multiple_quotes(quote_ids: List[UUID], db: Session = Depends(get_db)):
+async def request_multiple_quotes(
+    quote_ids: List[UUID], db: AsyncSession = Depends(get_async_db)
+):
     if not quote_ids:
         raise HTTPException(status_code=400, detail="No quote IDs provided")
 
-    quotes = db.query(Quote).filter(Quote.id.in_(quote_ids)).all()
+    result = await db.execute(
+        select(Quote).options(joinedload(Quote.vendor)).where(Quote.id.in_(quote_ids))
+    )
+    quotes = result.scalars().all()
     if not quotes:
         raise HTTPException(status_code=404, detail="No quotes found")
 
@@ -137,14 +146,13 @@ async def request_multiple_quotes(quote_ids: List[UUID], db: Session = Depends(g
         quote.status = QuoteStatus.REQUESTED
 
     work_order_id = quotes[0].work_order_id
-    work_order = db.query(WorkOrder).filter(WorkOrder.id == work_order_id).first()
+    work_order = await db.scalar(select(WorkOrder).where(WorkOrder.id == work_order_id))
     if work_order and work_order.status == WorkOrderStatus.AWAITING_APPROVAL:
         work_order.status = WorkOrderStatus.CONTACTING_VENDORS
 
-    db.commit()
+    await db.commit()
 
-    contact_service = VendorContactService(db)
-    tasks = [contact_service.contact_vendor_for_quote(str(q.id)) for q in quotes]
+    tasks = [_contact_vendor_for_quote(q.id) for q in quotes]
     await asyncio.gather(*tasks, return_exceptions=True)
 
     vendor_names = [q.vendor.business_name for q in quotes]
@@ -158,10 +166,18 @@ async def request_multiple_quotes(quote_ids: List[UUID], db: Session = Depends(g
     }
 
 
+async def _contact_vendor_for_quote(quote_id: UUID):
+    # Quotes are contacted concurrently; an AsyncSession cannot be shared
+    # between tasks, so each one gets its own session.
+    async with AsyncSessionLocal() as db:
+        contact_service = VendorContactService(db)
+        return await contact_service.contact_vendor_for_quote(str(quote_id))
+
+
 @router.post("/{quote_id}/accept")
-def accept_quote(quote_id: UUID, db: Session = Depends(get_db)):
+async def accept_quote(quote_id: UUID, db: AsyncSession = Depends(get_async_db)):
     service = QuoteService(db)
-    quote = service.accept_quote(quote_id)
+    quote = await service.accept_quote(quote_id)
 
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_async_read_db
+from app.pagination import InvalidCursor
 from app.schemas.vendor import VendorResponse, VendorList
 from app.services.vendor_service import VendorService
 
@@ -10,23 +12,49 @@ router = APIRouter()
 
 
 @router.get("", response_model=VendorList)
-def list_vendors(
+async def list_vendors(
     skip: int = 0,
     limit: int = 100,
     trade_type: str = None,
-    db: Session = Depends(get_db),
+    paginate: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """List all vendors, optionally filtered by trade type"""
+    """
+    List all vendors, optionally filtered by trade type.
+    paginate=cursor (or passing a next_cursor back) switches to keyset
+    pagination on (created_at, id) with an estimated total.
+    """
     service = VendorService(db)
-    vendors, total = service.list_vendors(skip, limit, trade_type)
+
+    if paginate == "cursor" or cursor:
+        try:
+            vendors, next_cursor = await service.list_vendors_after(
+                cursor, limit, trade_type
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        total = None
+        if include_total:
+            total = await service.estimate_vendor_count(trade_type)
+        return VendorList(
+            vendors=vendors,
+            total=total,
+            total_is_estimate=total is not None,
+            next_cursor=next_cursor,
+        )
+
+    vendors, total = await service.list_vendors(skip, limit, trade_type, include_total)
     return VendorList(vendors=vendors, total=total)
 
 
 @router.get("/{vendor_id}", response_model=VendorResponse)
-def get_vendor(vendor_id: UUID, db: Session = Depends(get_db)):
+async def get_vendor(vendor_id: UUID, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific vendor by ID"""
     service = VendorService(db)
-    vendor = service.get_vendor(vendor_id)
+    vendor = await service.get_vendor(vendor_id)
 
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
@@ -35,10 +63,12 @@ def get_vendor(vendor_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/{vendor_id}/score")
-def get_vendor_score(vendor_id: UUID, db: Session = Depends(get_db)):
+async def get_vendor_score(
+    vendor_id: UUID, db: AsyncSession = Depends(get_async_read_db)
+):
     """Get detailed scoring breakdown for a vendor"""
     service = VendorService(db)
-    vendor = service.get_vendor(vendor_id)
+    vendor = await service.get_vendor(vendor_id)
 
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
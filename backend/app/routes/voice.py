@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Form, Request, Depends
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.database import get_db
-from app.models.quote import Quote
+from app.clients import ClientRegistry, get_clients
+from app.database import get_async_db
+from app.llm_metrics import with_llm_trace
 from app.models.communication_log import CommunicationChannel
 from app.services.communication_service import CommunicationService
 from app.services.ai_agent_service import AIAgentService
@@ -15,19 +16,22 @@ router = APIRouter()
 
 @router.post("/voice-callback/{quote_id}")
 async def voice_callback(
-    quote_id: UUID, request: Request, db: Session = Depends(get_db)
+    quote_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    clients: ClientRegistry = Depends(get_clients),
 ):
     """
     Twilio Voice webhook - generates TwiML for AI voice interaction
     """
-    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+    quote = await QuoteService(db).get_quote(quote_id)
     if not quote:
         return Response(content=generate_error_twiml(), media_type="application/xml")
 
     work_order = quote.work_order
     vendor = quote.vendor
 
-    ai_service = AIAgentService()
+    ai_service = AIAgentService(clients.openai)
     work_order_data = {
         "trade_type": work_order.trade_type.value,
         "location_address": work_order.location_address,
@@ -38,7 +42,7 @@ async def voice_callback(
         else "flexible",
     }
 
-    call_script = await ai_service.generate_vendor_contact_message(
+    call_script = await ai_service.get_vendor_contact_message(
         work_order_data, vendor.business_name, "phone"
     )
 
@@ -61,6 +65,7 @@ async def voice_callback(
 
 
 @router.post("/voice-transcript/{quote_id}")
+@with_llm_trace
 async def voice_transcript_callback(
     quote_id: UUID,
     TranscriptionText: str = Form(None),
@@ -68,12 +73,13 @@ async def voice_transcript_callback(
     CallSid: str = Form(None),
     RecordingSid: str = Form(None),
     TranscriptionStatus: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    clients: ClientRegistry = Depends(get_clients),
 ):
     """
     Twilio callback for call transcription
     """
-    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+    quote = await QuoteService(db).get_quote(quote_id)
     if not quote:
         return {"error": "Quote not found"}
 
@@ -97,7 +103,7 @@ Recording SID: {RecordingSid}
 Status: {TranscriptionStatus}
 """
 
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=vendor.id,
         channel=CommunicationChannel.PHONE,
@@ -114,12 +120,12 @@ Status: {TranscriptionStatus}
     )
 
     if TranscriptionText:
-        ai_service = AIAgentService()
+        ai_service = AIAgentService(clients.openai)
         parsed_response = await ai_service.parse_vendor_response(TranscriptionText)
 
         if parsed_response.get("price"):
             quote_service = QuoteService(db)
-            quote_service.update_quote_with_response(
+            await quote_service.update_quote_with_response(
                 quote.id,
                 price=parsed_response.get("price"),
                 availability_date=parsed_response.get("availability_date"),
@@ -136,12 +142,12 @@ async def voice_status_callback(
     CallStatus: str = Form(None),
     CallDuration: str = Form(None),
     CallSid: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Twilio callback for call status updates
     """
-    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+    quote = await QuoteService(db).get_quote(quote_id)
     if not quote:
         return {"error": "Quote not found"}
 
@@ -154,7 +160,7 @@ Duration: {CallDuration} seconds
 Call SID: {CallSid}
 """
 
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=quote.work_order_id,
         vendor_id=quote.vendor_id,
         channel=CommunicationChannel.PHONE,
@@ -3,10 +3,14 @@ Webhook endpoints for inbound vendor communications (SMS, Email replies)
 """
 
 from fastapi import APIRouter, Request, Form, Depends, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
+from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db, run_in_session
+from app.llm_metrics import with_llm_trace
 from app.models.vendor import Vendor
 from app.models.quote import Quote, QuoteStatus
 from app.models.communication_log import CommunicationChannel, CommunicationLog
@@ -25,27 +29,28 @@ async def handle_inbound_sms(
     From: str = Form(...),
     Body: str = Form(...),
     MessageSid: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Twilio webhook for inbound SMS messages from vendors
     """
     print(f"📱 Inbound SMS from {From}: {Body}")
 
-    vendor = db.query(Vendor).filter(Vendor.phone == From).first()
+    vendor = await db.scalar(select(Vendor).where(Vendor.phone == From))
     if not vendor:
         print(f"⚠️  Unknown vendor phone: {From}")
         return {"status": "ignored", "reason": "unknown vendor"}
 
-    active_quotes = (
-        db.query(Quote)
-        .filter(
+    result = await db.execute(
+        select(Quote)
+        .options(joinedload(Quote.work_order))
+        .where(
             Quote.vendor_id == vendor.id,
             Quote.status.in_([QuoteStatus.PENDING, QuoteStatus.REQUESTED]),
         )
         .order_by(Quote.created_at.desc())
-        .all()
     )
+    active_quotes = result.scalars().all()
 
     if not active_quotes:
         print(f"⚠️  No active quotes for vendor {vendor.business_name}")
@@ -55,7 +60,7 @@ async def handle_inbound_sms(
     work_order = quote.work_order
 
     comm_service = CommunicationService(db)
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=vendor.id,
         channel=CommunicationChannel.SMS,
@@ -66,7 +71,7 @@ async def handle_inbound_sms(
     )
 
     background_tasks.add_task(
-        process_vendor_sms_response, db, quote.id, vendor.id, Body
+        run_in_session, process_vendor_sms_response, quote.id, vendor.id, Body
     )
 
     return {"status": "received"}
@@ -74,7 +79,9 @@ async def handle_inbound_sms(
 
 @router.post("/email/inbound")
 async def handle_inbound_email(
-    request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     SendGrid webhook for inbound email replies from vendors
@@ -87,20 +94,21 @@ async def handle_inbound_email(
 
     print(f"📧 Inbound email from {from_email}")
 
-    vendor = db.query(Vendor).filter(Vendor.email == from_email).first()
+    vendor = await db.scalar(select(Vendor).where(Vendor.email == from_email))
     if not vendor:
         print(f"⚠️  Unknown vendor email: {from_email}")
         return {"status": "ignored", "reason": "unknown vendor"}
 
-    active_quotes = (
-        db.query(Quote)
-        .filter(
+    result = await db.execute(
+        select(Quote)
+        .options(joinedload(Quote.work_order))
+        .where(
             Quote.vendor_id == vendor.id,
             Quote.status.in_([QuoteStatus.PENDING, QuoteStatus.REQUESTED]),
         )
         .order_by(Quote.created_at.desc())
-        .all()
     )
+    active_quotes = result.scalars().all()
 
     if not active_quotes:
         return {"status": "ignored", "reason": "no active quotes"}
@@ -109,7 +117,7 @@ async def handle_inbound_email(
     work_order = quote.work_order
 
     comm_service = CommunicationService(db)
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=vendor.id,
         channel=CommunicationChannel.EMAIL,
@@ -121,20 +129,52 @@ async def handle_inbound_email(
     )
 
     background_tasks.add_task(
-        process_vendor_email_response, db, quote.id, vendor.id, body, subject
+        run_in_session,
+        process_vendor_email_response,
+        quote.id,
+        vendor.id,
+        body,
+        subject,
     )
 
     return {"status": "received"}
 
 
-async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message: str):
+async def _apply_extracted_quote(db: AsyncSession, quote, info: dict, message: str):
+    """Record the price/availability/duration pulled out of a vendor reply"""
+    if info.get("price"):
+        availability_date = None
+        if info.get("availability_days"):
+            days = int(info["availability_days"])
+            availability_date = datetime.utcnow() + timedelta(days=days)
+
+        await QuoteService(db).update_quote_with_response(
+            quote.id,
+            price=info["price"],
+            availability_date=availability_date,
+            quote_text=message,
+            estimated_duration_hours=info.get("duration_hours"),
+        )
+        quote.status = QuoteStatus.RECEIVED
+
+    await db.commit()
+
+
+@with_llm_trace
+async def process_vendor_sms_response(
+    db: AsyncSession,
+    quote_id,
+    vendor_id,
+    message: str,
+    ai_service: Optional[AIAgentService] = None,
+):
     """
     Process vendor SMS response with AI, extract quote info, decide if human needed.
     Limits: Max 2 SMS exchanges, then close conversation.
     """
     print(f"🤖 Processing SMS response for quote {quote_id}")
 
-    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+    quote = await QuoteService(db).get_quote(quote_id)
     if not quote:
         return
 
@@ -142,20 +182,19 @@ async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message:
     vendor = quote.vendor
 
     comm_service = CommunicationService(db)
-    all_comms = (
-        db.query(CommunicationLog)
-        .filter(
+    result = await db.execute(
+        select(CommunicationLog).where(
             CommunicationLog.work_order_id == work_order.id,
             CommunicationLog.vendor_id == vendor.id,
             CommunicationLog.channel == CommunicationChannel.SMS,
         )
-        .all()
     )
+    all_comms = result.scalars().all()
     turn_count = len([c for c in all_comms if c.direction == "outbound"])
 
     if turn_count >= 2:
         print(f"⚠️  Max SMS turns reached ({turn_count}), closing conversation")
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=vendor.id,
             channel=CommunicationChannel.SMS,
@@ -166,11 +205,11 @@ async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message:
         )
         return
 
-    history = comm_service.get_conversation_history(work_order.id, vendor.id)
+    history = await comm_service.get_conversation_history(work_order.id, vendor.id)
 
-    ai_service = AIAgentService()
+    ai_service = ai_service or AIAgentService()
 
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=vendor.id,
         channel=CommunicationChannel.SMS,
@@ -180,7 +219,8 @@ async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message:
         metadata={"turn": turn_count, "source": "vendor_reply"},
     )
 
-    parsed = await ai_service.parse_vendor_sms_response(
+    parsed = await ai_service.reply_and_extract(
+        channel="sms",
         message=message,
         conversation_history=history,
         work_order_data={
@@ -191,32 +231,14 @@ async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message:
         },
     )
 
-    if parsed.get("extracted_info"):
-        info = parsed["extracted_info"]
-        quote_service = QuoteService(db)
-
-        availability_date = None
-        if info.get("availability_days"):
-            days = int(info["availability_days"])
-            availability_date = datetime.utcnow() + timedelta(days=days)
-
-        if info.get("price"):
-            quote_service.update_quote_with_response(
-                quote.id,
-                price=info["price"],
-                availability_date=availability_date,
-                quote_text=message,
-            )
-            quote.status = QuoteStatus.RECEIVED
-
-        db.commit()
+    await _apply_extracted_quote(db, quote, parsed["extracted_info"], message)
 
     if parsed.get("conversation_complete"):
         print("✅ SMS conversation complete (all info collected)")
         return
 
     if not parsed.get("needs_human"):
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=vendor.id,
             channel=CommunicationChannel.SMS,
@@ -227,7 +249,7 @@ async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message:
             metadata={"automated_reply": True, "turn": turn_count + 1},
         )
     else:
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=vendor.id,
             channel=CommunicationChannel.SMS,
@@ -240,8 +262,14 @@ async def process_vendor_sms_response(db: Session, quote_id, vendor_id, message:
     print("✅ SMS response processed")
 
 
+@with_llm_trace
 async def process_vendor_email_response(
-    db: Session, quote_id, vendor_id, message: str, subject: str
+    db: AsyncSession,
+    quote_id,
+    vendor_id,
+    message: str,
+    subject: str,
+    ai_service: Optional[AIAgentService] = None,
 ):
     """
     Process vendor email response with AI, extract quote info, decide if human needed.
@@ -249,7 +277,7 @@ async def process_vendor_email_response(
     """
     print(f"🤖 Processing email response for quote {quote_id}")
 
-    quote = db.query(Quote).filter(Quote.id == quote_id).first()
+    quote = await QuoteService(db).get_quote(quote_id)
     if not quote:
         return
 
@@ -257,20 +285,19 @@ async def process_vendor_email_response(
     vendor = quote.vendor
 
     comm_service = CommunicationService(db)
-    all_comms = (
-        db.query(CommunicationLog)
-        .filter(
+    result = await db.execute(
+        select(CommunicationLog).where(
             CommunicationLog.work_order_id == work_order.id,
             CommunicationLog.vendor_id == vendor.id,
             CommunicationLog.channel == CommunicationChannel.EMAIL,
         )
-        .all()
     )
+    all_comms = result.scalars().all()
     turn_count = len([c for c in all_comms if c.direction == "outbound"])
 
     if turn_count >= 3:
         print(f"⚠️  Max email turns reached ({turn_count}), closing conversation")
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=vendor.id,
             channel=CommunicationChannel.EMAIL,
@@ -282,9 +309,9 @@ async def process_vendor_email_response(
         )
         return
 
-    history = comm_service.get_conversation_history(work_order.id, vendor.id)
+    history = await comm_service.get_conversation_history(work_order.id, vendor.id)
 
-    comm_service.log_communication(
+    await comm_service.log_communication(
         work_order_id=work_order.id,
         vendor_id=vendor.id,
         channel=CommunicationChannel.EMAIL,
@@ -294,9 +321,11 @@ async def process_vendor_email_response(
         metadata={"turn": turn_count, "source": "vendor_reply", "subject": subject},
     )
 
-    ai_service = AIAgentService()
+    ai_service = ai_service or AIAgentService()
 
-    parsed = await ai_service.parse_vendor_email_response(
+    # Reply decision and quote extraction come back from one LLM call
+    parsed = await ai_service.reply_and_extract(
+        channel="email",
         message=message,
         conversation_history=history,
         work_order_data={
@@ -308,32 +337,14 @@ async def process_vendor_email_response(
         },
     )
 
-    if parsed.get("extracted_info"):
-        info = parsed["extracted_info"]
-        quote_service = QuoteService(db)
-
-        availability_date = None
-        if info.get("availability_days"):
-            days = int(info["availability_days"])
-            availability_date = datetime.utcnow() + timedelta(days=days)
-
-        if info.get("price"):
-            quote_service.update_quote_with_response(
-                quote.id,
-                price=info["price"],
-                availability_date=availability_date,
-                quote_text=message,
-            )
-            quote.status = QuoteStatus.RECEIVED
-
-        db.commit()
+    await _apply_extracted_quote(db, quote, parsed["extracted_info"], message)
 
     if parsed.get("conversation_complete"):
         print("✅ Email conversation complete (all info collected)")
         return
 
     if not parsed.get("needs_human"):
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=vendor.id,
             channel=CommunicationChannel.EMAIL,
@@ -345,7 +356,7 @@ async def process_vendor_email_response(
             metadata={"automated_reply": True, "turn": turn_count + 1},
         )
     else:
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=vendor.id,
             channel=CommunicationChannel.EMAIL,
@@ -1,44 +1,193 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
 from uuid import UUID
-
-from app.database import get_db
+import asyncio
+import json
+
+from app.clients import ClientRegistry, get_clients
+from app.constants import DISCOVERY_READY_FIELDS
+from app.database import (
+    AsyncSessionLocal,
+    get_async_db,
+    get_async_read_db,
+    run_in_session,
+)
+from app.pagination import InvalidCursor
 from app.schemas.work_order import WorkOrderCreate, WorkOrderResponse, WorkOrderList
 from app.services.work_order_service import WorkOrderService
-from app.services.ai_agent_service import AIAgentService
+from app.services.ai_agent_service import STREAM_FALLBACK_FIELD, AIAgentService
 from app.models.work_order import WorkOrderStatus
 
 router = APIRouter()
 
+# Discovery tasks started by streaming intake, held until they finish
+_discovery_tasks = set()
+
+
+async def _start_vendor_discovery(db: AsyncSession, work_order_id: UUID):
+    await WorkOrderService(db).start_vendor_discovery_workflow(work_order_id)
+
+
+async def _start_vendor_contact(db: AsyncSession, work_order_id: UUID):
+    await WorkOrderService(db).start_vendor_contact_workflow(work_order_id)
+
 
 @router.post("", response_model=WorkOrderResponse, status_code=201)
 async def create_work_order(
     work_order_data: WorkOrderCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    clients: ClientRegistry = Depends(get_clients),
 ):
     service = WorkOrderService(db)
-    ai_service = AIAgentService()
+    ai_service = AIAgentService(clients.openai)
 
     parsed_data = await ai_service.parse_work_order_input(work_order_data.raw_input)
-    work_order = service.create_work_order(work_order_data, parsed_data)
+    work_order = await service.create_work_order(work_order_data, parsed_data)
 
-    background_tasks.add_task(service.start_vendor_discovery_workflow, work_order.id)
+    background_tasks.add_task(run_in_session, _start_vendor_discovery, work_order.id)
 
     return work_order
 
 
+@router.post("/stream")
+async def create_work_order_stream(
+    work_order_data: WorkOrderCreate,
+    clients: ClientRegistry = Depends(get_clients),
+):
+    """
+    Streaming intake: Server-Sent Events with each parsed field as it is
+    decoded. The work order is created, and vendor discovery started, as soon
+    as the trade and location are known; the rest is filled in at the end.
+    """
+    ai_service = AIAgentService(clients.openai)
+
+    def event(payload: dict) -> str:
+        return f"data: {json.dumps(payload, default=str)}\n\n"
+
+    async def event_generator():
+        # The stream outlives the request scope, so it owns its session.
+        async with AsyncSessionLocal() as db:
+            service = WorkOrderService(db)
+            parsed_data = {}
+            work_order = None
+
+            async def create_and_discover():
+                created = await service.create_work_order(
+                    work_order_data, dict(parsed_data)
+                )
+                # Discovery runs on even if the client disconnects
+                task = asyncio.create_task(
+                    run_in_session(_start_vendor_discovery, created.id)
+                )
+                _discovery_tasks.add(task)
+                task.add_done_callback(_discovery_tasks.discard)
+                return created
+
+            try:
+                async for field, value in ai_service.stream_work_order_input(
+                    work_order_data.raw_input
+                ):
+                    if field == STREAM_FALLBACK_FIELD:
+                        # The model stream failed: fields after this event are
+                        # defaults, only value["model_fields"] came from the model
+                        yield event({"type": "fallback", **value})
+                        continue
+                    parsed_data[field] = value
+                    yield event({"type": "field", "field": field, "value": value})
+
+                    if work_order is None and all(
+                        f in parsed_data for f in DISCOVERY_READY_FIELDS
+                    ):
+                        work_order = await create_and_discover()
+                        yield event(
+                            {
+                                "type": "created",
+                                "work_order_id": str(work_order.id),
+                                "discovery_started": True,
+                            }
+                        )
+
+                if work_order is None:
+                    work_order = await create_and_discover()
+                    yield event(
+                        {
+                            "type": "created",
+                            "work_order_id": str(work_order.id),
+                            "discovery_started": True,
+                        }
+                    )
+                else:
+                    work_order = await service.update_parsed_fields(
+                        work_order.id, work_order_data, parsed_data
+                    )
+
+                yield event(
+                    {
+                        "type": "complete",
+                        "work_order": WorkOrderResponse.model_validate(
+                            work_order
+                        ).model_dump(mode="json"),
+                    }
+                )
+            except Exception as e:
+                yield event({"type": "error", "message": f"❌ Error: {str(e)}"})
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.get("", response_model=WorkOrderList)
-def list_work_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_work_orders(
+    skip: int = 0,
+    limit: int = 100,
+    paginate: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Offset pagination with an exact total by default.
+    paginate=cursor (or passing a next_cursor back) switches to keyset
+    pagination on (created_at, id) with an estimated total.
+    """
     service = WorkOrderService(db)
-    work_orders, total = service.list_work_orders(skip, limit)
+
+    if paginate == "cursor" or cursor:
+        try:
+            work_orders, next_cursor = await service.list_work_orders_after(
+                cursor, limit
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        total = await service.estimate_work_order_count() if include_total else None
+        return WorkOrderList(
+            work_orders=work_orders,
+            total=total,
+            total_is_estimate=total is not None,
+            next_cursor=next_cursor,
+        )
+
+    work_orders, total = await service.list_work_orders(skip, limit, include_total)
     return WorkOrderList(work_orders=work_orders, total=total)
 
 
 @router.get("/{work_order_id}", response_model=WorkOrderResponse)
-def get_work_order(work_order_id: UUID, db: Session = Depends(get_db)):
+async def get_work_order(
+    work_order_id: UUID, db: AsyncSession = Depends(get_async_read_db)
+):
     service = WorkOrderService(db)
-    work_order = service.get_work_order(work_order_id)
+    work_order = await service.get_work_order(work_order_id)
 
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
@@ -47,11 +196,11 @@ def get_work_order(work_order_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.patch("/{work_order_id}/status", response_model=WorkOrderResponse)
-def update_work_order_status(
-    work_order_id: UUID, status_update: dict, db: Session = Depends(get_db)
+async def update_work_order_status(
+    work_order_id: UUID, status_update: dict, db: AsyncSession = Depends(get_async_db)
 ):
     service = WorkOrderService(db)
-    work_order = service.get_work_order(work_order_id)
+    work_order = await service.get_work_order(work_order_id)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
@@ -59,8 +208,8 @@ def update_work_order_status(
     if new_status:
         try:
             work_order.status = WorkOrderStatus(new_status)
-            db.commit()
-            db.refresh(work_order)
+            await db.commit()
+            await db.refresh(work_order)
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {new_status}")
 
@@ -71,15 +220,15 @@ def update_work_order_status(
 async def discover_vendors(
     work_order_id: UUID,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     service = WorkOrderService(db)
 
-    work_order = service.get_work_order(work_order_id)
+    work_order = await service.get_work_order(work_order_id)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
-    background_tasks.add_task(service.start_vendor_discovery_workflow, work_order_id)
+    background_tasks.add_task(run_in_session, _start_vendor_discovery, work_order_id)
 
     return {"message": "Vendor discovery started", "work_order_id": str(work_order_id)}
 
@@ -88,15 +237,15 @@ async def discover_vendors(
 async def contact_vendors(
     work_order_id: UUID,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     service = WorkOrderService(db)
 
-    work_order = service.get_work_order(work_order_id)
+    work_order = await service.get_work_order(work_order_id)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
 
-    background_tasks.add_task(service.start_vendor_contact_workflow, work_order_id)
+    background_tasks.add_task(run_in_session, _start_vendor_contact, work_order_id)
 
     return {
         "message": "Vendor contact process started",
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
@@ -20,34 +20,14 @@ class VendorDetails(BaseModel):
     yelp_review_count: Optional[int] = None
     composite_score: Optional[float] = None
     trade_specialties: Optional[List[str]] = None
-    price_level: Optional[str] = None
+    # Read from Vendor.price_display so source_data never has to be loaded
+    price_level: Optional[str] = Field(
+        None, validation_alias=AliasChoices("price_display", "price_level")
+    )
 
     class Config:
         from_attributes = True
 
-    @classmethod
-    def from_orm(cls, obj):
-        """Custom from_orm to extract price_level from source_data"""
-        vendor_dict = {
-            "id": obj.id,
-            "business_name": obj.business_name,
-            "phone": obj.phone,
-            "email": obj.email,
-            "address": obj.address,
-            "city": obj.city,
-            "state": obj.state,
-            "google_rating": obj.google_rating,
-            "google_review_count": obj.google_review_count,
-            "yelp_rating": obj.yelp_rating,
-            "yelp_review_count": obj.yelp_review_count,
-            "composite_score": obj.composite_score,
-            "trade_specialties": obj.trade_specialties,
-            "price_level": obj.source_data.get("price_display")
-            if obj.source_data
-            else None,
-        }
-        return cls(**vendor_dict)
-
 
 class QuoteResponse(BaseModel):
     id: UUID
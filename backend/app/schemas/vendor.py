@@ -28,4 +28,6 @@ class VendorResponse(BaseModel):
 
 class VendorList(BaseModel):
     vendors: List[VendorResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
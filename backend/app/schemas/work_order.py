@@ -83,4 +83,6 @@ class WorkOrderResponse(BaseModel):
 
 class WorkOrderList(BaseModel):
     work_orders: List[WorkOrderResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
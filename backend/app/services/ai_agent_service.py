@@ -1,16 +1,40 @@
+import asyncio
 import json
-from typing import Dict, Any
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from openai import AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.clients import get_clients
 from app.config import settings
+from app.llm_batch import BatchJobError, llm_batch
+from app.llm_cache import llm_cache, make_cache_key
+from app.llm_metrics import LLMCallRecord, llm_metrics
+from app.llm_resilience import (
+    PROVIDER_FAILURES,
+    CircuitOpenError,
+    SchedulerQueueTimeout,
+    guarded_call,
+    latency_budget,
+    openai_breaker,
+)
+from app.quote_extractor import fast_path_extract
+from app.llm_scheduler import LANE_BACKGROUND, LANE_INTERACTIVE, llm_scheduler
+from app.streaming_json import IncrementalJSONObjectParser
 from app.constants import (
     AI_MODEL,
     AI_TEMPERATURE_PARSING,
     AI_TEMPERATURE_GENERATION,
     AI_MAX_TOKENS_SHORT,
     AI_MAX_TOKENS_MEDIUM,
+    AI_MAX_TOKENS_LONG,
     RESPONSE_FORMAT_JSON,
+    VENDOR_NAME_PLACEHOLDER,
+    OUTREACH_TEMPLATE_CACHE_SIZE,
+    REALTIME_URGENCIES,
 )
+from app.models.work_order import Priority, WorkOrder, WorkType
 from app.prompts import (
     WORK_ORDER_PARSING_SYSTEM_PROMPT,
     WORK_ORDER_PARSING_USER_PROMPT,
@@ -20,31 +44,132 @@ from app.prompts import (
     VENDOR_CONTACT_SMS_USER_PROMPT,
     VENDOR_CONTACT_PHONE_SYSTEM_PROMPT,
     VENDOR_CONTACT_PHONE_USER_PROMPT,
+    VENDOR_OUTREACH_TEMPLATE_SYSTEM_PROMPT,
+    VENDOR_OUTREACH_TEMPLATE_USER_PROMPT,
     VENDOR_RESPONSE_PARSING_SYSTEM_PROMPT,
     VENDOR_RESPONSE_PARSING_USER_PROMPT,
+    VENDOR_SEARCH_QUERY_SYSTEM_PROMPT,
+    VENDOR_SEARCH_QUERY_USER_PROMPT,
 )
 from app.prompts.vendor_communication_prompts import (
     VENDOR_EMAIL_REPLY_PROMPT,
     VENDOR_PHONE_RESPONSE_PARSE_PROMPT,
     VENDOR_SMS_REPLY_PROMPT,
+    VENDOR_REPLY_EXTRACTION_INSTRUCTIONS,
     NEGOTIATION_PROMPT,
 )
 
+OUTREACH_CHANNELS = ("email", "sms", "phone")
+# Pseudo-field stream_work_order_input yields before fallback values when the
+# model stream fails part way: {"reason": ..., "model_fields": [...]}
+STREAM_FALLBACK_FIELD = "_fallback"
+
+# In-flight and finished outreach template generations, keyed by work order
+# content, so concurrent contacts for one work order share a single LLM call.
+_outreach_templates: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+
 
 class AIAgentService:
-    def __init__(self):
-        self.client = (
-            AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            if settings.OPENAI_API_KEY
-            else None
+    def __init__(
+        self, client: Optional[AsyncOpenAI] = None, db: Optional[AsyncSession] = None
+    ):
+        self.client = client or get_clients().openai
+        # The caller's session, committed before a deferred call waits on its batch
+        self.db = db
+
+    @staticmethod
+    def should_defer(work_order: WorkOrder) -> bool:
+        """Whether a work order's LLM work can wait for the batch queue"""
+        if not llm_batch.enabled or work_order.urgency in REALTIME_URGENCIES:
+            return False
+        return (
+            work_order.work_type == WorkType.PREVENTIVE
+            or work_order.priority == Priority.LOW
         )
 
+    async def _complete(
+        self,
+        call_site: str,
+        parse: Optional[Callable] = None,
+        lane: str = LANE_BACKGROUND,
+        defer: bool = False,
+        **request,
+    ) -> Any:
+        """
+        Chat completion text (run through ``parse`` if given), served from the
+        LLM cache when ``call_site`` is opted in. Only parseable replies are cached.
+        Provider calls wait for a slot from the global LLM scheduler and are
+        recorded in llm_metrics. With ``defer`` they go through the batch queue
+        instead, when batch mode is on; the caller's session is committed first
+        so no connection or transaction is held while the batch runs.
+        """
+        with llm_metrics.track(call_site, request.get("model")) as record:
+            use_cache = llm_cache.enabled_for(call_site)
+            if use_cache:
+                key = make_cache_key(**request)
+                cached = llm_cache.get(call_site, key)
+                if cached is not None:
+                    record.cached = True
+                    return parse(cached) if parse else cached
+
+            content = None
+            if defer and llm_batch.enabled:
+                await self._release_session()
+                try:
+                    content, usage = await llm_batch.submit(request)
+                    record.batched = True
+                    record.finished(usage)
+                except BatchJobError as e:
+                    print(f"⚠️  Batched {call_site} failed ({e}), running it now")
+
+            if content is None:
+                estimated_tokens = llm_scheduler.estimate_tokens(
+                    request["messages"], request.get("max_tokens")
+                )
+
+                def slot():
+                    return llm_scheduler.slot(lane, estimated_tokens)
+
+                async def attempt(ticket):
+                    response = await self.client.chat.completions.create(**request)
+                    usage = getattr(response, "usage", None)
+                    ticket.record_usage(getattr(usage, "total_tokens", None))
+                    return response
+
+                # Latency, like the budget, is measured from the slot grant
+                def hedged():
+                    record.hedged = True
+
+                response = await guarded_call(
+                    call_site,
+                    attempt,
+                    slot=slot,
+                    on_dispatch=record.started,
+                    on_hedge=hedged,
+                )
+                record.finished(getattr(response, "usage", None))
+                content = response.choices[0].message.content
+            result = parse(content) if parse else content
+
+            if use_cache:
+                llm_cache.set(call_site, key, content, record.latency_seconds)
+            return result
+
+    async def _release_session(self):
+        """Commit the caller's transaction, returning its connection to the pool"""
+        if self.db is not None and self.db.in_transaction():
+            # expire_on_commit=False keeps loaded objects usable afterwards
+            await self.db.commit()
+
     async def parse_work_order_input(self, raw_input: str) -> Dict[str, Any]:
         if not self.client:
             return self._fallback_parse(raw_input)
 
         try:
-            response = await self.client.chat.completions.create(
+            result = await self._complete(
+                "parse_work_order_input",
+                parse=json.loads,
+                lane=LANE_INTERACTIVE,
                 model=AI_MODEL,
                 messages=[
                     {"role": "system", "content": WORK_ORDER_PARSING_SYSTEM_PROMPT},
@@ -57,13 +182,149 @@ class AIAgentService:
                 temperature=AI_TEMPERATURE_PARSING,
             )
 
-            result = json.loads(response.choices[0].message.content)
             return result
 
         except Exception as e:
             print(f"AI parsing error: {e}")
             return self._fallback_parse(raw_input)
 
+    async def stream_work_order_input(
+        self, raw_input: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Same parse as parse_work_order_input, but yields (field, value) pairs as
+        each one is decoded from the streamed completion.
+        """
+        if not self.client:
+            for field in self._fallback_parse(raw_input).items():
+                yield field
+            return
+
+        request = dict(
+            model=AI_MODEL,
+            messages=[
+                {"role": "system", "content": WORK_ORDER_PARSING_SYSTEM_PROMPT},
+                {"role": "user", "content": WORK_ORDER_PARSING_USER_PROMPT(raw_input)},
+            ],
+            response_format=RESPONSE_FORMAT_JSON,
+            temperature=AI_TEMPERATURE_PARSING,
+        )
+        call_site = "parse_work_order_input"
+        use_cache = llm_cache.enabled_for(call_site)
+        if use_cache:
+            key = make_cache_key(**request)
+            cached = llm_cache.get(call_site, key)
+            if cached is not None:
+                record = LLMCallRecord(call_site, request["model"])
+                record.cached = True
+                llm_metrics.record(record)
+                for field in json.loads(cached).items():
+                    yield field
+                return
+
+        emitted = set()
+        # Recorded by hand: fields are yielded mid-call, so the tracking
+        # context manager's context variable can't stay set across them
+        record = LLMCallRecord(call_site, request["model"])
+        allowed = False
+        # The model stream is read into a queue by a task that holds the
+        # scheduler slot only until the completion ends; fields are yielded
+        # outside it, so a slow SSE reader can't hold interactive capacity
+        fields: asyncio.Queue = asyncio.Queue()
+        producer = None
+        try:
+            if not openai_breaker.allow_request():
+                raise CircuitOpenError(f"OpenAI circuit open, skipping {call_site}")
+            allowed = True
+            producer = asyncio.create_task(
+                self._read_work_order_stream(call_site, request, record, fields)
+            )
+            producer.add_done_callback(lambda _: fields.put_nowait(None))
+            while (item := await fields.get()) is not None:
+                emitted.add(item[0])
+                yield item
+            content = producer.result()
+            openai_breaker.record_success()
+
+            # Anything the incremental parser couldn't place on its own
+            for field, value in json.loads(content).items():
+                if field not in emitted:
+                    emitted.add(field)
+                    yield field, value
+
+            if use_cache:
+                llm_cache.set(call_site, key, content, record.latency_seconds)
+            llm_metrics.record(record)
+
+        except (GeneratorExit, asyncio.CancelledError):
+            # Client went away mid-stream; no verdict on the provider
+            if allowed:
+                openai_breaker.release_probe()
+            raise
+        except Exception as e:
+            print(f"AI streaming parse error: {e}")
+            if allowed and isinstance(e, PROVIDER_FAILURES):
+                openai_breaker.record_failure(e)
+            elif allowed and not isinstance(e, SchedulerQueueTimeout):
+                openai_breaker.record_success()
+            elif allowed:
+                openai_breaker.release_probe()
+            record.error = type(e).__name__
+            record.finished()
+            llm_metrics.record(record)
+            # Tell the consumer the rest are fallbacks, not model output
+            yield (
+                STREAM_FALLBACK_FIELD,
+                {"reason": str(e) or type(e).__name__, "model_fields": sorted(emitted)},
+            )
+            for field, value in self._fallback_parse(raw_input).items():
+                if field not in emitted:
+                    yield field, value
+        finally:
+            if producer is not None and not producer.done():
+                producer.cancel()
+
+    async def _read_work_order_stream(
+        self,
+        call_site: str,
+        request: Dict[str, Any],
+        record: LLMCallRecord,
+        fields: asyncio.Queue,
+    ) -> str:
+        """Stream the completion into ``fields`` and return its full content"""
+        parser = IncrementalJSONObjectParser()
+        content = ""
+        estimated_tokens = llm_scheduler.estimate_tokens(request["messages"], None)
+        try:
+            async with asyncio.timeout(
+                settings.LLM_QUEUE_TIMEOUT_SECONDS
+            ) as queue_wait:
+                async with llm_scheduler.slot(LANE_INTERACTIVE, estimated_tokens):
+                    queue_wait.reschedule(None)
+                    record.started()
+                    # The budget bounds time to the stream opening; once fields
+                    # are flowing the caller is already seeing progress
+                    stream = await asyncio.wait_for(
+                        self.client.chat.completions.create(stream=True, **request),
+                        latency_budget(call_site),
+                    )
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content or ""
+                        content += delta
+                        for item in parser.feed(delta):
+                            fields.put_nowait(item)
+                    record.finished()
+        except asyncio.TimeoutError as e:
+            if queue_wait.expired():
+                raise SchedulerQueueTimeout(
+                    f"{call_site} waited over {settings.LLM_QUEUE_TIMEOUT_SECONDS}s "
+                    "for an LLM slot"
+                ) from e
+            raise
+        return content
+
     def _fallback_parse(self, raw_input: str) -> Dict[str, Any]:
         return {
             "title": "Work Order from Natural Language",
@@ -78,7 +339,11 @@ class AIAgentService:
         }
 
     async def generate_vendor_contact_message(
-        self, work_order_data: Dict[str, Any], vendor_name: str, channel: str
+        self,
+        work_order_data: Dict[str, Any],
+        vendor_name: str,
+        channel: str,
+        defer: bool = False,
     ) -> str:
         if not self.client:
             return self._fallback_contact_message(work_order_data, vendor_name, channel)
@@ -118,7 +383,9 @@ class AIAgentService:
             max_tokens = AI_MAX_TOKENS_MEDIUM
 
         try:
-            response = await self.client.chat.completions.create(
+            content = await self._complete(
+                "generate_vendor_contact_message",
+                defer=defer,
                 model=AI_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -128,12 +395,127 @@ class AIAgentService:
                 max_tokens=max_tokens,
             )
 
-            return response.choices[0].message.content.strip()
+            return content.strip()
 
         except Exception as e:
             print(f"AI message generation error: {e}")
             return self._fallback_contact_message(work_order_data, vendor_name, channel)
 
+    async def get_vendor_contact_message(
+        self,
+        work_order_data: Dict[str, Any],
+        vendor_name: str,
+        channel: str,
+        defer: bool = False,
+    ) -> str:
+        """Outreach message for one vendor, honouring VENDOR_OUTREACH_MODE"""
+        if settings.VENDOR_OUTREACH_MODE != "template":
+            return await self.generate_vendor_contact_message(
+                work_order_data, vendor_name, channel, defer
+            )
+
+        template = await self.get_outreach_template(work_order_data, defer)
+        return self.render_outreach_message(template, vendor_name, channel)
+
+    async def get_outreach_template(
+        self, work_order_data: Dict[str, Any], defer: bool = False
+    ) -> Dict[str, str]:
+        """
+        Channel -> message template for a work order, with VENDOR_NAME_PLACEHOLDER
+        where the vendor name goes. Generated once per work order and shared.
+        """
+        key = make_cache_key(**work_order_data)
+        loop = asyncio.get_running_loop()
+
+        task = _outreach_templates.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(
+                self._generate_outreach_template(work_order_data, defer)
+            )
+            _outreach_templates[key] = task
+            while len(_outreach_templates) > OUTREACH_TEMPLATE_CACHE_SIZE:
+                _outreach_templates.popitem(last=False)
+        else:
+            _outreach_templates.move_to_end(key)
+
+        template = await asyncio.shield(task)
+        if template is None:
+            # Don't pin the fallback; the next contact round retries the LLM
+            if _outreach_templates.get(key) is task:
+                del _outreach_templates[key]
+            return {
+                channel: self._fallback_contact_message(
+                    work_order_data, VENDOR_NAME_PLACEHOLDER, channel
+                )
+                for channel in OUTREACH_CHANNELS
+            }
+        return template
+
+    async def _generate_outreach_template(
+        self, work_order_data: Dict[str, Any], defer: bool = False
+    ) -> Optional[Dict[str, str]]:
+        if not self.client:
+            return None
+
+        try:
+            return await self._complete(
+                "generate_outreach_template",
+                parse=self._parse_outreach_template,
+                defer=defer,
+                model=AI_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": VENDOR_OUTREACH_TEMPLATE_SYSTEM_PROMPT,
+                    },
+                    {
+                        "role": "user",
+                        "content": VENDOR_OUTREACH_TEMPLATE_USER_PROMPT(
+                            trade_type=work_order_data.get(
+                                "trade_type", "general service"
+                            ),
+                            location_address=work_order_data.get(
+                                "location_address", "TBD"
+                            ),
+                            description=work_order_data.get(
+                                "description", "Service needed"
+                            ),
+                            urgency=work_order_data.get("urgency", "medium"),
+                            preferred_date=work_order_data.get(
+                                "preferred_date", "flexible"
+                            ),
+                        ),
+                    },
+                ],
+                response_format=RESPONSE_FORMAT_JSON,
+                temperature=AI_TEMPERATURE_GENERATION,
+                max_tokens=AI_MAX_TOKENS_LONG,
+            )
+
+        except Exception as e:
+            print(f"AI outreach template error: {e}")
+            return None
+
+    @staticmethod
+    def _parse_outreach_template(content: str) -> Dict[str, str]:
+        result = json.loads(content)
+        fields = ("email_subject", "email_body", "sms", "phone_script")
+        if not all(isinstance(result.get(f), str) and result[f] for f in fields):
+            raise ValueError(f"incomplete outreach template: {sorted(result)}")
+
+        return {
+            "email": f"Subject: {result['email_subject'].strip()}\n\n"
+            f"{result['email_body'].strip()}",
+            "sms": result["sms"].strip(),
+            "phone": result["phone_script"].strip(),
+        }
+
+    def render_outreach_message(
+        self, template: Dict[str, str], vendor_name: str, channel: str
+    ) -> str:
+        message = template.get(channel, template["phone"])
+        return message.replace(VENDOR_NAME_PLACEHOLDER, vendor_name or "there")
+
     def _fallback_contact_message(
         self, work_order_data: Dict[str, Any], vendor_name: str, channel: str
     ) -> str:
@@ -159,86 +541,111 @@ Tavi Team"""
         else:
             return f"Hello, this is Tavi calling about a {trade} job opportunity at {location}. Are you available to provide a quote?"
 
-    async def parse_vendor_response(self, response_text: str) -> Dict[str, Any]:
+    async def generate_vendor_search_queries(
+        self, work_order: WorkOrder, defer: bool = False
+    ) -> List[str]:
+        """Search query variations for vendor discovery ([] if the model can't help)"""
         if not self.client:
-            return {"price": None, "availability_date": None, "notes": response_text}
+            return []
 
         try:
-            response = await self.client.chat.completions.create(
+            result = await self._complete(
+                "generate_search_queries",
+                parse=json.loads,
+                defer=defer,
                 model=AI_MODEL,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": VENDOR_RESPONSE_PARSING_SYSTEM_PROMPT,
-                    },
+                    {"role": "system", "content": VENDOR_SEARCH_QUERY_SYSTEM_PROMPT},
                     {
                         "role": "user",
-                        "content": VENDOR_RESPONSE_PARSING_USER_PROMPT(response_text),
+                        "content": VENDOR_SEARCH_QUERY_USER_PROMPT(
+                            trade_type=work_order.trade_type.value,
+                            title=work_order.title,
+                            description=work_order.description,
+                            urgency=work_order.urgency,
+                            work_type=work_order.work_type.value
+                            if work_order.work_type
+                            else "reactive",
+                        ),
                     },
                 ],
                 response_format=RESPONSE_FORMAT_JSON,
-                temperature=AI_TEMPERATURE_PARSING,
+                temperature=AI_TEMPERATURE_GENERATION,
+                max_tokens=200,
             )
-
-            return json.loads(response.choices[0].message.content)
+            queries = result.get("queries", result.get("search_queries", []))
+            if queries and isinstance(queries, list):
+                return queries
 
         except Exception as e:
-            print(f"AI response parsing error: {e}")
-            return {"price": None, "availability_date": None, "notes": response_text}
+            print(f"⚠️  AI query generation failed: {e}")
 
-    async def parse_vendor_email_response(
-        self, message: str, conversation_history: str, work_order_data: dict
-    ) -> Dict[str, Any]:
-        if not self.client:
+        return []
+
+    async def parse_vendor_response(self, response_text: str) -> Dict[str, Any]:
+        extracted = fast_path_extract("parse_vendor_response", response_text)
+        if extracted:
+            availability_date = None
+            if extracted["availability_days"] is not None:
+                availability_date = (
+                    datetime.utcnow() + timedelta(days=extracted["availability_days"])
+                ).isoformat()
             return {
-                "needs_human": True,
-                "reason": "No AI client",
-                "draft_response": "Thank you for your response.",
+                "price": extracted["price"],
+                "availability_date": availability_date,
+                "notes": response_text,
+                "currency": extracted["currency"],
+                "duration_hours": extracted["duration_hours"],
+                "confidence": extracted["confidence"],
             }
 
-        turn_count = work_order_data.get("turn_count", 0)
+        if not self.client:
+            return {"price": None, "availability_date": None, "notes": response_text}
 
         try:
-            prompt = VENDOR_EMAIL_REPLY_PROMPT.format(
-                turn_count=turn_count,
-                conversation_history=conversation_history,
-                vendor_message=message,
-                description=work_order_data.get("description", ""),
-                budget=work_order_data.get("budget", "flexible"),
-            )
-
-            response = await self.client.chat.completions.create(
+            return await self._complete(
+                "parse_vendor_response",
+                parse=json.loads,
                 model=AI_MODEL,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a professional service coordinator.",
+                        "content": VENDOR_RESPONSE_PARSING_SYSTEM_PROMPT,
+                    },
+                    {
+                        "role": "user",
+                        "content": VENDOR_RESPONSE_PARSING_USER_PROMPT(response_text),
                     },
-                    {"role": "user", "content": prompt},
                 ],
                 response_format=RESPONSE_FORMAT_JSON,
-                temperature=AI_TEMPERATURE_GENERATION,
+                temperature=AI_TEMPERATURE_PARSING,
             )
 
-            result = json.loads(response.choices[0].message.content)
-
-            if not result.get("needs_human"):
-                quote_info = await self.parse_vendor_response(message)
-                result["extracted_info"] = quote_info
-
-            return result
-
         except Exception as e:
-            print(f"AI email response error: {e}")
-            return {
-                "needs_human": True,
-                "reason": f"AI error: {str(e)}",
-                "draft_response": "Thank you for your response. We will review and get back to you shortly.",
-            }
+            print(f"AI response parsing error: {e}")
+            return {"price": None, "availability_date": None, "notes": response_text}
+
+    async def parse_vendor_email_response(
+        self, message: str, conversation_history: str, work_order_data: dict
+    ) -> Dict[str, Any]:
+        return await self.reply_and_extract(
+            "email", message, conversation_history, work_order_data
+        )
 
     async def parse_vendor_phone_response(
         self, transcript: str, work_order_data: dict
     ) -> Dict[str, Any]:
+        extracted = fast_path_extract("parse_vendor_phone_response", transcript)
+        if extracted:
+            return {
+                "extracted_info": {
+                    "price": extracted["price"],
+                    "availability_days": extracted["availability_days"],
+                    "duration_hours": extracted["duration_hours"],
+                },
+                "summary": transcript,
+            }
+
         if not self.client:
             return {"extracted_info": None}
 
@@ -249,7 +656,9 @@ Tavi Team"""
                 trade_type=work_order_data.get("trade_type", ""),
             )
 
-            response = await self.client.chat.completions.create(
+            return await self._complete(
+                "parse_vendor_phone_response",
+                parse=lambda content: json.loads(content.strip()),
                 model=AI_MODEL,
                 messages=[
                     {
@@ -261,11 +670,6 @@ Tavi Team"""
                 temperature=AI_TEMPERATURE_PARSING,
             )
 
-            content = response.choices[0].message.content.strip()
-
-            parsed = json.loads(content)
-            return parsed
-
         except Exception as e:
             print(f"Error parsing phone response: {e}")
             return {"extracted_info": None}
@@ -273,46 +677,117 @@ Tavi Team"""
     async def parse_vendor_sms_response(
         self, message: str, conversation_history: str, work_order_data: dict
     ) -> Dict[str, Any]:
-        if not self.client:
-            return {
-                "needs_human": True,
-                "reason": "No AI client",
-                "response": "Thanks! Reviewing.",
-            }
+        return await self.reply_and_extract(
+            "sms", message, conversation_history, work_order_data
+        )
+
+    async def reply_and_extract(
+        self,
+        channel: str,
+        message: str,
+        conversation_history: str,
+        work_order_data: dict,
+    ) -> Dict[str, Any]:
+        """
+        One structured call for an inbound email/SMS reply: the needs_human
+        decision, our reply and the extracted price, availability and duration.
+        Always realtime: the vendor is waiting on our answer.
+        """
+        if channel == "email":
+            prompt_template = VENDOR_EMAIL_REPLY_PROMPT
+            system_prompt = "You are a professional service coordinator."
+            response_hint = "Brief reply (max 100 words)"
+            fallback_reply = "Thank you for your response. We will review and get back to you shortly."
+            closing_reply = "Thank you! We'll review and contact you if selected."
+        else:
+            prompt_template = VENDOR_SMS_REPLY_PROMPT
+            system_prompt = "You are a service coordinator texting a vendor."
+            response_hint = "SMS (max 160 chars)"
+            fallback_reply = "Thanks! We'll review and get back to you."
+            closing_reply = "Thanks! We'll review and contact you."
+
+        # A clear price + availability ends the conversation anyway (the prompts'
+        # primary rule), so there is nothing for the model to decide. SMS only:
+        # free-form email carries too many conditions for the rules to judge.
+        extracted = (
+            fast_path_extract(f"parse_vendor_{channel}_response", message)
+            if channel == "sms"
+            else None
+        )
+        if extracted:
+            return self._normalize_vendor_reply(
+                {
+                    "needs_human": False,
+                    "response": closing_reply,
+                    "extracted_info": extracted,
+                    "conversation_complete": True,
+                    "fast_path": True,
+                },
+                fallback_reply,
+            )
 
-        turn_count = work_order_data.get("turn_count", 0)
+        if not self.client:
+            return self._normalize_vendor_reply(
+                {"needs_human": True, "reason": "No AI client"}, fallback_reply
+            )
 
         try:
-            prompt = VENDOR_SMS_REPLY_PROMPT.format(
-                turn_count=turn_count,
+            prompt = prompt_template.format(
+                turn_count=work_order_data.get("turn_count", 0),
                 conversation_history=conversation_history,
                 vendor_message=message,
                 description=work_order_data.get("description", ""),
                 budget=work_order_data.get("budget", "flexible"),
+                extraction_instructions=VENDOR_REPLY_EXTRACTION_INSTRUCTIONS.format(
+                    response_hint=response_hint
+                ),
             )
 
-            response = await self.client.chat.completions.create(
+            result = await self._complete(
+                f"parse_vendor_{channel}_response",
+                parse=json.loads,
                 model=AI_MODEL,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a service coordinator texting a vendor.",
-                    },
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt},
                 ],
                 response_format=RESPONSE_FORMAT_JSON,
                 temperature=AI_TEMPERATURE_GENERATION,
             )
-
-            return json.loads(response.choices[0].message.content)
+            return self._normalize_vendor_reply(result, fallback_reply)
 
         except Exception as e:
-            print(f"AI SMS response error: {e}")
-            return {
-                "needs_human": True,
-                "reason": f"AI error: {str(e)}",
-                "response": "Thanks! We'll review and get back to you.",
-            }
+            print(f"AI {channel} response error: {e}")
+            return self._normalize_vendor_reply(
+                {"needs_human": True, "reason": f"AI error: {str(e)}"}, fallback_reply
+            )
+
+    def _normalize_vendor_reply(
+        self, result: Dict[str, Any], fallback_reply: str
+    ) -> Dict[str, Any]:
+        """Coerce the model's JSON into the shape the webhooks rely on"""
+        info = result.get("extracted_info")
+        info = info if isinstance(info, dict) else {}
+
+        def number(value, cast):
+            try:
+                return cast(value) if value not in (None, "") else None
+            except (TypeError, ValueError):
+                return None
+
+        reply = result.get("response") or result.get("draft_response")
+        return {
+            **result,
+            "needs_human": bool(result.get("needs_human")),
+            "conversation_complete": bool(result.get("conversation_complete")),
+            "response": reply or fallback_reply,
+            "draft_response": result.get("draft_response") or reply or fallback_reply,
+            "extracted_info": {
+                "price": number(info.get("price"), float),
+                "availability_days": number(info.get("availability_days"), float),
+                "duration_hours": number(info.get("duration_hours"), float),
+            },
+        }
 
     # IDEA: This is not used anywhere BUT I plan to have good negotiation model pipline that can help to sign best rated vendor on our desired pricing.
     async def generate_negotiation_message(
@@ -338,7 +813,8 @@ Tavi Team"""
                 channel=channel,
             )
 
-            response = await self.client.chat.completions.create(
+            content = await self._complete(
+                "generate_negotiation_message",
                 model=AI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a skilled negotiator."},
@@ -348,7 +824,7 @@ Tavi Team"""
                 max_tokens=AI_MAX_TOKENS_MEDIUM,
             )
 
-            return response.choices[0].message.content.strip()
+            return content.strip()
 
         except Exception as e:
             print(f"AI negotiation error: {e}")
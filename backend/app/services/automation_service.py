@@ -5,12 +5,15 @@ Autonomous AI Agent Service for end-to-end work order automation
 import asyncio
 from typing import Dict, AsyncGenerator, List
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 import random
 
+from app.database import AsyncSessionLocal
 from app.models.work_order import WorkOrderStatus
-from app.models.quote import Quote
+from app.models.quote import Quote, QuoteStatus
 from app.services.work_order_service import WorkOrderService
 from app.services.quote_service import QuoteService
 from app.services.communication_service import CommunicationService
@@ -30,7 +33,7 @@ class AutomationService:
     _running_automations = {}
     _lock = asyncio.Lock()
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.work_order_service = WorkOrderService(db)
         self.quote_service = QuoteService(db)
@@ -54,7 +57,7 @@ class AutomationService:
             self._running_automations[work_order_id_str] = True
 
         try:
-            work_order = self.work_order_service.get_work_order(work_order_id)
+            work_order = await self.work_order_service.get_work_order(work_order_id)
             if work_order.status in [
                 WorkOrderStatus.DISPATCHED,
                 WorkOrderStatus.COMPLETED,
@@ -91,7 +94,7 @@ class AutomationService:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-            quotes_requested = await self._request_all_quotes_parallel(work_order_id)
+            quotes_requested = await self._request_all_quotes(work_order_id)
 
             yield {
                 "step": 2,
@@ -144,7 +147,7 @@ class AutomationService:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-            work_order = self.work_order_service.get_work_order(work_order_id)
+            work_order = await self.work_order_service.get_work_order(work_order_id)
             currency_info = get_currency_info(
                 work_order.location_country or "United States"
             )
@@ -201,50 +204,42 @@ class AutomationService:
             async with self._lock:
                 self._running_automations.pop(work_order_id_str, None)
 
-    async def _discover_vendors(self, work_order_id: UUID) -> int:
-        existing_quotes = (
-            self.db.query(Quote).filter(Quote.work_order_id == work_order_id).all()
+    async def _count_quotes(self, work_order_id: UUID) -> int:
+        return await self.db.scalar(
+            select(func.count())
+            .select_from(Quote)
+            .where(Quote.work_order_id == work_order_id)
         )
 
-        if len(existing_quotes) == 0:
-            self.work_order_service.start_vendor_discovery_workflow(work_order_id)
-            await asyncio.sleep(2)
-            quotes = (
-                self.db.query(Quote).filter(Quote.work_order_id == work_order_id).all()
-            )
-            return len(quotes)
-        else:
-            return len(existing_quotes)
-
-    async def _request_all_quotes_parallel(self, work_order_id: UUID) -> int:
-        quotes = self.db.query(Quote).filter(Quote.work_order_id == work_order_id).all()
-        quote_ids = [str(quote.id) for quote in quotes]
-
-        tasks = []
-        for quote_id in quote_ids:
-            task = self._request_single_quote(UUID(quote_id))
-            tasks.append(task)
-
-        await asyncio.gather(*tasks)
+    async def _discover_vendors(self, work_order_id: UUID) -> int:
+        existing_quotes = await self._count_quotes(work_order_id)
 
-        return len(quote_ids)
+        if existing_quotes == 0:
+            await self.work_order_service.start_vendor_discovery_workflow(work_order_id)
+            return await self._count_quotes(work_order_id)
+        else:
+            return existing_quotes
 
-    async def _request_single_quote(self, quote_id: UUID):
-        quote = self.db.query(Quote).filter(Quote.id == quote_id).first()
-        if not quote:
-            return
+    async def _request_all_quotes(self, work_order_id: UUID) -> int:
+        result = await self.db.execute(
+            update(Quote)
+            .where(Quote.work_order_id == work_order_id)
+            .values(status=QuoteStatus.REQUESTED)
+        )
+        await self.db.commit()
 
-        quote.status = "requested"
-        self.db.commit()
+        return result.rowcount
 
     async def _simulate_all_responses_parallel(
         self, work_order_id: UUID
     ) -> AsyncGenerator[Dict, None]:
-        quotes = (
-            self.db.query(Quote)
-            .filter(Quote.work_order_id == work_order_id, Quote.status == "requested")
-            .all()
+        result = await self.db.execute(
+            select(Quote).where(
+                Quote.work_order_id == work_order_id,
+                Quote.status == QuoteStatus.REQUESTED,
+            )
         )
+        quotes = result.scalars().all()
 
         total = len(quotes)
         completed = 0
@@ -280,12 +275,20 @@ class AutomationService:
         }
 
     async def _simulate_single_vendor_response(self, quote_id: UUID):
-        quote = self.db.query(Quote).filter(Quote.id == quote_id).first()
+        await asyncio.sleep(random.uniform(0.5, 2.0))
+
+        # Responses are simulated concurrently and an AsyncSession cannot be
+        # shared between tasks, so each vendor reply gets its own session.
+        async with AsyncSessionLocal() as db:
+            await self._simulate_single_vendor_response_in_session(db, quote_id)
+
+    async def _simulate_single_vendor_response_in_session(
+        self, db: AsyncSession, quote_id: UUID
+    ):
+        quote = await QuoteService(db).get_quote(quote_id)
         if not quote:
             return
 
-        await asyncio.sleep(random.uniform(0.5, 2.0))
-
         work_order = quote.work_order
         currency_info = get_currency_info(
             work_order.location_country or "United States"
@@ -308,26 +311,35 @@ class AutomationService:
 
         if use_sms:
             await process_vendor_sms_response(
-                db=self.db,
+                db=db,
                 quote_id=quote_id,
                 vendor_id=quote.vendor.id,
                 message=inbound_message,
             )
         else:
             await process_vendor_email_response(
-                db=self.db,
+                db=db,
                 quote_id=quote_id,
                 vendor_id=quote.vendor.id,
                 message=inbound_message,
                 subject="Re: Service opportunity - Quote request",
             )
 
-    async def _evaluate_and_select_best(self, work_order_id: UUID) -> Dict:
-        quotes = (
-            self.db.query(Quote)
-            .filter(Quote.work_order_id == work_order_id, Quote.price.isnot(None))
-            .all()
+    async def _get_priced_quotes(self, work_order_id: UUID) -> List[Quote]:
+        # Vendor replies are written from other sessions, so refresh any quotes
+        # this session already holds in its identity map.
+        result = await self.db.execute(
+            select(Quote)
+            .options(joinedload(Quote.vendor))
+            .where(Quote.work_order_id == work_order_id, Quote.price.isnot(None))
+            .execution_options(populate_existing=True)
         )
+        return list(result.scalars().all())
+
+    async def _evaluate_and_select_best(self, work_order_id: UUID) -> Dict:
+        quotes = await self._get_priced_quotes(work_order_id)
+        # End the read transaction so the pause doesn't hold a pooled connection
+        await self.db.commit()
 
         best_quote = max(quotes, key=lambda q: q.composite_score or 0)
         await asyncio.sleep(1)
@@ -346,8 +358,8 @@ class AutomationService:
         }
 
     async def _auto_confirm_and_dispatch(self, work_order_id: UUID, quote_id: UUID):
-        work_order = self.work_order_service.get_work_order(work_order_id)
-        quote = self.db.query(Quote).filter(Quote.id == quote_id).first()
+        work_order = await self.work_order_service.get_work_order(work_order_id)
+        quote = await self.quote_service.get_quote(quote_id)
 
         if not work_order.facility_manager_email:
             work_order.facility_manager_email = "manager@tavi.io"
@@ -357,7 +369,7 @@ class AutomationService:
         work_order.selected_vendor_id = quote.vendor_id
         work_order.status = WorkOrderStatus.VENDOR_SELECTED
         quote.status = "accepted"
-        self.db.commit()
+        await self.db.commit()
 
         await send_facility_manager_confirmation(
             self.db, work_order_id, quote.vendor_id
@@ -367,7 +379,7 @@ class AutomationService:
         work_order.facility_confirmed = datetime.utcnow()
         work_order.status = WorkOrderStatus.AWAITING_VENDOR_DISPATCH
 
-        self.comm_service.log_communication(
+        await self.comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=None,
             channel=CommunicationChannel.EMAIL,
@@ -383,7 +395,7 @@ class AutomationService:
             },
         )
 
-        self.db.commit()
+        await self.db.commit()
         await asyncio.sleep(1)
 
         await send_vendor_dispatch_confirmation(self.db, work_order_id, quote.vendor_id)
@@ -392,7 +404,7 @@ class AutomationService:
         work_order.vendor_dispatch_confirmed = datetime.utcnow()
         work_order.status = WorkOrderStatus.DISPATCHED
 
-        self.comm_service.log_communication(
+        await self.comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=quote.vendor_id,
             channel=CommunicationChannel.EMAIL,
@@ -406,14 +418,12 @@ class AutomationService:
             },
         )
 
-        self.db.commit()
+        await self.db.commit()
 
     async def _evaluate_and_rank_all(self, work_order_id: UUID) -> List[Dict]:
-        quotes = (
-            self.db.query(Quote)
-            .filter(Quote.work_order_id == work_order_id, Quote.price.isnot(None))
-            .all()
-        )
+        quotes = await self._get_priced_quotes(work_order_id)
+        # End the read transaction so the pause doesn't hold a pooled connection
+        await self.db.commit()
 
         sorted_quotes = sorted(
             quotes, key=lambda q: q.composite_score or 0, reverse=True
@@ -437,9 +447,9 @@ class AutomationService:
     async def _try_single_vendor_confirmation(
         self, work_order_id: UUID, vendor: Dict, attempt_number: int
     ) -> Dict:
-        work_order = self.work_order_service.get_work_order(work_order_id)
+        work_order = await self.work_order_service.get_work_order(work_order_id)
         quote_id = UUID(vendor["quote_id"])
-        quote = self.db.query(Quote).filter(Quote.id == quote_id).first()
+        quote = await self.quote_service.get_quote(quote_id)
 
         if not work_order.facility_manager_email:
             work_order.facility_manager_email = "manager@tavi.io"
@@ -449,7 +459,7 @@ class AutomationService:
         work_order.selected_vendor_id = quote.vendor_id
         work_order.status = WorkOrderStatus.VENDOR_SELECTED
         # ✅ REMOVED: quote.status = 'accepted' - only set after BOTH confirmations
-        self.db.commit()
+        await self.db.commit()
 
         await send_facility_manager_confirmation(
             self.db, work_order_id, quote.vendor_id
@@ -463,10 +473,10 @@ class AutomationService:
             # ✅ Reset work order status and selected vendor
             work_order.selected_vendor_id = None
             work_order.status = WorkOrderStatus.CONTACTING_VENDORS
-            self.db.commit()
+            await self.db.commit()
 
             comm_service = CommunicationService(self.db)
-            comm_service.log_communication(
+            await comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=None,
                 channel="EMAIL",
@@ -484,7 +494,7 @@ class AutomationService:
         work_order.status = WorkOrderStatus.AWAITING_VENDOR_DISPATCH
 
         comm_service = CommunicationService(self.db)
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=None,
             channel="EMAIL",
@@ -493,7 +503,7 @@ class AutomationService:
             sent_successfully=True,
             metadata={"source": "facility_manager", "decision": "approved"},
         )
-        self.db.commit()
+        await self.db.commit()
         await asyncio.sleep(0.5)
 
         await send_vendor_dispatch_confirmation(self.db, work_order_id, quote.vendor_id)
@@ -506,9 +516,9 @@ class AutomationService:
             work_order.selected_vendor_id = None
             work_order.status = WorkOrderStatus.CONTACTING_VENDORS
             work_order.facility_confirmed = None  # Reset facility confirmation too
-            self.db.commit()
+            await self.db.commit()
 
-            comm_service.log_communication(
+            await comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=quote.vendor_id,
                 channel="SMS",
@@ -527,7 +537,7 @@ class AutomationService:
         work_order.vendor_dispatch_confirmed = datetime.utcnow()
         work_order.status = WorkOrderStatus.DISPATCHED
 
-        comm_service.log_communication(
+        await comm_service.log_communication(
             work_order_id=work_order.id,
             vendor_id=quote.vendor_id,
             channel="SMS",
@@ -537,7 +547,7 @@ class AutomationService:
             metadata={"source": "vendor", "decision": "confirmed"},
         )
 
-        self.db.commit()
+        await self.db.commit()
 
         return {
             "success": True,
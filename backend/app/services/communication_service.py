@@ -1,16 +1,18 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
+from app.llm_metrics import current_trace
 from app.models.vendor import Vendor
 
 from app.models.communication_log import CommunicationLog, CommunicationChannel
 
 
 class CommunicationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def log_communication(
+    async def log_communication(
         self,
         work_order_id: UUID,
         channel: CommunicationChannel,
@@ -19,6 +21,13 @@ class CommunicationService:
         vendor_id: Optional[UUID] = None,
         **kwargs,
     ) -> CommunicationLog:
+        trace = current_trace()
+        if trace is not None and "ai_metadata" not in kwargs:
+            # LLM calls made since the last log in this operation produced this one
+            ai_metadata = trace.drain_summary()
+            if ai_metadata is not None:
+                kwargs["ai_metadata"] = ai_metadata
+
         comm_log = CommunicationLog(
             work_order_id=work_order_id,
             vendor_id=vendor_id,
@@ -29,67 +38,59 @@ class CommunicationService:
         )
 
         self.db.add(comm_log)
-        self.db.commit()
-        self.db.refresh(comm_log)
+        await self.db.commit()
+        await self.db.refresh(comm_log)
 
         return comm_log
 
-    def get_communications_for_work_order(self, work_order_id: UUID) -> List[dict]:
-        comms = (
-            self.db.query(CommunicationLog)
-            .filter(CommunicationLog.work_order_id == work_order_id)
+    def _stream_query(self):
+        # Only the CommunicationLogResponse fields: the AI prompt/response and
+        # call transcript columns are never read for the stream.
+        return select(
+            CommunicationLog.id,
+            CommunicationLog.work_order_id,
+            CommunicationLog.vendor_id,
+            Vendor.business_name.label("vendor_name"),
+            CommunicationLog.channel,
+            CommunicationLog.direction,
+            CommunicationLog.subject,
+            CommunicationLog.message,
+            CommunicationLog.response,
+            CommunicationLog.sent_successfully,
+            CommunicationLog.timestamp,
+        ).outerjoin(Vendor, Vendor.id == CommunicationLog.vendor_id)
+
+    async def get_communications_for_work_order(
+        self, work_order_id: UUID
+    ) -> List[dict]:
+        result = await self.db.execute(
+            self._stream_query()
+            .where(CommunicationLog.work_order_id == work_order_id)
             .order_by(CommunicationLog.timestamp.asc())
-            .all()
         )
+        return [dict(row._mapping) for row in result]
 
-        result = []
-        for comm in comms:
-            comm_dict = {
-                "id": comm.id,
-                "work_order_id": comm.work_order_id,
-                "vendor_id": comm.vendor_id,
-                "vendor_name": None,
-                "channel": comm.channel,
-                "direction": comm.direction,
-                "subject": comm.subject,
-                "message": comm.message,
-                "response": comm.response,
-                "sent_successfully": comm.sent_successfully,
-                "timestamp": comm.timestamp,
-            }
-
-            if comm.vendor_id:
-                vendor = (
-                    self.db.query(Vendor).filter(Vendor.id == comm.vendor_id).first()
-                )
-                if vendor:
-                    comm_dict["vendor_name"] = vendor.business_name
-
-            result.append(comm_dict)
-
-        return result
-
-    def get_communications_for_vendor(self, vendor_id: UUID) -> List[CommunicationLog]:
-        return (
-            self.db.query(CommunicationLog)
-            .filter(CommunicationLog.vendor_id == vendor_id)
+    async def get_communications_for_vendor(self, vendor_id: UUID) -> List[dict]:
+        result = await self.db.execute(
+            self._stream_query()
+            .where(CommunicationLog.vendor_id == vendor_id)
             .order_by(CommunicationLog.timestamp.desc())
-            .all()
         )
+        return [dict(row._mapping) for row in result]
 
-    def get_conversation_history(
+    async def get_conversation_history(
         self, work_order_id: UUID, vendor_id: UUID, limit: int = 10
     ) -> str:
-        communications = (
-            self.db.query(CommunicationLog)
-            .filter(
+        result = await self.db.execute(
+            select(CommunicationLog)
+            .where(
                 CommunicationLog.work_order_id == work_order_id,
                 CommunicationLog.vendor_id == vendor_id,
             )
             .order_by(CommunicationLog.timestamp.asc())
             .limit(limit)
-            .all()
         )
+        communications = result.scalars().all()
 
         if not communications:
             return "No previous conversation"
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+
+from app.clients import ClientRegistry, get_clients
+from app.config import settings
+from app.models.geocode_cache import GeocodeCache
+from app.models.vendor import Vendor
+from app.models.work_order import WorkOrder
+from app.utils import normalize_address
+from app.vendor_index import vendor_index
+
+
+class GeocodeStats:
+    """Geocode lookups answered from the cache vs. sent to Google."""
+
+    def __init__(self):
+        self.cache_hits = 0
+        self.api_calls = 0
+        self.api_errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.cache_hits + self.api_calls
+            return {
+                "cache_hits": self.cache_hits,
+                "api_calls": self.api_calls,
+                "api_errors": self.api_errors,
+                "hit_rate": round(self.cache_hits / lookups, 4) if lookups else None,
+            }
+
+
+geocode_stats = GeocodeStats()
+
+
+class GeocodingService:
+    def __init__(self, db: AsyncSession, clients: Optional[ClientRegistry] = None):
+        self.db = db
+        self.gmaps = (clients or get_clients()).google_maps
+
+    @staticmethod
+    def work_order_address(work_order: WorkOrder) -> str:
+        return f"{work_order.location_address}, {work_order.location_city or ''}, {work_order.location_state or ''}"
+
+    async def geocode(self, address: Optional[str]) -> Optional[Dict[str, float]]:
+        """
+        {"lat", "lng"} for an address, from the geocode cache while the entry is
+        within GEOCODE_CACHE_TTL_DAYS, otherwise from Google (and cached).
+        """
+        address_key = normalize_address(address)
+        if not address_key:
+            return None
+
+        cached = await self.db.get(GeocodeCache, address_key)
+        max_age = timedelta(days=settings.GEOCODE_CACHE_TTL_DAYS)
+        if cached and cached.fetched_at > datetime.utcnow() - max_age:
+            geocode_stats.record("cache_hits")
+            return self._coordinates(cached)
+
+        if not self.gmaps:
+            # A stale entry beats nothing
+            return self._coordinates(cached) if cached else None
+
+        try:
+            geocode_stats.record("api_calls")
+            result = await asyncio.to_thread(self.gmaps.geocode, address)
+        except Exception as e:
+            geocode_stats.record("api_errors")
+            print(f"Google Geocoding API error: {e}")
+            return self._coordinates(cached) if cached else None
+
+        location = result[0]["geometry"]["location"] if result else None
+        values = {
+            "latitude": location["lat"] if location else None,
+            "longitude": location["lng"] if location else None,
+            "formatted_address": result[0].get("formatted_address") if result else None,
+            "fetched_at": datetime.utcnow(),
+        }
+        stmt = insert(GeocodeCache).values(address_key=address_key, **values)
+        await self.db.execute(
+            stmt.on_conflict_do_update(index_elements=["address_key"], set_=values)
+        )
+        await self.db.commit()
+
+        if not location:
+            print(f"⚠️  Could not geocode location: {address}")
+            return None
+        return {"lat": location["lat"], "lng": location["lng"]}
+
+    @staticmethod
+    def _coordinates(entry: GeocodeCache) -> Optional[Dict[str, float]]:
+        if entry.latitude is None or entry.longitude is None:
+            return None
+        return {"lat": entry.latitude, "lng": entry.longitude}
+
+    async def ensure_work_order_coordinates(
+        self, work_order: WorkOrder
+    ) -> Optional[Dict[str, float]]:
+        """The work order's stored coordinates, geocoding and saving them once"""
+        if (
+            work_order.location_latitude is not None
+            and work_order.location_longitude is not None
+        ):
+            return {
+                "lat": work_order.location_latitude,
+                "lng": work_order.location_longitude,
+            }
+
+        lat_lng = await self.geocode(self.work_order_address(work_order))
+        if lat_lng:
+            work_order.location_latitude = lat_lng["lat"]
+            work_order.location_longitude = lat_lng["lng"]
+            await self.db.commit()
+        return lat_lng
+
+    async def ensure_vendor_coordinates(
+        self, vendor: Vendor
+    ) -> Optional[Dict[str, float]]:
+        if vendor.latitude is not None and vendor.longitude is not None:
+            return {"lat": vendor.latitude, "lng": vendor.longitude}
+
+        lat_lng = await self.geocode(vendor.address)
+        if lat_lng:
+            vendor.latitude = lat_lng["lat"]
+            vendor.longitude = lat_lng["lng"]
+            await self.db.commit()
+            vendor_index.add_vendors([vendor])
+        return lat_lng
@@ -1,7 +1,10 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional, Union
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.constants import (
     QUOTE_PRICE_WEIGHT,
@@ -13,43 +16,113 @@ from app.models.quote import Quote, QuoteStatus
 from app.models.work_order import WorkOrderStatus
 
 
+def parse_availability_date(value: Union[datetime, str, None]) -> Optional[datetime]:
+    """
+    Naive UTC datetime for Quote.availability_date from a datetime or an ISO
+    string (as parsers return it); None when it can't be read. asyncpg has no
+    bind processor for strings in DateTime columns, so this must run first.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 class QuoteService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_quote(self, quote_id: UUID) -> Optional[Quote]:
-        return self.db.query(Quote).filter(Quote.id == quote_id).first()
+    async def get_quote(self, quote_id: UUID) -> Optional[Quote]:
+        return await self.db.scalar(
+            select(Quote)
+            .options(joinedload(Quote.vendor), joinedload(Quote.work_order))
+            .where(Quote.id == quote_id)
+        )
 
-    def get_quotes_for_work_order(self, work_order_id: UUID) -> List[Quote]:
-        return (
-            self.db.query(Quote)
+    async def get_quotes_for_work_order(self, work_order_id: UUID) -> List[Quote]:
+        result = await self.db.execute(
+            select(Quote)
             .options(joinedload(Quote.vendor))
-            .filter(Quote.work_order_id == work_order_id)
+            .where(Quote.work_order_id == work_order_id)
             .order_by(Quote.composite_score.desc().nullslast())
-            .all()
         )
+        return list(result.scalars().all())
 
-    def create_quote(self, work_order_id: UUID, vendor_id: UUID, **quote_data) -> Quote:
+    async def create_quote(
+        self, work_order_id: UUID, vendor_id: UUID, **quote_data
+    ) -> Quote:
         quote = Quote(work_order_id=work_order_id, vendor_id=vendor_id, **quote_data)
 
         self.db.add(quote)
-        self.db.commit()
-        self.db.refresh(quote)
+        await self.db.commit()
+        await self.db.refresh(quote)
 
         return quote
 
-    def update_quote_with_response(
+    async def create_pending_quotes(self, work_order_id: UUID, vendors: List) -> int:
+        """
+        Add a PENDING quote for every vendor that doesn't have one on this work
+        order yet, in one INSERT. Returns the number of quotes created.
+        """
+        if not vendors:
+            return 0
+
+        stmt = (
+            insert(Quote)
+            .values(
+                [
+                    {
+                        "work_order_id": work_order_id,
+                        "vendor_id": vendor.id,
+                        "status": QuoteStatus.PENDING,
+                        "composite_score": vendor.composite_score,
+                    }
+                    for vendor in vendors
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["work_order_id", "vendor_id"])
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+
+        return result.rowcount
+
+    async def get_or_create_quote(self, work_order_id: UUID, vendor_id: UUID) -> Quote:
+        await self.db.execute(
+            insert(Quote)
+            .values(work_order_id=work_order_id, vendor_id=vendor_id)
+            .on_conflict_do_nothing(index_elements=["work_order_id", "vendor_id"])
+        )
+        await self.db.commit()
+
+        return await self.db.scalar(
+            select(Quote).where(
+                Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id
+            )
+        )
+
+    async def update_quote_with_response(
         self,
         quote_id: UUID,
         price: Optional[float],
-        availability_date: Optional[datetime],
+        availability_date: Union[datetime, str, None],
         quote_text: str,
+        estimated_duration_hours: Optional[float] = None,
     ) -> Quote:
-        quote = self.get_quote(quote_id)
+        availability_date = parse_availability_date(availability_date)
+        quote = await self.get_quote(quote_id)
         if quote:
             quote.price = price
             quote.availability_date = availability_date
             quote.quote_text = quote_text
+            if estimated_duration_hours is not None:
+                quote.estimated_duration_hours = estimated_duration_hours
             quote.status = QuoteStatus.RECEIVED
             quote.received_at = datetime.utcnow()
 
@@ -61,7 +134,7 @@ class QuoteService:
                     quote.vendor.composite_score or DEFAULT_VENDOR_SCORE
                 )
 
-            if availability_date and isinstance(availability_date, datetime):
+            if availability_date:
                 days_until_available = (availability_date - datetime.utcnow()).days
                 quote.availability_score = max(0, 100 - (days_until_available * 5))
 
@@ -76,29 +149,25 @@ class QuoteService:
             if scores:
                 quote.composite_score = sum(scores) / len(scores)
 
-            self.db.commit()
-            self.db.refresh(quote)
+            await self.db.commit()
+            await self.db.refresh(quote)
 
         return quote
 
-    def accept_quote(self, quote_id: UUID) -> Quote:
+    async def accept_quote(self, quote_id: UUID) -> Quote:
         """Accept a quote and update work order status"""
-        quote = self.get_quote(quote_id)
+        quote = await self.get_quote(quote_id)
         if quote:
             quote.status = QuoteStatus.ACCEPTED
             quote.work_order.status = WorkOrderStatus.DISPATCHED
 
-            other_quotes = (
-                self.db.query(Quote)
-                .filter(
-                    Quote.work_order_id == quote.work_order_id, Quote.id != quote_id
-                )
-                .all()
+            await self.db.execute(
+                update(Quote)
+                .where(Quote.work_order_id == quote.work_order_id, Quote.id != quote_id)
+                .values(status=QuoteStatus.REJECTED)
             )
-            for other_quote in other_quotes:
-                other_quote.status = QuoteStatus.REJECTED
 
-            self.db.commit()
-            self.db.refresh(quote)
+            await self.db.commit()
+            await self.db.refresh(quote)
 
         return quote
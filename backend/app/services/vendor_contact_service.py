@@ -1,10 +1,13 @@
 import asyncio
-from sqlalchemy.orm import Session
-from twilio.rest import Client as TwilioClient
-from sendgrid import SendGridAPIClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sendgrid.helpers.mail import Mail
+from typing import Optional
 
+from app.clients import ClientRegistry, get_clients
 from app.config import settings
+from app.database import AsyncSessionLocal
+from app.llm_metrics import with_llm_trace
 from app.constants import (
     EMAIL_FROM_ADDRESS,
     EMAIL_SUBJECT_PREFIX,
@@ -18,35 +21,22 @@ from app.services.ai_agent_service import AIAgentService
 from app.services.quote_service import QuoteService
 from app.services.communication_service import CommunicationService
 from uuid import UUID
-from sqlalchemy import any_
 
 
 class VendorContactService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, clients: Optional[ClientRegistry] = None):
         self.db = db
-        self.ai_service = AIAgentService()
+        self.clients = clients or get_clients()
+        self.ai_service = AIAgentService(self.clients.openai, db)
         self.quote_service = QuoteService(db)
         self.comm_service = CommunicationService(db)
 
-        self.twilio_client = None
-        self.sendgrid_client = None
-
-        if settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN:
-            try:
-                self.twilio_client = TwilioClient(
-                    settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN
-                )
-            except Exception as e:
-                print(f"⚠️  Twilio initialization failed: {e}")
-
-        if settings.SENDGRID_API_KEY:
-            try:
-                self.sendgrid_client = SendGridAPIClient(settings.SENDGRID_API_KEY)
-            except Exception as e:
-                print(f"⚠️  SendGrid initialization failed: {e}")
+        self.twilio_client = self.clients.twilio
+        self.sendgrid_client = self.clients.sendgrid
 
+    @with_llm_trace
     async def contact_vendor_for_quote(self, quote_id: str):
-        quote = self.db.query(Quote).filter(Quote.id == UUID(quote_id)).first()
+        quote = await self.quote_service.get_quote(UUID(quote_id))
         if not quote:
             print(f"❌ Quote {quote_id} not found")
             return False
@@ -97,7 +87,12 @@ class VendorContactService:
 
         if target_phone and self.twilio_client:
             call_success = await self._make_phone_call_unified(
-                work_order, vendor, work_order_data, quote.id, target_phone, is_demo
+                work_order,
+                vendor,
+                work_order_data,
+                quote.id,
+                target_phone,
+                is_demo,
             )
             if call_success:
                 success_count += 1
@@ -106,13 +101,13 @@ class VendorContactService:
         return success_count > 0
 
     async def contact_all_vendors_for_work_order(self, work_order: WorkOrder):
-        vendors = (
-            self.db.query(Vendor)
-            .filter(work_order.trade_type.value == any_(Vendor.trade_specialties))
+        result = await self.db.execute(
+            select(Vendor)
+            .where(Vendor.trade_specialties.contains([work_order.trade_type.value]))
             .order_by(Vendor.composite_score.desc())
             .limit(10)
-            .all()
         )
+        vendors = result.scalars().all()
 
         print(f"📞 Contacting {len(vendors)} vendors for work order {work_order.id}")
 
@@ -128,17 +123,30 @@ class VendorContactService:
 
         tasks = []
         for vendor in vendors:
-            task = self._contact_single_vendor(work_order, vendor, work_order_data)
+            task = self._contact_single_vendor_in_session(
+                work_order, vendor, work_order_data
+            )
             tasks.append(task)
 
         await asyncio.gather(*tasks, return_exceptions=True)
 
         print(f"✅ Finished contacting vendors for work order {work_order.id}")
 
+    async def _contact_single_vendor_in_session(
+        self, work_order: WorkOrder, vendor: Vendor, work_order_data: dict
+    ):
+        # An AsyncSession cannot run concurrent operations, so each fanned-out
+        # vendor gets its own session.
+        async with AsyncSessionLocal() as db:
+            service = VendorContactService(db, self.clients)
+            await service._contact_single_vendor(work_order, vendor, work_order_data)
+
+    @with_llm_trace
     async def _contact_single_vendor(
         self, work_order: WorkOrder, vendor: Vendor, work_order_data: dict
     ):
-        quote = self.quote_service.create_quote(
+        # Discovery usually created the pending quote already
+        quote = await self.quote_service.get_or_create_quote(
             work_order_id=work_order.id, vendor_id=vendor.id
         )
 
@@ -165,8 +173,11 @@ class VendorContactService:
         self, work_order: WorkOrder, vendor: Vendor, work_order_data: dict, quote_id
     ) -> bool:
         try:
-            message = await self.ai_service.generate_vendor_contact_message(
-                work_order_data, vendor.business_name, "email"
+            message = await self.ai_service.get_vendor_contact_message(
+                work_order_data,
+                vendor.business_name,
+                "email",
+                defer=self.ai_service.should_defer(work_order),
             )
 
             # Parse subject and body
@@ -186,7 +197,7 @@ class VendorContactService:
                     html_content=body.replace("\n", "<br>"),
                 )
 
-                response = self.sendgrid_client.send(mail)
+                response = self.clients.send_email(mail)
                 success = response.status_code in [200, 201, 202]
             else:
                 print(f"    📧 [SIMULATED] Email to {vendor.email}")
@@ -194,7 +205,7 @@ class VendorContactService:
                 success = True
 
             # Log communication
-            self.comm_service.log_communication(
+            await self.comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=vendor.id,
                 channel=CommunicationChannel.EMAIL,
@@ -218,8 +229,11 @@ class VendorContactService:
         self, work_order: WorkOrder, vendor: Vendor, work_order_data: dict, quote_id
     ) -> bool:
         try:
-            message = await self.ai_service.generate_vendor_contact_message(
-                work_order_data, vendor.business_name, "sms"
+            message = await self.ai_service.get_vendor_contact_message(
+                work_order_data,
+                vendor.business_name,
+                "sms",
+                defer=self.ai_service.should_defer(work_order),
             )
 
             if self.twilio_client and settings.TWILIO_PHONE_NUMBER:
@@ -235,7 +249,7 @@ class VendorContactService:
                 external_id = None
 
             # Log communication
-            self.comm_service.log_communication(
+            await self.comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=vendor.id,
                 channel=CommunicationChannel.SMS,
@@ -259,14 +273,17 @@ class VendorContactService:
         self, work_order: WorkOrder, vendor: Vendor, work_order_data: dict, quote_id
     ) -> bool:
         try:
-            script = await self.ai_service.generate_vendor_contact_message(
-                work_order_data, vendor.business_name, "phone"
+            script = await self.ai_service.get_vendor_contact_message(
+                work_order_data,
+                vendor.business_name,
+                "phone",
+                defer=self.ai_service.should_defer(work_order),
             )
 
             print(f"    📞 [SIMULATED] Phone call to {vendor.phone}")
             print(f"       Script: {script}")
 
-            self.comm_service.log_communication(
+            await self.comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=vendor.id,
                 channel=CommunicationChannel.PHONE,
@@ -283,26 +300,27 @@ class VendorContactService:
             print(f"    ✗ Phone call failed for {vendor.business_name}: {e}")
             return False
 
+    @with_llm_trace
     async def process_vendor_response(
         self, vendor_id: str, work_order_id: str, response_text: str, channel: str
     ):
         parsed_response = await self.ai_service.parse_vendor_response(response_text)
 
-        quote = (
-            self.db.query(Quote)
-            .filter(Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id)
-            .first()
+        quote = await self.db.scalar(
+            select(Quote).where(
+                Quote.work_order_id == work_order_id, Quote.vendor_id == vendor_id
+            )
         )
 
         if quote:
-            self.quote_service.update_quote_with_response(
+            await self.quote_service.update_quote_with_response(
                 quote.id,
                 price=parsed_response.get("price"),
                 availability_date=parsed_response.get("availability_date"),
                 quote_text=response_text,
             )
 
-            self.comm_service.log_communication(
+            await self.comm_service.log_communication(
                 work_order_id=work_order_id,
                 vendor_id=vendor_id,
                 channel=CommunicationChannel(channel),
@@ -324,8 +342,11 @@ class VendorContactService:
         is_demo: bool,
     ) -> bool:
         try:
-            message = await self.ai_service.generate_vendor_contact_message(
-                work_order_data, vendor.business_name, "email"
+            message = await self.ai_service.get_vendor_contact_message(
+                work_order_data,
+                vendor.business_name,
+                "email",
+                defer=self.ai_service.should_defer(work_order),
             )
 
             # Parse subject and body
@@ -350,7 +371,7 @@ class VendorContactService:
                     html_content=body.replace("\n", "<br>"),
                 )
 
-                response = self.sendgrid_client.send(mail)
+                response = self.clients.send_email(mail)
                 success = response.status_code in [200, 201, 202]
                 print(
                     f"    ✅ Email sent via SendGrid (status: {response.status_code})"
@@ -361,7 +382,7 @@ class VendorContactService:
                 success = True
 
             # Log communication
-            self.comm_service.log_communication(
+            await self.comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=vendor.id,
                 channel=CommunicationChannel.EMAIL,
@@ -393,8 +414,11 @@ class VendorContactService:
         is_demo: bool,
     ) -> bool:
         try:
-            message = await self.ai_service.generate_vendor_contact_message(
-                work_order_data, vendor.business_name, "sms"
+            message = await self.ai_service.get_vendor_contact_message(
+                work_order_data,
+                vendor.business_name,
+                "sms",
+                defer=self.ai_service.should_defer(work_order),
             )
 
             if is_demo:
@@ -410,7 +434,7 @@ class VendorContactService:
                 print(f"    📱 [SIMULATED] SMS to {target_phone}")
                 success = True
 
-            self.comm_service.log_communication(
+            await self.comm_service.log_communication(
                 work_order_id=work_order.id,
                 vendor_id=vendor.id,
                 channel=CommunicationChannel.SMS,
@@ -441,8 +465,11 @@ class VendorContactService:
         is_demo: bool,
     ) -> bool:
         try:
-            call_script = await self.ai_service.generate_vendor_contact_message(
-                work_order_data, vendor.business_name, "phone"
+            call_script = await self.ai_service.get_vendor_contact_message(
+                work_order_data,
+                vendor.business_name,
+                "phone",
+                defer=self.ai_service.should_defer(work_order),
             )
 
             if self.twilio_client and settings.TWILIO_PHONE_NUMBER:
@@ -463,7 +490,7 @@ class VendorContactService:
                 success = call.status != "failed"
                 print(f"    ✅ Call initiated via Twilio (SID: {call.sid})")
 
-                self.comm_service.log_communication(
+                await self.comm_service.log_communication(
                     work_order_id=work_order.id,
                     vendor_id=vendor.id,
                     channel=CommunicationChannel.PHONE,
@@ -484,7 +511,7 @@ class VendorContactService:
                 print(f"       Script: {call_script[:150]}...")
                 success = True
 
-                self.comm_service.log_communication(
+                await self.comm_service.log_communication(
                     work_order_id=work_order.id,
                     vendor_id=vendor.id,
                     channel=CommunicationChannel.PHONE,
@@ -1,57 +1,107 @@
-import googlemaps
-import requests
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
-import json
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Callable, Dict, List, Optional
+
+from app.clients import ClientRegistry, get_clients
 from app.config import settings
 from app.constants import (
+    METERS_PER_MILE,
+    PLACE_DETAILS_FIELDS,
     VENDOR_SEARCH_LIMIT,
     TRADE_TYPE_SEARCH_QUERIES,
-    AI_MODEL,
-    AI_TEMPERATURE_GENERATION,
+    YELP_SOURCE_FIELDS,
 )
+from app.geo import haversine_miles, ranking_scores, within_reach
 from app.models.work_order import WorkOrder
 from app.models.vendor import Vendor
+from app.services.ai_agent_service import AIAgentService
+from app.services.geocoding_service import GeocodingService
 from app.services.vendor_service import VendorService
-from openai import AsyncOpenAI
-from app.models.quote import Quote, QuoteStatus
+from app.services.quote_service import QuoteService
+from app.vendor_index import vendor_index
+
+# Top-level keys of a details result kept in Vendor.source_data
+PLACE_SOURCE_KEYS = {field.split("/")[0] for field in PLACE_DETAILS_FIELDS}
+
+# The default executor has as few as 5 threads on small hosts, which would cap
+# discovery fan-out below the configured limit
+_api_executor = ThreadPoolExecutor(
+    max_workers=settings.DISCOVERY_MAX_CONCURRENCY, thread_name_prefix="discovery"
+)
 
 
 class VendorDiscoveryService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, clients: Optional[ClientRegistry] = None):
         self.db = db
         self.vendor_service = VendorService(db)
-        self.gmaps = (
-            googlemaps.Client(key=settings.GOOGLE_PLACES_API_KEY)
-            if settings.GOOGLE_PLACES_API_KEY
-            else None
-        )
-        self.openai_client = (
-            AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            if settings.OPENAI_API_KEY
-            else None
-        )
+        self.quote_service = QuoteService(db)
+        self.clients = clients or get_clients()
+        self.gmaps = self.clients.google_maps
+        self.openai_client = self.clients.openai
+        self.ai_service = AIAgentService(self.openai_client, db)
+        self.geocoding_service = GeocodingService(db, self.clients)
         self.search_radius_meters = 20000
+        # googlemaps and requests are blocking clients: their calls run in
+        # worker threads, at most this many at a time per discovery run
+        self._api_slots = asyncio.Semaphore(settings.DISCOVERY_MAX_CONCURRENCY)
+
+    async def _call_api(self, func: Callable, *args, **kwargs):
+        """Run a blocking API client call off the event loop"""
+        async with self._api_slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                _api_executor, functools.partial(func, *args, **kwargs)
+            )
 
     async def discover_vendors_for_work_order(
         self, work_order: WorkOrder
     ) -> List[Vendor]:
         vendors = []
+        location = GeocodingService.work_order_address(work_order)
 
-        search_queries = await self._generate_ai_search_queries(work_order)
-        location = f"{work_order.location_address}, {work_order.location_city or ''}, {work_order.location_state or ''}"
-
-        print(f"🤖 AI-generated search queries: {search_queries}")
-        print(f"🔍 Searching within 30-min drive (~20km) of '{location}'")
+        try:
+            # Stored on the work order, so later runs skip geocoding
+            lat_lng = await self.geocoding_service.ensure_work_order_coordinates(
+                work_order
+            )
+        except Exception as e:
+            print(f"⚠️  Could not geocode work order {work_order.id}: {e}")
+            lat_lng = None
+
+        if lat_lng:
+            vendors = await self._find_local_vendors(work_order, lat_lng)
+
+        if vendors:
+            print(f"🗺️  Using {len(vendors)} vendors from the local vendor index")
+        elif self.gmaps and not lat_lng:
+            # Places searches are centred on the coordinates; without them
+            # fall back as for any other failed search
+            print(f"❌ Vendor discovery error: no coordinates for '{location}'")
+            vendors = await self._create_mock_vendors(work_order)
+        elif self.gmaps:
+            search_queries = await self._generate_ai_search_queries(work_order)
+            print(f"🤖 AI-generated search queries: {search_queries}")
+            print(f"🔍 Searching within 30-min drive (~20km) of '{location}'")
 
-        if self.gmaps:
             try:
+                started = time.perf_counter()
                 all_places = []
-                for query in search_queries[:2]:
-                    places_results = await self._search_google_places(
-                        query=query, location=location, radius=self.search_radius_meters
+                search_results = await asyncio.gather(
+                    *(
+                        self._search_google_places(
+                            query=query,
+                            lat_lng=lat_lng,
+                            radius=self.search_radius_meters,
+                        )
+                        for query in search_queries[:2]
                     )
+                )
+                for places_results in search_results:
                     all_places.extend(places_results)
 
                 seen_place_ids = set()
@@ -62,49 +112,137 @@ class VendorDiscoveryService:
                         seen_place_ids.add(place_id)
                         unique_places.append(place)
 
-                for place in unique_places[:VENDOR_SEARCH_LIMIT]:
-                    vendor_data = await self._process_and_score_vendor(
-                        place, work_order
+                places = unique_places[:VENDOR_SEARCH_LIMIT]
+                fresh_vendors = (
+                    await self.vendor_service.get_fresh_vendors_by_place_ids(
+                        [place["place_id"] for place in places],
+                        datetime.utcnow()
+                        - timedelta(days=settings.PLACE_DETAILS_TTL_DAYS),
+                    )
+                )
+
+                # Details + Yelp enrichment for every new or stale place at
+                # once, bounded by the API concurrency limit
+                scored = await asyncio.gather(
+                    *(
+                        self._process_and_score_vendor(place, work_order)
+                        for place in places
+                        if place["place_id"] not in fresh_vendors
+                    )
+                )
+                candidates = [
+                    self._cached_vendor_data(vendor, work_order)
+                    for vendor in fresh_vendors.values()
+                ]
+                candidates.extend(vendor_data for vendor_data in scored if vendor_data)
+                print(
+                    f"⏱️  Looked up {len(candidates)} vendors "
+                    f"({len(fresh_vendors)} with fresh details) in "
+                    f"{time.perf_counter() - started:.1f}s"
+                )
+
+                vendors = await self.vendor_service.bulk_upsert_vendors(candidates)
+                for vendor in vendors:
+                    print(
+                        f"  ✓ {vendor.business_name}: Score {vendor.composite_score:.1f}/10 (G:{vendor.google_rating or 0}, Y:{vendor.yelp_rating or 0})"
                     )
-                    if vendor_data:
-                        vendor = self.vendor_service.create_or_update_vendor(
-                            vendor_data
-                        )
-                        vendors.append(vendor)
-                        print(
-                            f"  ✓ {vendor.business_name}: Score {vendor.composite_score:.1f}/10 (G:{vendor.google_rating or 0}, Y:{vendor.yelp_rating or 0})"
-                        )
 
             except Exception as e:
                 print(f"❌ Vendor discovery error: {e}")
-                vendors = self._create_mock_vendors(work_order)
+                vendors = await self._create_mock_vendors(work_order)
         else:
             print("⚠️  No API keys configured, using mock vendors")
-            vendors = self._create_mock_vendors(work_order)
+            vendors = await self._create_mock_vendors(work_order)
+
+        if lat_lng:
+            vendors = self._rank_by_distance(vendors, lat_lng)
+        else:
+            vendors.sort(key=lambda v: v.composite_score or 0, reverse=True)
 
-        vendors.sort(key=lambda v: v.composite_score or 0, reverse=True)
+        await self.quote_service.create_pending_quotes(work_order.id, vendors)
 
-        for vendor in vendors:
-            existing_quote = (
-                self.db.query(Quote)
-                .filter(
-                    Quote.work_order_id == work_order.id, Quote.vendor_id == vendor.id
-                )
-                .first()
+        return vendors
+
+    async def _find_local_vendors(
+        self, work_order: WorkOrder, lat_lng: Dict[str, float]
+    ) -> List[Vendor]:
+        """
+        Best scored known vendors for the trade within the search radius, or
+        [] when there are too few for local results to stand on their own.
+        """
+        if not settings.VENDOR_INDEX_ENABLED:
+            return []
+
+        try:
+            if vendor_index.is_stale():
+                await vendor_index.refresh(self.db)
+            matches = vendor_index.nearby(
+                lat_lng["lat"],
+                lat_lng["lng"],
+                radius_miles=self.search_radius_meters / METERS_PER_MILE,
+                trade=work_order.trade_type.value,
+                limit=settings.VENDOR_INDEX_MAX_RESULTS,
             )
-            if not existing_quote:
-                quote = Quote(
-                    work_order_id=work_order.id,
-                    vendor_id=vendor.id,
-                    status=QuoteStatus.PENDING,
-                    composite_score=vendor.composite_score,
-                )
-                self.db.add(quote)
+        except Exception as e:
+            print(f"⚠️  Vendor index lookup failed: {e}")
+            return []
 
-        self.db.commit()
+        if len(matches) < settings.VENDOR_INDEX_MIN_RESULTS:
+            print(f"🗺️  Only {len(matches)} known vendors nearby, searching externally")
+            return []
+
+        vendors = await self.vendor_service.get_vendors_by_ids(
+            [vendor_id for vendor_id, _ in matches]
+        )
+        if len(vendors) < len(matches):
+            # Deleted since the last reconcile
+            found = {vendor.id for vendor in vendors}
+            vendor_index.drop_missing(
+                vendor_id for vendor_id, _ in matches if vendor_id not in found
+            )
+            if len(vendors) < settings.VENDOR_INDEX_MIN_RESULTS:
+                return []
 
+        vendor_index.local_hits += 1
         return vendors
 
+    def _rank_by_distance(
+        self, vendors: List[Vendor], lat_lng: Dict[str, float]
+    ) -> List[Vendor]:
+        """
+        Drop vendors out of range of the job (search radius or their own
+        service_radius_miles) and order the rest by score less a distance
+        penalty. Vendors without coordinates are kept, ranked on score alone.
+
+        Coordinates, scores and service radii come from the vendor index
+        columns: the candidates were just indexed by bulk_upsert_vendors or
+        came out of the index, and reading them off the ORM rows costs more
+        than the ranking itself. Rows the index doesn't hold are read directly.
+        """
+        indexed, lats, lngs, scores, service_radii = vendor_index.columns_for(
+            [vendor.id for vendor in vendors]
+        )
+        for i in np.flatnonzero(~indexed):
+            vendor = vendors[i]
+            scores[i] = vendor.composite_score or 0.0
+            if vendor.latitude is not None and vendor.longitude is not None:
+                lats[i], lngs[i] = vendor.latitude, vendor.longitude
+                if vendor.service_radius_miles is not None:
+                    service_radii[i] = vendor.service_radius_miles
+
+        located = ~np.isnan(lats)
+        distances = haversine_miles(lat_lng["lat"], lat_lng["lng"], lats, lngs)
+        in_reach = within_reach(
+            distances, self.search_radius_meters / METERS_PER_MILE, service_radii
+        )
+        dropped = int((located & ~in_reach).sum())
+        if dropped:
+            print(f"📏 Dropped {dropped} vendors out of range of the job")
+
+        kept = np.flatnonzero(~located | in_reach)
+        ranks = np.where(located, ranking_scores(scores, distances), scores)[kept]
+        return [vendors[i] for i in kept[np.argsort(-ranks, kind="stable")]]
+
     async def _generate_ai_search_queries(self, work_order: WorkOrder) -> List[str]:
         """
         Use AI to generate optimized search queries based on work order details.
@@ -115,48 +253,12 @@ class VendorDiscoveryService:
                 TRADE_TYPE_SEARCH_QUERIES.get(work_order.trade_type.value, "contractor")
             ]
 
-        try:
-            prompt = f"""Generate 3 optimized Google search queries to find the best service providers for this work order:
-
-Work Order Details:
-- Trade Type: {work_order.trade_type.value}
-- Title: {work_order.title}
-- Description: {work_order.description}
-- Urgency: {work_order.urgency}
-- Work Type: {work_order.work_type.value if work_order.work_type else "reactive"}
-
-Generate queries that will find:
-1. Highly rated professionals specializing in this exact service
-2. Emergency/urgent providers if needed
-3. Licensed and insured businesses
-
-Return a JSON array of 3 search query strings.
-Example: ["emergency plumber licensed insured", "24/7 plumbing repair service", "licensed plumber burst pipe repair"]
-"""
-
-            response = await self.openai_client.chat.completions.create(
-                model=AI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at generating search queries to find the best service providers. Return ONLY a JSON array of strings.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=AI_TEMPERATURE_GENERATION,
-                max_tokens=200,
-            )
-
-            result = json.loads(response.choices[0].message.content)
-            queries = result.get("queries", result.get("search_queries", []))
-
-            if queries and isinstance(queries, list):
-                print(f"✨ AI generated {len(queries)} search queries")
-                return queries
-
-        except Exception as e:
-            print(f"⚠️  AI query generation failed: {e}")
+        queries = await self.ai_service.generate_vendor_search_queries(
+            work_order, defer=self.ai_service.should_defer(work_order)
+        )
+        if queries:
+            print(f"✨ AI generated {len(queries)} search queries")
+            return queries
 
         base_query = TRADE_TYPE_SEARCH_QUERIES.get(
             work_order.trade_type.value, "contractor"
@@ -168,21 +270,16 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
         return TRADE_TYPE_SEARCH_QUERIES.get(trade_type, "contractor")
 
     async def _search_google_places(
-        self, query: str, location: str, radius: int
+        self, query: str, lat_lng: Dict[str, float], radius: int
     ) -> List[Dict[str, Any]]:
         """Search Google Places API"""
         try:
-            # First, geocode the location
-            geocode_result = self.gmaps.geocode(location)
-            if not geocode_result:
-                print(f"⚠️  Could not geocode location: {location}")
-                return []
-
-            lat_lng = geocode_result[0]["geometry"]["location"]
-
-            # Search for places
-            places_result = self.gmaps.places_nearby(
-                location=lat_lng, keyword=query, radius=radius, rank_by=None
+            places_result = await self._call_api(
+                self.gmaps.places_nearby,
+                location=lat_lng,
+                keyword=query,
+                radius=radius,
+                rank_by=None,
             )
 
             return places_result.get("results", [])
@@ -200,13 +297,17 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
         """
         place_id = place.get("place_id")
 
+        details_fetched_at = None
+        details = place
         if self.gmaps:
             try:
-                details = self.gmaps.place(place_id)["result"]
+                response = await self._call_api(
+                    self.gmaps.place, place_id, fields=PLACE_DETAILS_FIELDS
+                )
+                details = response["result"]
+                details_fetched_at = datetime.utcnow()
             except Exception:
-                details = place
-        else:
-            details = place
+                pass
 
         business_name = details.get("name", "Unknown Business")
 
@@ -241,9 +342,15 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
         elif yelp_price:
             price_display = yelp_price
 
-        enriched_details = details.copy()
+        enriched_details = {
+            key: value for key, value in details.items() if key in PLACE_SOURCE_KEYS
+        }
         enriched_details["price_display"] = price_display
-        enriched_details["yelp_data"] = yelp_data
+        enriched_details["yelp_data"] = (
+            {key: yelp_data.get(key) for key in YELP_SOURCE_FIELDS}
+            if yelp_data
+            else None
+        )
 
         vendor_data = {
             "business_name": business_name,
@@ -259,13 +366,31 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
             "yelp_rating": yelp_rating,
             "yelp_review_count": yelp_review_count,
             "composite_score": quality_score,
+            "price_display": price_display,
             "google_place_id": place_id,
             "yelp_business_id": yelp_data.get("id") if yelp_data else None,
             "source_data": enriched_details,
+            "details_fetched_at": details_fetched_at,
         }
 
         return vendor_data
 
+    def _cached_vendor_data(
+        self, vendor: Vendor, work_order: WorkOrder
+    ) -> Dict[str, Any]:
+        """
+        Upsert candidate for a vendor whose details are still fresh. Only the
+        match keys and the work order's trade are sent, so the stored details,
+        Yelp data and scores are left as they are; the trade is added to the
+        stored trade_specialties (see bulk_upsert_vendors).
+        """
+        return {
+            "business_name": vendor.business_name,
+            "phone": vendor.phone,
+            "google_place_id": vendor.google_place_id,
+            "trade_specialties": [work_order.trade_type.value],
+        }
+
     def _calculate_quality_score(
         self,
         google_rating: float,
@@ -336,7 +461,8 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
             headers = {"Authorization": f"Bearer {settings.YELP_API_KEY}"}
             params = {"term": business_name, "location": address or "", "limit": 1}
 
-            response = requests.get(
+            response = await self._call_api(
+                self.clients.http.get,
                 "https://api.yelp.com/v3/businesses/search",
                 headers=headers,
                 params=params,
@@ -354,7 +480,7 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
 
         return None
 
-    def _create_mock_vendors(self, work_order: WorkOrder) -> List[Vendor]:
+    async def _create_mock_vendors(self, work_order: WorkOrder) -> List[Vendor]:
         """Create mock vendors for testing when API is unavailable (scored 0-10)"""
         trade = work_order.trade_type.value
         mock_vendors_data = [
@@ -396,9 +522,4 @@ Example: ["emergency plumber licensed insured", "24/7 plumbing repair service",
             },
         ]
 
-        vendors = []
-        for vendor_data in mock_vendors_data:
-            vendor = self.vendor_service.create_or_update_vendor(vendor_data)
-            vendors.append(vendor)
-
-        return vendors
+        return await self.vendor_service.bulk_upsert_vendors(mock_vendors_data)
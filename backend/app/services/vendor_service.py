@@ -1,37 +1,99 @@
-from sqlalchemy.orm import Session
-from typing import List, Tuple, Optional
+import uuid
+from datetime import datetime
+from sqlalchemy import literal_column, select, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Tuple, Optional
 from uuid import UUID
 
+from app.constants import VENDOR_UPSERT_ATTEMPTS
 from app.models.vendor import Vendor
+from app.pagination import fetch_keyset_page, estimate_count
+from app.utils import normalize_phone
+from app.vendor_index import vendor_index
+
+# A vendor found for another trade keeps the trades it was already listed for
+MERGED_TRADE_SPECIALTIES = literal_column(
+    "ARRAY(SELECT DISTINCT trade FROM unnest(array_cat("
+    "vendors.trade_specialties, excluded.trade_specialties)) AS trade "
+    "ORDER BY trade)"
+)
 
 
 class VendorService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_vendor(self, vendor_id: UUID) -> Optional[Vendor]:
-        return self.db.query(Vendor).filter(Vendor.id == vendor_id).first()
+    async def get_vendor(self, vendor_id: UUID) -> Optional[Vendor]:
+        return await self.db.scalar(select(Vendor).where(Vendor.id == vendor_id))
 
-    def list_vendors(
-        self, skip: int = 0, limit: int = 100, trade_type: Optional[str] = None
-    ) -> Tuple[List[Vendor], int]:
-        query = self.db.query(Vendor)
+    def _vendor_query(self, trade_type: Optional[str] = None):
+        query = select(Vendor)
 
         if trade_type:
-            query = query.filter(Vendor.trade_specialties.contains([trade_type]))
+            query = query.where(Vendor.trade_specialties.contains([trade_type]))
+
+        return query
+
+    async def list_vendors(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        trade_type: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[Vendor], Optional[int]]:
+        query = self._vendor_query(trade_type)
+
+        total = None
+        if include_total:
+            total = await self.db.scalar(
+                select(func.count()).select_from(query.subquery())
+            )
+        result = await self.db.execute(query.offset(skip).limit(limit))
+
+        return list(result.scalars().all()), total
+
+    async def list_vendors_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        trade_type: Optional[str] = None,
+    ) -> Tuple[List[Vendor], Optional[str]]:
+        """Keyset page of vendors, newest first"""
+        return await fetch_keyset_page(
+            self.db, self._vendor_query(trade_type), Vendor, limit, cursor
+        )
 
-        total = query.count()
-        vendors = query.offset(skip).limit(limit).all()
+    async def estimate_vendor_count(self, trade_type: Optional[str] = None) -> int:
+        return await estimate_count(self.db, self._vendor_query(trade_type), Vendor)
 
-        return vendors, total
+    async def get_vendors_by_ids(self, vendor_ids: List[UUID]) -> List[Vendor]:
+        if not vendor_ids:
+            return []
+        result = await self.db.scalars(select(Vendor).where(Vendor.id.in_(vendor_ids)))
+        return list(result.all())
 
-    def create_or_update_vendor(self, vendor_data: dict) -> Vendor:
+    async def get_fresh_vendors_by_place_ids(
+        self, place_ids: List[str], fetched_after: datetime
+    ) -> Dict[str, Vendor]:
+        """Vendors with Google details fetched after ``fetched_after``, by place id"""
+        if not place_ids:
+            return {}
+        result = await self.db.scalars(
+            select(Vendor).where(
+                Vendor.google_place_id.in_(place_ids),
+                Vendor.details_fetched_at > fetched_after,
+            )
+        )
+        return {vendor.google_place_id: vendor for vendor in result.all()}
+
+    async def create_or_update_vendor(self, vendor_data: dict) -> Vendor:
         existing = None
-        if vendor_data.get("phone"):
-            existing = (
-                self.db.query(Vendor)
-                .filter(Vendor.phone == vendor_data["phone"])
-                .first()
+        phone_normalized = normalize_phone(vendor_data.get("phone"))
+        if phone_normalized:
+            existing = await self.db.scalar(
+                select(Vendor).where(Vendor.phone_normalized == phone_normalized)
             )
 
         if existing:
@@ -43,6 +105,143 @@ class VendorService:
             vendor = Vendor(**vendor_data)
             self.db.add(vendor)
 
-        self.db.commit()
-        self.db.refresh(vendor)
+        await self.db.commit()
+        await self.db.refresh(vendor)
+        vendor_index.add_vendors([vendor])
         return vendor
+
+    async def bulk_upsert_vendors(self, vendors_data: List[dict]) -> List[Vendor]:
+        """
+        Create or update a batch of vendors with one INSERT ... ON CONFLICT DO
+        UPDATE and return the persisted rows. Candidates match existing vendors
+        by google_place_id first, then by normalized phone. New vendors conflict
+        on those unique keys, so a concurrent insert of the same place or phone
+        turns into an update instead of a unique violation. Updated vendors get
+        the union of their stored and incoming trade_specialties.
+        """
+        if not vendors_data:
+            return []
+
+        for attempt in range(1, VENDOR_UPSERT_ATTEMPTS + 1):
+            try:
+                async with self.db.begin_nested():
+                    vendors = await self._upsert_vendors(vendors_data)
+                break
+            except IntegrityError as e:
+                # A concurrent discovery claimed a key other than the one a row
+                # conflicts on (e.g. our new place's phone). Only the savepoint
+                # rolls back, so the caller's pending work and loaded objects
+                # survive; on retry the lookup resolves the row. The driver
+                # error's detail names the conflicting key.
+                print(
+                    f"⚠️  Vendor upsert conflict (attempt {attempt}/"
+                    f"{VENDOR_UPSERT_ATTEMPTS}): {e.orig}"
+                )
+                if attempt == VENDOR_UPSERT_ATTEMPTS:
+                    raise
+        await self.db.commit()
+
+        vendor_index.add_vendors(vendors)
+        return vendors
+
+    async def _upsert_vendors(self, vendors_data: List[dict]) -> List[Vendor]:
+        rows = []
+        for vendor_data in vendors_data:
+            row = dict(vendor_data)
+            row["phone_normalized"] = normalize_phone(row.get("phone"))
+            rows.append(row)
+
+        place_ids = {
+            row["google_place_id"] for row in rows if row.get("google_place_id")
+        }
+        phones = {row["phone_normalized"] for row in rows if row["phone_normalized"]}
+
+        existing_ids = set()
+        place_of = {}
+        by_place = {}
+        by_phone = {}
+        result = await self.db.execute(
+            select(Vendor.id, Vendor.google_place_id, Vendor.phone_normalized).where(
+                or_(
+                    Vendor.google_place_id.in_(place_ids),
+                    Vendor.phone_normalized.in_(phones),
+                )
+            )
+        )
+        for vendor_id, place_id, phone in result:
+            existing_ids.add(vendor_id)
+            place_of[vendor_id] = place_id
+            if place_id:
+                by_place[place_id] = vendor_id
+            if phone:
+                by_phone[phone] = vendor_id
+
+        resolved = {}
+        for row in rows:
+            place_id = row.get("google_place_id")
+            phone = row["phone_normalized"]
+
+            vendor_id = by_place.get(place_id) if place_id else None
+            if vendor_id is None and phone in by_phone:
+                match = by_phone[phone]
+                # Only adopt a phone match that isn't another place's listing
+                if not place_id or not place_of.get(match):
+                    vendor_id = match
+            if vendor_id is None:
+                vendor_id = uuid.uuid4()
+
+            if place_id:
+                place_of[vendor_id] = place_id
+                by_place[place_id] = vendor_id
+            if phone and by_phone.setdefault(phone, vendor_id) != vendor_id:
+                # Shared line (e.g. a chain's call centre) already owns this key
+                row["phone_normalized"] = None
+
+            row["id"] = vendor_id
+            # Later candidates win, as with repeated create_or_update_vendor calls
+            resolved[vendor_id] = row
+
+        # Rows sharing a column set and conflict target go in one statement; a
+        # discovery batch is normally one or two groups. Sorting by id keeps
+        # lock order consistent.
+        groups = {}
+        for row in sorted(resolved.values(), key=lambda r: str(r["id"])):
+            groups.setdefault(
+                (frozenset(row), self._conflict_key(row, existing_ids)), []
+            ).append(row)
+
+        vendors = []
+        for (columns, conflict_key), group in groups.items():
+            stmt = insert(Vendor).values(group)
+            update_columns = {
+                column: stmt.excluded[column]
+                for column in columns
+                if column not in ("id", "created_at")
+            }
+            if "trade_specialties" in update_columns:
+                update_columns["trade_specialties"] = MERGED_TRADE_SPECIALTIES
+            update_columns["updated_at"] = datetime.utcnow()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[conflict_key], set_=update_columns
+            ).returning(Vendor)
+
+            result = await self.db.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
+            vendors.extend(result.all())
+
+        return vendors
+
+    @staticmethod
+    def _conflict_key(row: dict, existing_ids: set) -> str:
+        """
+        Rows resolved to an existing vendor update it by id. New rows conflict
+        on the unique key another discovery could insert concurrently.
+        """
+        if row["id"] in existing_ids:
+            return "id"
+        if row.get("google_place_id"):
+            return "google_place_id"
+        if row["phone_normalized"]:
+            return "phone_normalized"
+        return "id"
@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
-from typing import List, Tuple, Dict, Any
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Tuple, Dict, Any, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -13,6 +14,7 @@ from app.models.work_order import (
     Category,
     Recurrence,
 )
+from app.pagination import fetch_keyset_page, estimate_count
 from app.schemas.work_order import WorkOrderCreate
 from app.services.vendor_discovery_service import VendorDiscoveryService
 from app.services.vendor_contact_service import VendorContactService
@@ -20,12 +22,47 @@ from app.utils import safe_enum
 
 
 class WorkOrderService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_work_order(
+    async def create_work_order(
         self, work_order_data: WorkOrderCreate, parsed_data: Dict[str, Any]
     ) -> WorkOrder:
+        work_order = WorkOrder(
+            **self._parsed_fields(work_order_data, parsed_data),
+            status=WorkOrderStatus.SUBMITTED,
+        )
+
+        self.db.add(work_order)
+        await self.db.commit()
+        await self.db.refresh(work_order)
+
+        return work_order
+
+    async def update_parsed_fields(
+        self,
+        work_order_id: UUID,
+        work_order_data: WorkOrderCreate,
+        parsed_data: Dict[str, Any],
+    ) -> Optional[WorkOrder]:
+        """
+        Fill in a work order created from a partial parse. Status is left alone
+        since discovery may already be moving it along.
+        """
+        work_order = await self.get_work_order(work_order_id)
+        if not work_order:
+            return None
+
+        for field, value in self._parsed_fields(work_order_data, parsed_data).items():
+            setattr(work_order, field, value)
+        work_order.updated_at = datetime.utcnow()
+        await self.db.commit()
+        await self.db.refresh(work_order)
+        return work_order
+
+    def _parsed_fields(
+        self, work_order_data: WorkOrderCreate, parsed_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
         trade_type = safe_enum(
             TradeType, parsed_data.get("trade_type"), TradeType(DEFAULT_TRADE_TYPE)
         )
@@ -50,7 +87,7 @@ class WorkOrderService:
             except ValueError:
                 due_date = None
 
-        work_order = WorkOrder(
+        return dict(
             title=parsed_data.get("title", "Work Order"),
             description=parsed_data.get("description", work_order_data.raw_input),
             trade_type=trade_type,
@@ -62,7 +99,6 @@ class WorkOrderService:
             location_country=parsed_data.get("location_country", "United States"),
             asset_name=parsed_data.get("asset_name"),
             asset_type=parsed_data.get("asset_type"),
-            status=WorkOrderStatus.SUBMITTED,
             urgency=parsed_data.get("urgency", DEFAULT_URGENCY),
             priority=priority,
             work_type=work_type,
@@ -80,47 +116,57 @@ class WorkOrderService:
             ai_processing_log=parsed_data,
         )
 
-        self.db.add(work_order)
-        self.db.commit()
-        self.db.refresh(work_order)
-
-        return work_order
-
-    def get_work_order(self, work_order_id: UUID) -> WorkOrder:
+    async def get_work_order(self, work_order_id: UUID) -> WorkOrder:
         """Get a work order by ID"""
-        return self.db.query(WorkOrder).filter(WorkOrder.id == work_order_id).first()
+        return await self.db.scalar(
+            select(WorkOrder).where(WorkOrder.id == work_order_id)
+        )
 
-    def list_work_orders(
-        self, skip: int = 0, limit: int = 100
-    ) -> Tuple[List[WorkOrder], int]:
+    async def list_work_orders(
+        self, skip: int = 0, limit: int = 100, include_total: bool = True
+    ) -> Tuple[List[WorkOrder], Optional[int]]:
         """List all work orders with pagination"""
-        total = self.db.query(WorkOrder).count()
-        work_orders = (
-            self.db.query(WorkOrder)
+        total = None
+        if include_total:
+            total = await self.db.scalar(select(func.count()).select_from(WorkOrder))
+        result = await self.db.execute(
+            select(WorkOrder)
             .order_by(WorkOrder.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
-        return work_orders, total
+        return list(result.scalars().all()), total
+
+    async def list_work_orders_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        """Keyset page of work orders, newest first"""
+        return await fetch_keyset_page(
+            self.db, select(WorkOrder), WorkOrder, limit, cursor
+        )
 
-    def update_status(self, work_order_id: UUID, status: WorkOrderStatus) -> WorkOrder:
+    async def estimate_work_order_count(self) -> int:
+        return await estimate_count(self.db, select(WorkOrder), WorkOrder)
+
+    async def update_status(
+        self, work_order_id: UUID, status: WorkOrderStatus
+    ) -> WorkOrder:
         """Update work order status"""
-        work_order = self.get_work_order(work_order_id)
+        work_order = await self.get_work_order(work_order_id)
         if work_order:
             work_order.status = status
             work_order.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(work_order)
+            await self.db.commit()
+            await self.db.refresh(work_order)
         return work_order
 
     async def start_vendor_discovery_workflow(self, work_order_id: UUID):
         """Start the vendor discovery process (runs in background)"""
-        work_order = self.get_work_order(work_order_id)
+        work_order = await self.get_work_order(work_order_id)
         if not work_order:
             return
 
-        self.update_status(work_order_id, WorkOrderStatus.DISCOVERING_VENDORS)
+        await self.update_status(work_order_id, WorkOrderStatus.DISCOVERING_VENDORS)
 
         discovery_service = VendorDiscoveryService(self.db)
         vendors = await discovery_service.discover_vendors_for_work_order(work_order)
@@ -128,17 +174,17 @@ class WorkOrderService:
         print(f"✅ Discovered {len(vendors)} vendors for work order {work_order_id}")
 
         if vendors:
-            self.update_status(work_order_id, WorkOrderStatus.AWAITING_APPROVAL)
+            await self.update_status(work_order_id, WorkOrderStatus.AWAITING_APPROVAL)
 
     async def start_vendor_contact_workflow(self, work_order_id: UUID):
-        work_order = self.get_work_order(work_order_id)
+        work_order = await self.get_work_order(work_order_id)
         if not work_order:
             return
 
-        self.update_status(work_order_id, WorkOrderStatus.CONTACTING_VENDORS)
+        await self.update_status(work_order_id, WorkOrderStatus.CONTACTING_VENDORS)
 
         contact_service = VendorContactService(self.db)
         await contact_service.contact_all_vendors_for_work_order(work_order)
 
         # Move to evaluation status
-        self.update_status(work_order_id, WorkOrderStatus.EVALUATING_QUOTES)
+        await self.update_status(work_order_id, WorkOrderStatus.EVALUATING_QUOTES)
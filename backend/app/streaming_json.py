@@ -0,0 +1,67 @@
+"""
+Incremental parsing of a JSON object that arrives in chunks (e.g. a streamed
+LLM completion). Each top-level member is handed back as soon as its value is
+complete, without waiting for the closing brace.
+"""
+
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """
+    Feed text chunks of a single JSON object; feed() returns the (key, value)
+    pairs of the top-level members completed by that chunk.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._buffer += chunk
+        members = []
+
+        while self._pos < len(self._buffer) and not self.done:
+            char = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = self._pos + 1
+            elif char in "}]":
+                if self._depth == 1:
+                    members.extend(self._take_member())
+                    self.done = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                members.extend(self._take_member())
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return members
+
+    def _take_member(self) -> List[Tuple[str, Any]]:
+        text = self._buffer[self._member_start : self._pos].strip()
+        if not text:
+            return []
+        try:
+            return list(json.loads("{" + text + "}").items())
+        except json.JSONDecodeError:
+            # Not valid on its own; the full-object parse at the end decides
+            return []
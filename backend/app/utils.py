@@ -2,6 +2,7 @@
 Utility functions and helpers for the Tavi application.
 """
 
+import re
 from typing import TypeVar, Optional
 from enum import Enum
 
@@ -27,3 +28,26 @@ def safe_enum(enum_class: type[T], value: Optional[str], default: T) -> T:
         except Exception:
             pass
         return default
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Digits-only form of a phone number, used as the vendor dedup key.
+    "+1-555-0101" and "+1 (555) 0101" both become "15550101".
+    """
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    return digits or None
+
+
+def normalize_address(address: Optional[str]) -> Optional[str]:
+    """
+    Case, punctuation and whitespace-insensitive form of an address, used as
+    the geocode cache key. "123 Main St., Dallas, TX" and "123 main st  dallas
+    tx" both become "123 main st dallas tx".
+    """
+    if not address:
+        return None
+    key = " ".join(re.sub(r"[^\w\s]", " ", address.lower()).split())
+    return key or None
@@ -0,0 +1,320 @@
+"""
+In-process spatial index over vendors with coordinates, so discovery can answer
+"top vendors for trade X within R miles of P" from our own vendor table before
+going to Google Places.
+
+Vendors are bucketed into fixed-size lat/lng grid cells; a query only scans
+the cells overlapping the search radius, and each cell keeps its vendors as
+NumPy columns so distance, service radius and trade filters run vectorized
+(see app/geo.py). The index loads once at startup and
+then picks up rows changed since its last refresh (by updated_at), so writes
+made by other workers show up within VENDOR_INDEX_REFRESH_SECONDS. Deletes
+leave no updated_at behind, so every VENDOR_INDEX_RECONCILE_EVERY refreshes
+the indexed ids are checked against the table and vanished vendors dropped.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.constants import MILES_PER_DEGREE_LATITUDE
+from app.geo import haversine_miles, ranking_scores, top_k, within_reach
+from app.models.vendor import Vendor
+
+Cell = Tuple[int, int]
+
+
+class VendorPoint:
+    """The columns of a vendor row the index needs."""
+
+    __slots__ = (
+        "vendor_id",
+        "latitude",
+        "longitude",
+        "trades",
+        "composite_score",
+        "service_radius_miles",
+    )
+
+    def __init__(
+        self,
+        vendor_id: UUID,
+        latitude: float,
+        longitude: float,
+        trades: Iterable[str],
+        composite_score: Optional[float],
+        service_radius_miles: Optional[float],
+    ):
+        self.vendor_id = vendor_id
+        self.latitude = latitude
+        self.longitude = longitude
+        self.trades = frozenset(trades or [])
+        self.composite_score = composite_score or 0.0
+        self.service_radius_miles = service_radius_miles
+
+
+class _Cell:
+    """One grid cell: its vendors, plus column arrays rebuilt after changes."""
+
+    __slots__ = ("points", "_columns", "_trade_masks")
+
+    def __init__(self):
+        self.points: Dict[UUID, VendorPoint] = {}
+        self._columns = None
+        self._trade_masks: Dict[str, np.ndarray] = {}
+
+    def put(self, point: VendorPoint):
+        self.points[point.vendor_id] = point
+        self._invalidate()
+
+    def drop(self, vendor_id: UUID):
+        self.points.pop(vendor_id, None)
+        self._invalidate()
+
+    def _invalidate(self):
+        self._columns = None
+        self._trade_masks = {}
+
+    def columns(self):
+        """(vendor ids, latitudes, longitudes, scores, service radii)"""
+        if self._columns is None:
+            points = list(self.points.values())
+            self._columns = (
+                [p.vendor_id for p in points],
+                np.array([p.latitude for p in points], dtype=float),
+                np.array([p.longitude for p in points], dtype=float),
+                np.array([p.composite_score for p in points], dtype=float),
+                np.array(
+                    [
+                        np.nan
+                        if p.service_radius_miles is None
+                        else p.service_radius_miles
+                        for p in points
+                    ],
+                    dtype=float,
+                ),
+            )
+        return self._columns
+
+    def trade_mask(self, trade: str) -> np.ndarray:
+        mask = self._trade_masks.get(trade)
+        if mask is None:
+            mask = np.array(
+                [trade in p.trades for p in self.points.values()], dtype=bool
+            )
+            self._trade_masks[trade] = mask
+        return mask
+
+
+class VendorIndex:
+    """Grid of lat/lng cells, each holding the vendors located in it."""
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Cell, _Cell] = {}
+        self._points: Dict[UUID, VendorPoint] = {}
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._refreshes = 0
+        self.queries = 0
+        self.local_hits = 0
+        self.removed = 0
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        return (
+            math.floor(latitude / self.cell_degrees),
+            math.floor(longitude / self.cell_degrees),
+        )
+
+    def upsert(self, point: VendorPoint):
+        self.remove(point.vendor_id)
+        cell = self._cell(point.latitude, point.longitude)
+        self._cells.setdefault(cell, _Cell()).put(point)
+        self._points[point.vendor_id] = point
+
+    def remove(self, vendor_id: UUID):
+        point = self._points.pop(vendor_id, None)
+        if point is not None:
+            cell = self._cell(point.latitude, point.longitude)
+            members = self._cells[cell]
+            members.drop(vendor_id)
+            if not members.points:
+                del self._cells[cell]
+
+    def add_vendors(self, vendors: Iterable[Vendor]):
+        """Index (or re-index) vendor rows just written by this process"""
+        for vendor in vendors:
+            self._apply(
+                vendor.id,
+                vendor.latitude,
+                vendor.longitude,
+                vendor.trade_specialties,
+                vendor.composite_score,
+                vendor.service_radius_miles,
+            )
+
+    def _apply(self, vendor_id, latitude, longitude, trades, score, service_radius):
+        if latitude is None or longitude is None:
+            self.remove(vendor_id)
+            return
+        self.upsert(
+            VendorPoint(vendor_id, latitude, longitude, trades, score, service_radius)
+        )
+
+    def _cells_within(self, latitude: float, longitude: float, radius_miles: float):
+        lat_span = radius_miles / MILES_PER_DEGREE_LATITUDE
+        # Longitude degrees shrink towards the poles
+        cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+        lng_span = radius_miles / (MILES_PER_DEGREE_LATITUDE * cos_lat)
+        min_row, min_col = self._cell(latitude - lat_span, longitude - lng_span)
+        max_row, max_col = self._cell(latitude + lat_span, longitude + lng_span)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                members = self._cells.get((row, col))
+                if members is not None:
+                    yield members
+
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_miles: float,
+        trade: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Tuple[UUID, float]]:
+        """
+        (vendor_id, distance in miles) for the ``limit`` best ranked vendors of
+        ``trade`` within ``radius_miles`` whose service radius covers the point,
+        best first. Ranking is the composite score less a distance penalty.
+        """
+        self.queries += 1
+        cells = list(self._cells_within(latitude, longitude, radius_miles))
+        if not cells:
+            return []
+
+        vendor_ids = []
+        columns = [[], [], [], []]
+        masks = []
+        for cell in cells:
+            ids, *cell_columns = cell.columns()
+            vendor_ids.extend(ids)
+            for column, values in zip(columns, cell_columns):
+                column.append(values)
+            if trade:
+                masks.append(cell.trade_mask(trade))
+        lats, lngs, scores, service_radii = (np.concatenate(c) for c in columns)
+
+        distances = haversine_miles(latitude, longitude, lats, lngs)
+        keep = within_reach(distances, radius_miles, service_radii)
+        if trade:
+            keep &= np.concatenate(masks)
+        candidates = np.flatnonzero(keep)
+        best = candidates[
+            top_k(ranking_scores(scores[candidates], distances[candidates]), limit)
+        ]
+        return [(vendor_ids[i], float(distances[i])) for i in best]
+
+    def columns_for(self, vendor_ids: List[UUID]):
+        """
+        (indexed mask, latitudes, longitudes, scores, service radii) for
+        ``vendor_ids`` in order. Vendors not in the index get False and NaN.
+        """
+        points = [self._points.get(vendor_id) for vendor_id in vendor_ids]
+        indexed = np.array([p is not None for p in points], dtype=bool)
+        known = [p for p in points if p is not None]
+        columns = np.full((4, len(points)), np.nan)
+        columns[:, indexed] = [
+            [p.latitude for p in known],
+            [p.longitude for p in known],
+            [p.composite_score for p in known],
+            [
+                np.nan if p.service_radius_miles is None else p.service_radius_miles
+                for p in known
+            ],
+        ]
+        return (indexed, *columns)
+
+    def is_stale(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at
+            > settings.VENDOR_INDEX_REFRESH_SECONDS
+        )
+
+    async def refresh(self, db: AsyncSession):
+        """Load vendor rows changed since the last refresh (all rows on the first)"""
+        query = select(
+            Vendor.id,
+            Vendor.latitude,
+            Vendor.longitude,
+            Vendor.trade_specialties,
+            Vendor.composite_score,
+            Vendor.service_radius_miles,
+            Vendor.updated_at,
+        )
+        if self._watermark is not None:
+            # >= so rows sharing the last timestamp aren't missed; re-indexing
+            # a row is harmless
+            query = query.where(Vendor.updated_at >= self._watermark)
+
+        started = time.perf_counter()
+        result = await db.execute(query)
+        for vendor_id, lat, lng, trades, score, radius, updated_at in result:
+            self._apply(vendor_id, lat, lng, trades, score, radius)
+            if updated_at and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+        first_load = self._refreshed_at is None
+        self._refreshes += 1
+        if (
+            not first_load
+            and self._refreshes % settings.VENDOR_INDEX_RECONCILE_EVERY == 0
+        ):
+            await self.reconcile(db)
+        self._refreshed_at = time.monotonic()
+        if first_load:
+            print(
+                f"🗺️  Vendor index loaded: {len(self)} vendors in "
+                f"{len(self._cells)} cells ({time.perf_counter() - started:.2f}s)"
+            )
+
+    async def reconcile(self, db: AsyncSession):
+        """Drop indexed vendors whose rows no longer exist"""
+        existing = set((await db.scalars(select(Vendor.id))).all())
+        self.drop_missing(
+            vendor_id for vendor_id in self._points if vendor_id not in existing
+        )
+
+    def drop_missing(self, vendor_ids: Iterable[UUID]):
+        """Remove vendors found to be gone from the table"""
+        gone = list(vendor_ids)
+        for vendor_id in gone:
+            self.remove(vendor_id)
+        self.removed += len(gone)
+        if gone:
+            print(f"🗺️  Dropped {len(gone)} deleted vendors from the index")
+
+    def snapshot(self) -> dict:
+        return {
+            "vendors": len(self),
+            "cells": len(self._cells),
+            "cell_degrees": self.cell_degrees,
+            "queries": self.queries,
+            "local_hits": self.local_hits,
+            "removed": self.removed,
+            "seconds_since_refresh": round(time.monotonic() - self._refreshed_at, 1)
+            if self._refreshed_at is not None
+            else None,
+        }
+
+
+vendor_index = VendorIndex(settings.VENDOR_INDEX_CELL_DEGREES)
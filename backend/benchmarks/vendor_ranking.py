@@ -0,0 +1,111 @@
+"""
+Latency of distance filtering and ranking: a VendorIndex.nearby() query over
+one metro's vendors, and VendorDiscoveryService._rank_by_distance() over a
+discovery candidate list of Vendor rows, both when the candidates are in the
+vendor index (the normal case) and when their columns must be read off the
+rows. Vendors are synthetic and scattered around one job location; no
+database or API keys are needed.
+
+    cd backend
+    python -m benchmarks.vendor_ranking --vendors 20000 --iterations 200
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import time
+import types
+import uuid
+
+from app.models.vendor import Vendor
+from app.services import vendor_discovery_service
+from app.services.vendor_discovery_service import VendorDiscoveryService
+from app.vendor_index import VendorIndex, VendorPoint
+
+JOB = {"lat": 37.7749, "lng": -122.4194}
+TRADES = ["plumbing", "electrical", "hvac", "roofing", "painting"]
+# Vendors within about this many degrees of the job (~35 miles)
+SPREAD_DEGREES = 0.5
+
+
+def synthetic_vendors(count: int, rng: random.Random):
+    for _ in range(count):
+        yield {
+            "id": uuid.uuid4(),
+            "latitude": JOB["lat"] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            "longitude": JOB["lng"] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            "trade_specialties": rng.sample(TRADES, 2),
+            "composite_score": rng.uniform(4, 10),
+            "service_radius_miles": rng.choice([None, 10.0, 25.0, 50.0]),
+        }
+
+
+def timed(func, iterations: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()  # warm caches (cell column arrays, trade masks)
+    timings = []
+    # Keep the per-call "dropped N vendors" log out of the timings and output
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return statistics.median(timings), p95
+
+
+def main(vendor_count: int, candidate_counts, iterations: int, seed: int):
+    rng = random.Random(seed)
+    rows = list(synthetic_vendors(vendor_count, rng))
+
+    index = VendorIndex(cell_degrees=0.25)
+    for row in rows:
+        index.upsert(
+            VendorPoint(
+                row["id"],
+                row["latitude"],
+                row["longitude"],
+                row["trade_specialties"],
+                row["composite_score"],
+                row["service_radius_miles"],
+            )
+        )
+    # _rank_by_distance only reads search_radius_meters from the service
+    service = types.SimpleNamespace(search_radius_meters=20000)
+
+    print(f"{'operation':<40}{'p50 ms':>10}{'p95 ms':>10}")
+    p50, p95 = timed(
+        lambda: index.nearby(JOB["lat"], JOB["lng"], 12.4, "plumbing", 10),
+        iterations,
+    )
+    print(
+        f"{f'index nearby ({vendor_count} vendors)':<40}{p50 * 1000:>10.3f}{p95 * 1000:>10.3f}"
+    )
+
+    for label, candidate_index in (
+        ("indexed", index),
+        ("unindexed", VendorIndex(0.25)),
+    ):
+        vendor_discovery_service.vendor_index = candidate_index
+        for count in candidate_counts:
+            vendors = [Vendor(**row) for row in rows[:count]]
+            p50, p95 = timed(
+                lambda: VendorDiscoveryService._rank_by_distance(service, vendors, JOB),
+                iterations,
+            )
+            print(
+                f"{f'rank_by_distance ({count} {label})':<40}{p50 * 1000:>10.3f}{p95 * 1000:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vendors", type=int, default=20000)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[20, 60, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.vendors, args.candidates, args.iterations, args.seed)
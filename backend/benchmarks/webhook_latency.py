@@ -0,0 +1,177 @@
+"""
+End-to-end latency of inbound email/SMS webhook processing, comparing the old
+two-call path (reply decision, then a serial parse_vendor_response call) with
+the single structured reply_and_extract call.
+
+The LLM is replaced by a stub with a fixed latency so the numbers reflect the
+number of serial round trips rather than provider variance. Needs a database
+at DATABASE_URL (schema migrated); the rows it creates are removed afterwards.
+
+    cd backend
+    python -m benchmarks.webhook_latency --iterations 20 --llm-latency 0.6
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import types
+
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal
+from app.models.communication_log import CommunicationLog
+from app.models.quote import Quote
+from app.models.vendor import Vendor
+from app.models.work_order import TradeType, WorkOrder
+from app.routes.webhooks import (
+    process_vendor_email_response,
+    process_vendor_sms_response,
+)
+from app.services.ai_agent_service import AIAgentService
+
+
+class StubCompletions:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        if "extracted_info" in prompt:
+            content = {
+                "needs_human": False,
+                "response": "Thanks! We'll review and contact you.",
+                "extracted_info": {
+                    "price": 250,
+                    "availability_days": 2,
+                    "duration_hours": 3,
+                },
+                "conversation_complete": True,
+            }
+        else:
+            content = {"price": 250, "availability_date": None, "notes": prompt}
+        message = types.SimpleNamespace(content=json.dumps(content))
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=message)],
+            usage=types.SimpleNamespace(total_tokens=300),
+        )
+
+
+class StubOpenAI:
+    def __init__(self, latency: float):
+        self.completions = StubCompletions(latency)
+        self.chat = types.SimpleNamespace(completions=self.completions)
+
+
+class TwoCallAIAgentService(AIAgentService):
+    """
+    The previous flow: email replies made a second, serial parse_vendor_response
+    call after the reply decision (SMS was already a single call).
+    """
+
+    async def reply_and_extract(
+        self, channel, message, conversation_history, work_order_data
+    ):
+        result = await super().reply_and_extract(
+            channel, message, conversation_history, work_order_data
+        )
+        if channel == "email" and not result.get("needs_human"):
+            quote_info = await self.parse_vendor_response(message)
+            result["extracted_info"] = {**result["extracted_info"], **quote_info}
+        return result
+
+
+async def create_fixture():
+    async with AsyncSessionLocal() as db:
+        work_order = WorkOrder(
+            title="Benchmark leak",
+            description="Leaking pipe under the kitchen sink",
+            trade_type=TradeType.PLUMBING,
+            location_address="1 Benchmark Way",
+        )
+        vendor = Vendor(
+            business_name="Benchmark Plumbing", trade_specialties=["plumbing"]
+        )
+        db.add_all([work_order, vendor])
+        await db.flush()
+        quote = Quote(work_order_id=work_order.id, vendor_id=vendor.id)
+        db.add(quote)
+        await db.commit()
+        return work_order.id, vendor.id, quote.id
+
+
+async def remove_fixture(work_order_id, vendor_id):
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(CommunicationLog).where(
+                CommunicationLog.work_order_id == work_order_id
+            )
+        )
+        await db.execute(delete(Quote).where(Quote.work_order_id == work_order_id))
+        await db.execute(delete(WorkOrder).where(WorkOrder.id == work_order_id))
+        await db.execute(delete(Vendor).where(Vendor.id == vendor_id))
+        await db.commit()
+
+
+async def run_mode(service_class, channel, iterations, llm_latency):
+    client = StubOpenAI(llm_latency)
+    ai_service = service_class(client)
+    work_order_id, vendor_id, quote_id = await create_fixture()
+    timings = []
+    try:
+        for i in range(iterations):
+            # Unique text per run so the LLM cache can't serve the parse call;
+            # "plus parts" keeps the rule-based quote fast path out of the way
+            message = f"Run {i}: $250 plus parts, available in 2 days, about 3 hours"
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                if channel == "email":
+                    await process_vendor_email_response(
+                        db, quote_id, vendor_id, message, "Quote", ai_service=ai_service
+                    )
+                else:
+                    await process_vendor_sms_response(
+                        db, quote_id, vendor_id, message, ai_service=ai_service
+                    )
+            timings.append(time.perf_counter() - start)
+    finally:
+        await remove_fixture(work_order_id, vendor_id)
+    return timings, client.completions.calls / iterations
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return statistics.mean(timings), statistics.median(timings), p95
+
+
+async def main(iterations: int, llm_latency: float):
+    print(f"LLM stub latency {llm_latency * 1000:.0f} ms, {iterations} iterations\n")
+    print(
+        f"{'channel':<8}{'mode':<12}{'llm calls':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    )
+    for channel in ("email", "sms"):
+        for label, service_class in (
+            ("before", TwoCallAIAgentService),
+            ("after", AIAgentService),
+        ):
+            timings, calls = await run_mode(
+                service_class, channel, iterations, llm_latency
+            )
+            mean, p50, p95 = summarize(timings)
+            print(
+                f"{channel:<8}{label:<12}{calls:>10.1f}"
+                f"{mean * 1000:>10.1f}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.6)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.llm_latency))
@@ -0,0 +1,266 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 20:43:09.573724
+
+Mirrors what Base.metadata.create_all produced before migrations existed.
+Databases created that way are stamped at this revision by init_db().
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# create_type=False: the types are created with checkfirst below, since
+# backend/init.sql already creates some of them in the docker database.
+TRADETYPE = postgresql.ENUM(
+    "plumbing",
+    "electrical",
+    "hvac",
+    "landscaping",
+    "roofing",
+    "painting",
+    "carpentry",
+    "cleaning",
+    "pest_control",
+    "general_maintenance",
+    name="tradetype",
+    create_type=False,
+)
+WORKORDERSTATUS = postgresql.ENUM(
+    "submitted",
+    "discovering_vendors",
+    "contacting_vendors",
+    "evaluating_quotes",
+    "awaiting_approval",
+    "vendor_selected",
+    "awaiting_facility_confirmation",
+    "awaiting_vendor_dispatch",
+    "dispatched",
+    "in_progress",
+    "completed",
+    "cancelled",
+    name="workorderstatus",
+    create_type=False,
+)
+PRIORITY = postgresql.ENUM(
+    "none", "low", "medium", "high", name="priority", create_type=False
+)
+WORKTYPE = postgresql.ENUM(
+    "reactive", "preventive", "other", name="worktype", create_type=False
+)
+CATEGORY = postgresql.ENUM(
+    "damage",
+    "electrical",
+    "inspection",
+    "mechanical",
+    "preventive",
+    "project",
+    "refrigeration",
+    "safety",
+    "standard_operating_procedure",
+    name="category",
+    create_type=False,
+)
+RECURRENCE = postgresql.ENUM(
+    "none",
+    "daily",
+    "weekly",
+    "monthly",
+    "quarterly",
+    "yearly",
+    name="recurrence",
+    create_type=False,
+)
+COMMUNICATIONCHANNEL = postgresql.ENUM(
+    "EMAIL", "SMS", "PHONE", "SYSTEM", name="communicationchannel", create_type=False
+)
+QUOTESTATUS = postgresql.ENUM(
+    "PENDING",
+    "REQUESTED",
+    "RECEIVED",
+    "ACCEPTED",
+    "REJECTED",
+    "EXPIRED",
+    name="quotestatus",
+    create_type=False,
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    for enum_type in (
+        TRADETYPE,
+        WORKORDERSTATUS,
+        PRIORITY,
+        WORKTYPE,
+        CATEGORY,
+        RECURRENCE,
+        COMMUNICATIONCHANNEL,
+        QUOTESTATUS,
+    ):
+        enum_type.create(bind, checkfirst=True)
+
+    op.create_table(
+        "vendors",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("business_name", sa.String(length=255), nullable=False),
+        sa.Column("contact_name", sa.String(length=200), nullable=True),
+        sa.Column("phone", sa.String(length=50), nullable=True),
+        sa.Column("email", sa.String(length=200), nullable=True),
+        sa.Column("website", sa.String(length=500), nullable=True),
+        sa.Column("address", sa.String(length=500), nullable=True),
+        sa.Column("city", sa.String(length=100), nullable=True),
+        sa.Column("state", sa.String(length=50), nullable=True),
+        sa.Column("zip_code", sa.String(length=20), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("service_radius_miles", sa.Float(), nullable=True),
+        sa.Column("trade_specialties", sa.ARRAY(sa.String()), nullable=True),
+        sa.Column("google_rating", sa.Float(), nullable=True),
+        sa.Column("google_review_count", sa.Integer(), nullable=True),
+        sa.Column("yelp_rating", sa.Float(), nullable=True),
+        sa.Column("yelp_review_count", sa.Integer(), nullable=True),
+        sa.Column("bbb_rating", sa.String(length=10), nullable=True),
+        sa.Column("composite_score", sa.Float(), nullable=True),
+        sa.Column("google_place_id", sa.String(length=200), nullable=True),
+        sa.Column("yelp_business_id", sa.String(length=200), nullable=True),
+        sa.Column("bbb_business_id", sa.String(length=200), nullable=True),
+        sa.Column("source_data", sa.JSON(), nullable=True),
+        sa.Column("last_contacted", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "work_orders",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("trade_type", TRADETYPE, nullable=False),
+        sa.Column("location_address", sa.String(length=500), nullable=False),
+        sa.Column("location_city", sa.String(length=100), nullable=True),
+        sa.Column("location_state", sa.String(length=50), nullable=True),
+        sa.Column("location_zip", sa.String(length=20), nullable=True),
+        sa.Column("location_country", sa.String(length=100), nullable=True),
+        sa.Column("location_latitude", sa.Float(), nullable=True),
+        sa.Column("location_longitude", sa.Float(), nullable=True),
+        sa.Column("asset_name", sa.String(length=255), nullable=True),
+        sa.Column("asset_type", sa.String(length=100), nullable=True),
+        sa.Column("status", WORKORDERSTATUS, nullable=True),
+        sa.Column("urgency", sa.String(length=50), nullable=True),
+        sa.Column("priority", PRIORITY, nullable=True),
+        sa.Column("work_type", WORKTYPE, nullable=True),
+        sa.Column("category", CATEGORY, nullable=True),
+        sa.Column("recurrence", RECURRENCE, nullable=True),
+        sa.Column("preferred_date", sa.DateTime(), nullable=True),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("scheduled_date", sa.DateTime(), nullable=True),
+        sa.Column("estimated_hours", sa.Float(), nullable=True),
+        sa.Column("parts_needed", postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column("special_requirements", sa.Text(), nullable=True),
+        sa.Column("customer_name", sa.String(length=200), nullable=True),
+        sa.Column("customer_email", sa.String(length=200), nullable=True),
+        sa.Column("customer_phone", sa.String(length=50), nullable=True),
+        sa.Column("facility_manager_name", sa.String(length=200), nullable=True),
+        sa.Column("facility_manager_email", sa.String(length=200), nullable=True),
+        sa.Column("facility_manager_phone", sa.String(length=50), nullable=True),
+        sa.Column("facility_confirmed", sa.DateTime(), nullable=True),
+        sa.Column("vendor_dispatch_confirmed", sa.DateTime(), nullable=True),
+        sa.Column("selected_vendor_id", sa.UUID(), nullable=True),
+        sa.Column("raw_input", sa.Text(), nullable=True),
+        sa.Column("ai_processing_log", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "communication_logs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("work_order_id", sa.UUID(), nullable=False),
+        sa.Column("vendor_id", sa.UUID(), nullable=True),
+        sa.Column("channel", COMMUNICATIONCHANNEL, nullable=False),
+        sa.Column("direction", sa.String(length=20), nullable=True),
+        sa.Column("subject", sa.String(length=500), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column("sent_successfully", sa.Boolean(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("call_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("call_recording_url", sa.String(length=500), nullable=True),
+        sa.Column("call_transcript", sa.Text(), nullable=True),
+        sa.Column("ai_model_used", sa.String(length=100), nullable=True),
+        sa.Column("ai_prompt", sa.Text(), nullable=True),
+        sa.Column("ai_response", sa.Text(), nullable=True),
+        sa.Column("ai_metadata", sa.JSON(), nullable=True),
+        sa.Column("external_id", sa.String(length=200), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["vendor_id"],
+            ["vendors.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["work_order_id"],
+            ["work_orders.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "quotes",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("work_order_id", sa.UUID(), nullable=False),
+        sa.Column("vendor_id", sa.UUID(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("currency", sa.String(length=10), nullable=True),
+        sa.Column("availability_date", sa.DateTime(), nullable=True),
+        sa.Column("estimated_duration_hours", sa.Float(), nullable=True),
+        sa.Column("status", QUOTESTATUS, nullable=True),
+        sa.Column("quote_text", sa.Text(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("price_score", sa.Float(), nullable=True),
+        sa.Column("quality_score", sa.Float(), nullable=True),
+        sa.Column("availability_score", sa.Float(), nullable=True),
+        sa.Column("composite_score", sa.Float(), nullable=True),
+        sa.Column("requested_at", sa.DateTime(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["vendor_id"],
+            ["vendors.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["work_order_id"],
+            ["work_orders.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("quotes")
+    op.drop_table("communication_logs")
+    op.drop_table("work_orders")
+    op.drop_table("vendors")
+
+    bind = op.get_bind()
+    for enum_type in (
+        TRADETYPE,
+        WORKORDERSTATUS,
+        PRIORITY,
+        WORKTYPE,
+        CATEGORY,
+        RECURRENCE,
+        COMMUNICATIONCHANNEL,
+        QUOTESTATUS,
+    ):
+        enum_type.drop(bind, checkfirst=True)
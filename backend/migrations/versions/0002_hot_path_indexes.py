@@ -0,0 +1,104 @@
+"""hot path indexes for quotes, communication logs and vendors
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 21:05:00.000000
+
+Built with CREATE INDEX CONCURRENTLY so large tables stay writable while the
+migration runs. CONCURRENTLY cannot run inside a transaction, hence the
+autocommit blocks.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    # Quote lookups per (work order, vendor): inbound replies, confirmations, dedup
+    ("ix_quotes_work_order_id_vendor_id", "quotes", ["work_order_id", "vendor_id"], {}),
+    (
+        "ix_quotes_vendor_id_status_created_at",
+        "quotes",
+        ["vendor_id", "status", "created_at"],
+        {},
+    ),
+    # Quote evaluation only looks at quotes that came back with a price
+    (
+        "ix_quotes_work_order_id_priced",
+        "quotes",
+        ["work_order_id"],
+        {"postgresql_where": sa.text("price IS NOT NULL")},
+    ),
+    (
+        "ix_communication_logs_work_order_id_vendor_id_channel",
+        "communication_logs",
+        ["work_order_id", "vendor_id", "channel", "timestamp"],
+        {},
+    ),
+    # Unified timeline for a work order, ordered by timestamp
+    (
+        "ix_communication_logs_work_order_id_timestamp",
+        "communication_logs",
+        ["work_order_id", "timestamp"],
+        {},
+    ),
+    (
+        "ix_communication_logs_vendor_id_timestamp",
+        "communication_logs",
+        ["vendor_id", "timestamp"],
+        {"postgresql_where": sa.text("vendor_id IS NOT NULL")},
+    ),
+    # Vendor identity lookups; most rows have no email, so index only set values
+    (
+        "ix_vendors_phone",
+        "vendors",
+        ["phone"],
+        {"postgresql_where": sa.text("phone IS NOT NULL")},
+    ),
+    (
+        "ix_vendors_email",
+        "vendors",
+        ["email"],
+        {"postgresql_where": sa.text("email IS NOT NULL")},
+    ),
+    (
+        "ix_vendors_google_place_id",
+        "vendors",
+        ["google_place_id"],
+        {"postgresql_where": sa.text("google_place_id IS NOT NULL")},
+    ),
+    # Array containment (@>) on trade specialties
+    (
+        "ix_vendors_trade_specialties",
+        "vendors",
+        ["trade_specialties"],
+        {"postgresql_using": "gin"},
+    ),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,39 @@
+"""keyset pagination indexes on (created_at, id)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 22:10:00.000000
+
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_work_orders_created_at_id", "work_orders"),
+    ("ix_vendors_created_at_id", "vendors"),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["created_at", "id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,101 @@
+"""unique vendor keys for bulk upsert: google_place_id and normalized phone
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:30:00.000000
+
+Duplicate vendors created by earlier racing discoveries are merged into the
+oldest row (quotes, communication logs and selected vendors are re-pointed)
+before the unique indexes are built.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+MERGE_DUPLICATES_SQL = """
+CREATE TEMP TABLE vendor_merge AS
+SELECT duplicate_id, keep_id FROM (
+    SELECT id AS duplicate_id,
+           first_value(id) OVER (
+               PARTITION BY {key} ORDER BY created_at NULLS LAST, id
+           ) AS keep_id
+    FROM vendors
+    WHERE {key} IS NOT NULL
+) ranked
+WHERE duplicate_id <> keep_id;
+
+UPDATE quotes SET vendor_id = m.keep_id
+FROM vendor_merge m WHERE quotes.vendor_id = m.duplicate_id;
+
+UPDATE communication_logs SET vendor_id = m.keep_id
+FROM vendor_merge m WHERE communication_logs.vendor_id = m.duplicate_id;
+
+UPDATE work_orders SET selected_vendor_id = m.keep_id
+FROM vendor_merge m WHERE work_orders.selected_vendor_id = m.duplicate_id;
+
+DELETE FROM vendors USING vendor_merge m WHERE vendors.id = m.duplicate_id;
+
+DROP TABLE vendor_merge;
+"""
+
+
+def upgrade():
+    op.add_column(
+        "vendors", sa.Column("phone_normalized", sa.String(length=50), nullable=True)
+    )
+    op.execute(
+        "UPDATE vendors SET phone_normalized = "
+        "NULLIF(regexp_replace(phone, '\\D', '', 'g'), '')"
+    )
+
+    for key in ("google_place_id", "phone_normalized"):
+        for statement in MERGE_DUPLICATES_SQL.format(key=key).split(";"):
+            if statement.strip():
+                op.execute(statement)
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_vendors_google_place_id",
+            table_name="vendors",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for name, column in (
+            ("uq_vendors_google_place_id", "google_place_id"),
+            ("uq_vendors_phone_normalized", "phone_normalized"),
+        ):
+            op.create_index(
+                name,
+                "vendors",
+                [column],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in ("uq_vendors_phone_normalized", "uq_vendors_google_place_id"):
+            op.drop_index(
+                name,
+                table_name="vendors",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.create_index(
+            "ix_vendors_google_place_id",
+            "vendors",
+            ["google_place_id"],
+            postgresql_where=sa.text("google_place_id IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    op.drop_column("vendors", "phone_normalized")
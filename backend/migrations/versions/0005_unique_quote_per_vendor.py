@@ -0,0 +1,68 @@
+"""one quote per (work order, vendor)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 11:00:00.000000
+
+Earlier code could create a second quote for the same vendor (discovery and
+outreach both added one, and 0004 merged duplicate vendors). The most
+advanced quote of each pair is kept before the unique index is built.
+
+"""
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        DELETE FROM quotes USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY work_order_id, vendor_id
+                ORDER BY (status = 'ACCEPTED') DESC, (price IS NOT NULL) DESC,
+                         created_at NULLS LAST, id
+            ) AS rank
+            FROM quotes
+        ) ranked
+        WHERE quotes.id = ranked.id AND ranked.rank > 1
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_quotes_work_order_id_vendor_id",
+            "quotes",
+            ["work_order_id", "vendor_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # The unique index serves the same lookups
+        op.drop_index(
+            "ix_quotes_work_order_id_vendor_id",
+            table_name="quotes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quotes_work_order_id_vendor_id",
+            "quotes",
+            ["work_order_id", "vendor_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "uq_quotes_work_order_id_vendor_id",
+            table_name="quotes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,29 @@
+"""vendors.price_display, backfilled from source_data
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 13:20:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "vendors", sa.Column("price_display", sa.String(length=10), nullable=True)
+    )
+    op.execute(
+        "UPDATE vendors SET price_display = left(source_data ->> 'price_display', 10) "
+        "WHERE source_data ->> 'price_display' IS NOT NULL"
+    )
+
+
+def downgrade():
+    op.drop_column("vendors", "price_display")
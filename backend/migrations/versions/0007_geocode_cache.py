@@ -0,0 +1,34 @@
+"""geocode_cache table keyed by normalized address
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:10:00.000000
+
+Existing work orders and vendors without coordinates are filled in by
+scripts/backfill_coordinates.py, which needs the Google API and so is not run
+as part of the migration.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "geocode_cache",
+        sa.Column("address_key", sa.String(length=500), primary_key=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("formatted_address", sa.String(length=500), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("geocode_cache")
@@ -0,0 +1,28 @@
+"""vendors.details_fetched_at for the Place details cache
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 16:40:00.000000
+
+Left NULL on existing rows: their next discovery refetches details with the
+field mask, which also shrinks their stored source_data.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "vendors", sa.Column("details_fetched_at", sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("vendors", "details_fetched_at")
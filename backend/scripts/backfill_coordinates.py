@@ -0,0 +1,80 @@
+"""
+Fill in missing coordinates on existing work orders and vendors.
+
+Rows are walked in id order, in batches, and geocoded through GeocodingService,
+so addresses shared by many rows cost one Google call and re-runs are answered
+from the geocode cache. Rows Google can't place keep NULL coordinates. Needs
+GOOGLE_PLACES_API_KEY and a database at DATABASE_URL (schema migrated).
+
+    cd backend
+    python -m scripts.backfill_coordinates --batch-size 200
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.vendor import Vendor
+from app.models.work_order import WorkOrder
+from app.services.geocoding_service import GeocodingService, geocode_stats
+
+
+async def backfill(model, missing, ensure, batch_size: int, dry_run: bool):
+    """Returns (rows filled, rows still missing coordinates)"""
+    filled = skipped = 0
+    last_id = None
+    async with AsyncSessionLocal() as db:
+        service = GeocodingService(db)
+        while True:
+            query = select(model).where(missing).order_by(model.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(model.id > last_id)
+            rows = list((await db.scalars(query)).all())
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            for row in rows:
+                if dry_run:
+                    skipped += 1
+                    continue
+                if await ensure(service, row):
+                    filled += 1
+                else:
+                    skipped += 1
+            print(f"  {model.__tablename__}: {filled} filled, {skipped} skipped")
+    return filled, skipped
+
+
+async def main(batch_size: int, dry_run: bool):
+    targets = [
+        (
+            WorkOrder,
+            WorkOrder.location_latitude.is_(None),
+            GeocodingService.ensure_work_order_coordinates,
+        ),
+        (
+            Vendor,
+            Vendor.latitude.is_(None) & Vendor.address.isnot(None),
+            GeocodingService.ensure_vendor_coordinates,
+        ),
+    ]
+    for model, missing, ensure in targets:
+        filled, skipped = await backfill(model, missing, ensure, batch_size, dry_run)
+        if dry_run:
+            print(f"📋 {model.__tablename__}: {skipped} rows missing coordinates")
+        else:
+            print(f"✅ {model.__tablename__}: {filled} filled, {skipped} not found")
+    print(f"📍 Geocode lookups: {geocode_stats.snapshot()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only count rows missing coordinates"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.dry_run))
@@ -0,0 +1,19 @@
+"""
+Apply database migrations. Run once per deploy, before the app starts; the
+app itself only checks that the schema is at head. Concurrent runs (several
+replicas or deploy jobs) wait on an advisory lock instead of racing.
+
+    cd backend
+    python -m scripts.migrate
+"""
+
+from app.database import migrate_db
+
+
+def main():
+    migrate_db()
+    print("✅ Database schema at head")
+
+
+if __name__ == "__main__":
+    main()
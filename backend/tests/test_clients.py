@@ -0,0 +1,52 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sendgrid.helpers.mail import Mail
+
+from app.clients import ClientRegistry
+from app.config import settings
+
+
+class AcceptMail(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mail_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AcceptMail)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_email_reuses_its_connection(mail_server, monkeypatch):
+    monkeypatch.setattr(settings, "SENDGRID_API_KEY", "SG.test")
+    registry = ClientRegistry()
+    registry.sendgrid.host = mail_server
+    mail = Mail(
+        from_email="noreply@example.com",
+        to_emails="vendor@example.com",
+        subject="Quote request",
+        html_content="Hello",
+    )
+
+    for _ in range(3):
+        assert registry.send_email(mail).status_code == 202
+
+    assert registry.snapshot()["clients"]["sendgrid"] == {
+        "requests": 3,
+        "new_connections": 1,
+        "reuse_rate": 0.6667,
+    }
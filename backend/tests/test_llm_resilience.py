@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app import llm_resilience
+from app.config import settings
+from app.llm_metrics import LLMCallRecord, LLMMetrics
+from app.llm_resilience import (
+    CircuitBreaker,
+    SchedulerQueueTimeout,
+    guarded_call,
+    hedge_delay,
+)
+
+
+def make_breaker():
+    return CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = LLMMetrics()
+    monkeypatch.setattr(llm_resilience, "llm_metrics", metrics)
+    return metrics
+
+
+def record_latency(metrics, call_site, seconds, error=None):
+    record = LLMCallRecord(call_site, "gpt-4o-mini")
+    record.latency_seconds = seconds
+    record.error = error
+    metrics.record(record)
+
+
+def test_hedge_delay_uses_samples_not_bucket_bounds(metrics, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 20)
+    for _ in range(20):
+        record_latency(metrics, "parse_vendor_sms_response", 2.6)
+    # Timeouts end at the budget and must not drag the p95 up
+    for _ in range(10):
+        record_latency(metrics, "parse_vendor_sms_response", 10.0, "TimeoutError")
+
+    # The histogram would report the 5.0 bucket bound
+    assert hedge_delay("parse_vendor_sms_response") == pytest.approx(2.6)
+
+
+def test_hedge_delay_is_capped_below_the_budget(metrics, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 20)
+    for _ in range(20):
+        record_latency(metrics, "parse_vendor_sms_response", 9.5)
+
+    budget = llm_resilience.latency_budget("parse_vendor_sms_response")
+    assert hedge_delay("parse_vendor_sms_response") == pytest.approx(
+        budget * settings.LLM_HEDGE_MAX_BUDGET_SHARE
+    )
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_does_not_trip_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_QUEUE_TIMEOUT_SECONDS", 0.05)
+    breaker = make_breaker()
+    held = asyncio.Lock()
+    await held.acquire()
+
+    @asynccontextmanager
+    async def slot():
+        async with held:
+            yield None
+
+    async def attempt(ticket):
+        return "ok"
+
+    with pytest.raises(SchedulerQueueTimeout):
+        await guarded_call("queued", attempt, slot=slot, breaker=breaker)
+    assert breaker.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_budget_cancels_first_attempt_before_hedge(monkeypatch):
+    monkeypatch.setitem(settings.LLM_LATENCY_BUDGETS, "hedged_site", 0.05)
+    monkeypatch.setattr(settings, "LLM_HEDGE_CALL_SITES", ["hedged_site"])
+    monkeypatch.setattr(settings, "LLM_HEDGE_DEFAULT_DELAY_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MAX_BUDGET_SHARE", 100.0)
+    cancelled = asyncio.Event()
+
+    async def attempt(ticket):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(asyncio.TimeoutError):
+        await guarded_call("hedged_site", attempt, breaker=make_breaker())
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_fired_hedge_is_reported(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_CALL_SITES", ["hedged_site"])
+    monkeypatch.setattr(settings, "LLM_HEDGE_DEFAULT_DELAY_SECONDS", 0.01)
+    calls = []
+    hedges = []
+
+    async def attempt(ticket):
+        calls.append(ticket)
+        await asyncio.sleep(1 if len(calls) == 1 else 0)
+        return len(calls)
+
+    result = await guarded_call(
+        "hedged_site",
+        attempt,
+        on_hedge=lambda: hedges.append(True),
+        breaker=make_breaker(),
+    )
+    assert result == 2
+    assert hedges == [True]
+
+
+def test_hedged_record_counts_duplicate_prompt():
+    record = LLMCallRecord("hedged_site", "gpt-4o-mini")
+    record.hedged = True
+    usage = type("Usage", (), {"prompt_tokens": 100, "completion_tokens": 20})()
+    record.finished(usage)
+    assert record.prompt_tokens == 200
+    assert record.completion_tokens == 20
@@ -0,0 +1,48 @@
+import pytest
+
+from app.quote_extractor import (
+    FAST_PATH_MIN_CONFIDENCE,
+    extract_quote,
+    fast_path_extract,
+)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Quote: $300. Available starting in 2 days. Estimated 4 hour job. Thanks!",
+        "Yes, I'm interested! $250 total. Can start 3 days from now, should take "
+        "about 4 hours. Please confirm.",
+    ],
+)
+def test_clear_quote_takes_fast_path(message):
+    extracted = fast_path_extract("test", message)
+
+    assert extracted is not None
+    assert extracted["price"] in (300, 250)
+    assert extracted["availability_days"] in (2, 3)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "$250 in 3 days, 2 hours of work but I need to check the parts first",
+        "Deposit of $50 required. Available in 3 days.",
+        "Quote: $250 but this excludes materials. Available in 3 days.",
+        "Starting from $200, available tomorrow",
+        "Approx $200, can be there in 2 days",
+        "Price range $200 - $400, available in 3 days",
+        "Can you send photos? $250, available in 2 days",
+        "Quote: $300 each for 2 units, available in 3 days",
+        "$250 per visit, available in 2 days",
+        "$90 per hour, available tomorrow",
+        "$40 apiece, can be there in 2 days",
+    ],
+)
+def test_hedged_quote_goes_to_llm(message):
+    assert extract_quote(message)["confidence"] < FAST_PATH_MIN_CONFIDENCE
+    assert fast_path_extract("test", message) is None
+
+
+def test_price_without_availability_is_not_enough():
+    assert fast_path_extract("test", "My price is $250.") is None
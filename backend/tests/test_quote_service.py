@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from app.services.quote_service import parse_availability_date
+
+
+def test_iso_string_becomes_datetime():
+    assert parse_availability_date("2026-10-20T09:30:00") == datetime(
+        2026, 10, 20, 9, 30
+    )
+
+
+def test_aware_datetime_becomes_naive_utc():
+    assert parse_availability_date("2026-10-20T09:30:00+02:00") == datetime(
+        2026, 10, 20, 7, 30
+    )
+
+
+def test_unreadable_values_are_dropped():
+    assert parse_availability_date("next tuesday") is None
+    assert parse_availability_date(None) is None
+    assert parse_availability_date(3) is None
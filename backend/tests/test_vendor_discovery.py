@@ -0,0 +1,35 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.work_order import WorkOrder
+from app.services.vendor_discovery_service import VendorDiscoveryService
+
+
+async def geocoding_failed(work_order):
+    raise RuntimeError("OVER_QUERY_LIMIT")
+
+
+@pytest.mark.asyncio
+async def test_geocoding_failure_falls_back_to_mock_vendors():
+    clients = SimpleNamespace(google_maps=object(), openai=None)
+    service = VendorDiscoveryService(db=None, clients=clients)
+    mock_vendors = [SimpleNamespace(id=uuid.uuid4(), composite_score=8.0)]
+
+    async def create_mock_vendors(work_order):
+        return mock_vendors
+
+    async def create_pending_quotes(work_order_id, vendors):
+        return len(vendors)
+
+    async def search_places(**kwargs):
+        raise AssertionError("searched Places without coordinates")
+
+    service.geocoding_service.ensure_work_order_coordinates = geocoding_failed
+    service._create_mock_vendors = create_mock_vendors
+    service._search_google_places = search_places
+    service.quote_service.create_pending_quotes = create_pending_quotes
+
+    work_order = WorkOrder(id=uuid.uuid4(), location_address="1 Unknown Rd")
+    assert await service.discover_vendors_for_work_order(work_order) == mock_vendors
@@ -0,0 +1,53 @@
+import random
+import types
+import uuid
+
+import pytest
+
+from app.models.vendor import Vendor
+from app.services import vendor_discovery_service
+from app.services.vendor_discovery_service import VendorDiscoveryService
+from app.vendor_index import VendorIndex
+
+JOB = {"lat": 37.7749, "lng": -122.4194}
+
+
+def make_vendors(count, seed=3):
+    rng = random.Random(seed)
+    vendors = [
+        Vendor(
+            id=uuid.uuid4(),
+            latitude=JOB["lat"] + rng.uniform(-0.3, 0.3),
+            longitude=JOB["lng"] + rng.uniform(-0.3, 0.3),
+            trade_specialties=["plumbing"],
+            composite_score=rng.uniform(4, 10),
+            service_radius_miles=rng.choice([None, 5.0, 50.0]),
+        )
+        for _ in range(count)
+    ]
+    vendors.append(Vendor(id=uuid.uuid4(), composite_score=9.5))
+    return vendors
+
+
+def rank(index, vendors, monkeypatch):
+    monkeypatch.setattr(vendor_discovery_service, "vendor_index", index)
+    service = types.SimpleNamespace(search_radius_meters=20000)
+    return VendorDiscoveryService._rank_by_distance(service, vendors, JOB)
+
+
+@pytest.mark.parametrize("indexed_share", [0.0, 0.5, 1.0])
+def test_index_columns_rank_like_the_rows(indexed_share, monkeypatch):
+    vendors = make_vendors(200)
+    expected = rank(VendorIndex(0.25), vendors, monkeypatch)
+
+    index = VendorIndex(0.25)
+    index.add_vendors(vendors[: int(len(vendors) * indexed_share)])
+    assert rank(index, vendors, monkeypatch) == expected
+
+
+def test_out_of_range_dropped_and_unlocated_kept(monkeypatch):
+    vendors = make_vendors(200)
+    ranked = rank(VendorIndex(0.25), vendors, monkeypatch)
+
+    assert vendors[-1] in ranked
+    assert 0 < len(ranked) < len(vendors)
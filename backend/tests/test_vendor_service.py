@@ -0,0 +1,74 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.constants import VENDOR_UPSERT_ATTEMPTS
+from app.services.vendor_service import VendorService
+
+CANDIDATE = {
+    "business_name": "Bay Plumbing",
+    "google_place_id": "place-1",
+    "trade_specialties": ["plumbing"],
+}
+
+
+class RecordingSession:
+    """
+    Stands in for AsyncSession: no stored vendors, statements recorded. The
+    first ``conflicts`` upserts fail as if a concurrent insert took the key.
+    """
+
+    def __init__(self, conflicts=0):
+        self.statements = []
+        self.conflicts = conflicts
+
+    async def execute(self, stmt, *args, **kwargs):
+        return []
+
+    async def scalars(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        if self.conflicts:
+            self.conflicts -= 1
+            raise IntegrityError(
+                "INSERT INTO vendors", {}, Exception("Key (phone_normalized)")
+            )
+        return SimpleNamespace(all=lambda: [])
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def commit(self):
+        pass
+
+
+def compiled(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_upsert_merges_trade_specialties():
+    db = RecordingSession()
+    await VendorService(db).bulk_upsert_vendors([CANDIDATE])
+
+    (stmt,) = db.statements
+    update = compiled(stmt).split("DO UPDATE SET", 1)[1]
+    assert "array_cat(vendors.trade_specialties, excluded.trade_specialties)" in update
+
+
+@pytest.mark.asyncio
+async def test_upsert_retries_repeated_conflicts():
+    db = RecordingSession(conflicts=VENDOR_UPSERT_ATTEMPTS - 1)
+    assert await VendorService(db).bulk_upsert_vendors([CANDIDATE]) == []
+    assert len(db.statements) == VENDOR_UPSERT_ATTEMPTS
+
+
+@pytest.mark.asyncio
+async def test_upsert_gives_up_after_the_last_attempt():
+    db = RecordingSession(conflicts=VENDOR_UPSERT_ATTEMPTS)
+    with pytest.raises(IntegrityError):
+        await VendorService(db).bulk_upsert_vendors([CANDIDATE])
+    assert len(db.statements) == VENDOR_UPSERT_ATTEMPTS
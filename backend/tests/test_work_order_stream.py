@@ -0,0 +1,89 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm_cache import LLMCache
+from app.llm_metrics import LLMMetrics
+from app.llm_resilience import CircuitBreaker
+from app.llm_scheduler import LANE_INTERACTIVE, llm_scheduler
+from app.services import ai_agent_service
+from app.services.ai_agent_service import STREAM_FALLBACK_FIELD, AIAgentService
+
+
+def chunk(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
+    )
+
+
+class StreamingClient:
+    """Stands in for AsyncOpenAI; streams ``chunks`` then raises ``error``"""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, stream, **request):
+        return self.stream()
+
+    async def stream(self):
+        for text in self.chunks:
+            yield chunk(text)
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(ai_agent_service, "llm_cache", LLMCache(None, 60, []))
+    monkeypatch.setattr(ai_agent_service, "llm_metrics", LLMMetrics())
+    monkeypatch.setattr(
+        ai_agent_service,
+        "openai_breaker",
+        CircuitBreaker("test", failure_threshold=5, reset_seconds=30),
+    )
+
+
+@pytest.mark.asyncio
+async def test_partial_failure_marks_the_fallback_fields():
+    client = StreamingClient(
+        ['{"title": "Leaking sink", ', '"trade_type": "plumbing", "desc'],
+        error=ConnectionResetError("stream dropped"),
+    )
+    items = [
+        item
+        async for item in AIAgentService(client=client).stream_work_order_input(
+            "The kitchen sink is leaking"
+        )
+    ]
+
+    fields = [field for field, _ in items]
+    marker = fields.index(STREAM_FALLBACK_FIELD)
+    assert fields[:marker] == ["title", "trade_type"]
+    assert items[marker][1] == {
+        "reason": "stream dropped",
+        "model_fields": ["title", "trade_type"],
+    }
+    # Only fields the model didn't send are filled in, all after the marker
+    after = fields[marker + 1 :]
+    assert after and "title" not in after and "trade_type" not in after
+    assert dict(items)["title"] == "Leaking sink"
+
+
+@pytest.mark.asyncio
+async def test_slot_is_released_before_the_fields_are_consumed():
+    body = {"title": "Leaking sink", "trade_type": "plumbing", "urgency": "high"}
+    client = StreamingClient([json.dumps(body)])
+    stream = AIAgentService(client=client).stream_work_order_input("Leaking sink")
+
+    assert await anext(stream) == ("title", "Leaking sink")
+    await asyncio.sleep(0)
+    # The completion has ended; the slow reader holds no scheduler capacity
+    assert llm_scheduler.in_flight[LANE_INTERACTIVE] == 0
+
+    rest = [item async for item in stream]
+    assert STREAM_FALLBACK_FIELD not in dict(rest)
+    assert dict(rest) == {"trade_type": "plumbing", "urgency": "high"}